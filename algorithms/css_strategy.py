@@ -1,22 +1,46 @@
-from typing import List, Tuple
-import random
+from typing import List, Optional, Tuple
 import numpy as np
+from feedback_matrix import get_feedback_matrix, encode_feedback, NUM_PATTERNS
+from seeding import make_rng
 
 class CSSStrategy:
-    def __init__(self):
+    def __init__(self, feedback_matrix=None, exact: bool = False, opening_book=None,
+                 transposition_cache=None, rng=None):
+        self.rng = make_rng(rng)
         self.knowledge_base = {}
         self.attempt_penalty = -1.0  # Default attempt penalty
         self.success_reward = 10.0   # Default success reward
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
+        # Exact mode: score every vocabulary word against the full candidate
+        # set instead of a random sample of at most 100 candidates
+        self.exact = exact
+        self.exact_chunk_size = 256
+        # Optional OpeningBook consulted on turns 1-2 before any scoring
+        self.opening_book = opening_book
+        # Optional TranspositionCache memoizing exact-mode selections
+        self.transposition_cache = transposition_cache
         
     def set_rewards(self, attempt_penalty: float, success_reward: float):
         """Set the reward parameters for the strategy."""
         self.attempt_penalty = attempt_penalty
         self.success_reward = success_reward
+
+    def opening_book_config(self) -> Optional[dict]:
+        """Configuration an opening book is keyed by, or None when guesses are sampled."""
+        if not self.exact:
+            return None
+        return {'strategy': 'css', 'exact': True,
+                'attempt_penalty': self.attempt_penalty, 'success_reward': self.success_reward}
         
     def update_belief(self, candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
         """Update belief and filter candidates based on feedback."""
         self.knowledge_base[guess] = feedback
-        return [word for word in candidates if self._is_consistent(word, guess, feedback)]
+        return self.feedback_matrix.filter_words(candidates, guess, feedback)
+
+    def update_belief_ids(self, candidate_ids: np.ndarray, guess_id: int, pattern: int) -> np.ndarray:
+        """ID-mode update_belief: filter candidate word IDs by a feedback pattern."""
+        self.knowledge_base[guess_id] = pattern
+        return self.feedback_matrix.filter_ids(candidate_ids, guess_id, pattern)
     
     def select_guess(self, candidates: List[str], history: List[Tuple[str, List[str]]]) -> str:
         """Select the next guess using CSS principles and expected rewards."""
@@ -26,40 +50,95 @@ class CSSStrategy:
         if len(candidates) == 1:
             return candidates[0]
 
+        guess_id = self.select_guess_ids(self.feedback_matrix.ids(candidates), history)
+        return self.feedback_matrix.words[guess_id]
+
+    def select_guess_ids(self, candidate_ids: np.ndarray, history: List[Tuple[int, int]]) -> Optional[int]:
+        """ID-mode select_guess: returns the word ID of the next guess."""
+        if len(candidate_ids) == 0:
+            return None
+
+        if len(candidate_ids) == 1:
+            return int(candidate_ids[0])
+
+        if self.opening_book is not None:
+            book_guess = self.opening_book.lookup(candidate_ids, history)
+            if book_guess is not None:
+                return book_guess
+
+        if self.exact:
+            if self.transposition_cache is None:
+                return int(np.argmax(self._exact_scores(candidate_ids)))
+            cache_key = self.transposition_cache.key(
+                candidate_ids, self.opening_book_config(), len(history) + 1)
+            guess_id = self.transposition_cache.get(cache_key)
+            if guess_id is None:
+                guess_id = int(np.argmax(self._exact_scores(candidate_ids)))
+                self.transposition_cache.put(cache_key, guess_id)
+            return guess_id
+
         # Sample candidates for efficiency
-        sample_size = min(len(candidates), 100)
-        sample_candidates = random.sample(candidates, sample_size)
-        guesses_to_evaluate = sample_candidates
+        sample_size = min(len(candidate_ids), 100)
+        sample_ids = candidate_ids[self.rng.sample(range(len(candidate_ids)), sample_size)]
+        guesses_to_evaluate = sample_ids
 
         best_guess = None
         best_score = float('-inf')
             
-        for guess in guesses_to_evaluate:
+        for guess_id in guesses_to_evaluate:
             # Calculate information gain
-            info_gain = self._calculate_information_gain(guess, sample_candidates)
+            info_gain = self._calculate_information_gain(guess_id, sample_ids)
             
             # Calculate expected reward
-            expected_reward = self._calculate_expected_reward(guess, candidates)
+            expected_reward = self._calculate_expected_reward(guess_id, candidate_ids)
             
             # Combine information gain and expected reward
             score = info_gain + 0.5 * expected_reward  # Weight can be adjusted
             
             if score > best_score:
                 best_score = score
-                best_guess = guess
+                best_guess = int(guess_id)
                 
         return best_guess
     
-    def _calculate_expected_reward(self, guess: str, candidates: List[str]) -> float:
+    def _exact_scores(self, candidate_ids: np.ndarray) -> np.ndarray:
+        """
+        Score every vocabulary word as a guess against the full candidate set.
+
+        Same score as the sampled path (entropy + 0.5 * expected reward), with
+        feedback histograms taken by np.bincount over pattern-matrix rows.
+        """
+        matrix = self.feedback_matrix.matrix
+        n_words = matrix.shape[0]
+        n_candidates = len(candidate_ids)
+        entropy = np.empty(n_words)
+
+        for start in range(0, n_words, self.exact_chunk_size):
+            rows = matrix[start:start + self.exact_chunk_size]
+            patterns = rows if n_candidates == n_words else rows[:, candidate_ids]
+            # Offset each row into its own block of NUM_PATTERNS bins
+            offsets = np.arange(len(rows))[:, None] * NUM_PATTERNS
+            counts = np.bincount((patterns + offsets).ravel(), minlength=len(rows) * NUM_PATTERNS)
+            p = counts.reshape(len(rows), NUM_PATTERNS) / n_candidates
+            log_p = np.zeros_like(p)
+            np.log2(p, out=log_p, where=p > 0)
+            entropy[start:start + len(rows)] = -np.sum(p * log_p, axis=1)
+
+        expected_reward = np.full(n_words, self.attempt_penalty)
+        expected_reward[candidate_ids] += self.success_reward / n_candidates
+
+        return entropy + 0.5 * expected_reward
+
+    def _calculate_expected_reward(self, guess_id: int, candidate_ids: np.ndarray) -> float:
         """Calculate the expected reward for a potential guess."""
-        if len(candidates) <= 1:
+        if len(candidate_ids) <= 1:
             return self.success_reward + self.attempt_penalty
             
         expected_reward = self.attempt_penalty  # Base penalty for making the attempt
         
         # Calculate probability of success
-        if guess in candidates:
-            success_prob = 1.0 / len(candidates)
+        if np.any(candidate_ids == guess_id):
+            success_prob = 1.0 / len(candidate_ids)
             expected_reward += success_prob * self.success_reward
             
         return expected_reward
@@ -68,42 +147,16 @@ class CSSStrategy:
         """
         Check if a word is consistent with the feedback from a guess.
         """
-        expected_feedback = self._generate_feedback(word, guess)
-        return expected_feedback == feedback
+        return self.feedback_matrix.pattern(guess, word) == encode_feedback(feedback)
     
     def _generate_feedback(self, target: str, guess: str) -> List[str]:
-        """Generate feedback for a guess against a target word."""
-        feedback = ["-"] * 5
-        target_chars = list(target)
-        guess_chars = list(guess)
-
-        # Mark greens
-        for i in range(5):
-            if guess_chars[i] == target_chars[i]:
-                feedback[i] = "G"
-                target_chars[i] = None
-                guess_chars[i] = None
-
-        # Mark yellows
-        for i in range(5):
-            if guess_chars[i] and guess_chars[i] in target_chars:
-                feedback[i] = "Y"
-                target_chars[target_chars.index(guess_chars[i])] = None
-
-        return feedback
+        """Look up feedback for a guess against a target word."""
+        return self.feedback_matrix.feedback(guess, target)
     
-    def _calculate_information_gain(self, guess: str, candidates: List[str]) -> float:
+    def _calculate_information_gain(self, guess_id: int, candidate_ids: np.ndarray) -> float:
         """Calculate expected information gain using entropy."""
-        feedback_counts = {}
-        total_candidates = len(candidates)
-
-        for candidate in candidates:
-            feedback = tuple(self._generate_feedback(candidate, guess))
-            feedback_counts[feedback] = feedback_counts.get(feedback, 0) + 1
-
-        entropy = 0
-        for count in feedback_counts.values():
-            p = count / total_candidates
-            entropy -= p * np.log2(p)
+        patterns = self.feedback_matrix.matrix[guess_id, candidate_ids]
+        _, feedback_counts = np.unique(patterns, return_counts=True)
 
-        return entropy
+        p = feedback_counts / len(candidate_ids)
+        return float(-np.sum(p * np.log2(p)))
@@ -0,0 +1,175 @@
+"""
+Precomputed opening book for the first two turns.
+
+On turn 1 every game starts from the full vocabulary, and on turn 2 the state
+only depends on the first guess and its feedback pattern. For deterministic
+strategy configurations both decisions can be computed once: the first guess
+and, for every reachable first-turn pattern, the best second guess. Strategies
+holding a book consult it before scoring anything.
+
+Books are keyed by the strategy configuration and the word-list hash and are
+persisted as JSON next to the word list (wordlist/opening_books/).
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
+
+from feedback_matrix import get_feedback_matrix, encode_feedback, NUM_PATTERNS
+
+DEFAULT_BOOK_DIR = Path(__file__).parent.parent / 'wordlist' / 'opening_books'
+# 2: VOI first guesses are scored with vocabulary frequency tables (version 1 books opened with ABOUT)
+BOOK_FORMAT_VERSION = 2
+
+_books: Dict[str, 'OpeningBook'] = {}
+
+
+def book_key(config: dict, vocab) -> str:
+    """Stable key for a strategy configuration on a vocabulary."""
+    payload = json.dumps(config, sort_keys=True).encode('utf-8') + vocab.fingerprint
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class OpeningBook:
+    """First guess plus one reply per first-turn feedback pattern."""
+
+    def __init__(self, vocab, config: dict, first_guess: int,
+                 replies: Dict[int, int], candidate_counts: Dict[int, int]):
+        self.vocab = vocab
+        self.config = config
+        self.first_guess = first_guess
+        self.replies = replies
+        # Candidates left after each pattern; guards against lookups from a
+        # different state that happens to share the first move
+        self.candidate_counts = candidate_counts
+
+    def lookup(self, candidate_ids: np.ndarray, history) -> Optional[int]:
+        """
+        Book move for the current state, or None if the state is not covered.
+
+        History entries may be (word_id, pattern) or (word, feedback) pairs.
+        """
+        if not history:
+            return self.first_guess if len(candidate_ids) == len(self.vocab) else None
+        if len(history) != 1:
+            return None
+
+        guess, feedback = history[0]
+        guess_id = self.vocab.word_id(guess) if isinstance(guess, str) else guess
+        if guess_id != self.first_guess:
+            return None
+        pattern = feedback if isinstance(feedback, (int, np.integer)) else encode_feedback(feedback)
+        if self.candidate_counts.get(int(pattern)) != len(candidate_ids):
+            return None
+        return self.replies.get(int(pattern))
+
+    def save(self, path) -> None:
+        """Write the book as JSON (words, not IDs) atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': BOOK_FORMAT_VERSION,
+            'word_list_hash': self.vocab.fingerprint.hex(),
+            'config': self.config,
+            'first_guess': self.vocab.word(self.first_guess),
+            'replies': {str(p): self.vocab.word(g) for p, g in self.replies.items()},
+            'candidate_counts': {str(p): c for p, c in self.candidate_counts.items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path, vocab, config: dict) -> Optional['OpeningBook']:
+        """Load a book, or None if it is missing or was built for another word list/config."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (data.get('version') != BOOK_FORMAT_VERSION
+                or data.get('word_list_hash') != vocab.fingerprint.hex()
+                or data.get('config') != config):
+            return None
+        return cls(
+            vocab, config, vocab.word_id(data['first_guess']),
+            {int(p): vocab.word_id(w) for p, w in data['replies'].items()},
+            {int(p): c for p, c in data['candidate_counts'].items()},
+        )
+
+
+def build_opening_book(strategy_factory: Callable, feedback_matrix=None) -> OpeningBook:
+    """
+    Play out the first two turns of a strategy for every first-turn pattern.
+
+    Each pattern gets a fresh strategy instance so belief state matches a real
+    game at turn 2.
+    """
+    feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
+    vocab = feedback_matrix.vocab
+    all_ids = vocab.all_ids
+
+    strategy = strategy_factory()
+    config = strategy.opening_book_config()
+    if hasattr(strategy, 'book_first_guess_ids'):
+        first_guess = strategy.book_first_guess_ids(all_ids)
+    else:
+        first_guess = strategy.select_guess_ids(all_ids, [])
+
+    replies = {}
+    candidate_counts = {}
+    reachable = np.bincount(feedback_matrix.matrix[first_guess], minlength=NUM_PATTERNS)
+    for pattern in np.flatnonzero(reachable):
+        pattern = int(pattern)
+        strategy = strategy_factory()
+        candidate_ids = strategy.update_belief_ids(all_ids, first_guess, pattern)
+        reply = strategy.select_guess_ids(candidate_ids, [(first_guess, pattern)])
+        if reply is not None:
+            replies[pattern] = int(reply)
+            candidate_counts[pattern] = len(candidate_ids)
+
+    return OpeningBook(vocab, config, int(first_guess), replies, candidate_counts)
+
+
+def get_opening_book(strategy_factory: Callable, book_dir=None) -> Optional[OpeningBook]:
+    """
+    Return the process-wide opening book for a strategy configuration.
+
+    Loads it from book_dir (default wordlist/opening_books/) or builds and
+    saves it on first use. Returns None for configurations that are not
+    deterministic and therefore cannot be booked.
+    """
+    feedback_matrix = get_feedback_matrix()
+    vocab = feedback_matrix.vocab
+    config = strategy_factory().opening_book_config()
+    if config is None:
+        return None
+
+    key = book_key(config, vocab)
+    if key not in _books:
+        book_dir = Path(book_dir) if book_dir is not None else DEFAULT_BOOK_DIR
+        path = book_dir / f"{config['strategy']}_{key}.json"
+        book = OpeningBook.load(path, vocab, config)
+        if book is None:
+            book = build_opening_book(strategy_factory, feedback_matrix)
+            try:
+                book.save(path)
+            except OSError as e:
+                print(f"Warning: could not write opening book {path}: {e}")
+        _books[key] = book
+    return _books[key]
@@ -1,16 +1,29 @@
-import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
+from seeding import make_rng
 
 class PureRandomStrategy:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = make_rng(rng)
         self.word_list = None
+        self.word_ids = None
         
     def update_belief(self, candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
         return candidates
+
+    def update_belief_ids(self, candidate_ids: np.ndarray, guess_id: int, pattern: int) -> np.ndarray:
+        return candidate_ids
     
     def select_guess(self, candidates: List[str], history: List[Tuple[str, List[str]]]) -> str:
     
         if self.word_list is None:
             self.word_list = candidates
             
-        return random.choice(self.word_list) 
\ No newline at end of file
+        return self.rng.choice(self.word_list) 
+
+    def select_guess_ids(self, candidate_ids: np.ndarray, history: List[Tuple[int, int]]) -> Optional[int]:
+
+        if self.word_ids is None:
+            self.word_ids = candidate_ids
+
+        return int(self.rng.choice(self.word_ids))
@@ -1,39 +1,33 @@
-import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
+from feedback_matrix import get_feedback_matrix, encode_feedback
+from seeding import make_rng
 
 class RandomStrategy:
-    def __init__(self):
-        pass 
+    def __init__(self, feedback_matrix=None, rng=None):
+        self.rng = make_rng(rng)
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
         
     def update_belief(self, candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
         """Filter candidates based on feedback consistency."""
-        return [word for word in candidates if self._is_consistent(word, guess, feedback)]
+        return self.feedback_matrix.filter_words(candidates, guess, feedback)
+
+    def update_belief_ids(self, candidate_ids: np.ndarray, guess_id: int, pattern: int) -> np.ndarray:
+        """ID-mode update_belief: filter candidate word IDs by a feedback pattern."""
+        return self.feedback_matrix.filter_ids(candidate_ids, guess_id, pattern)
     
     def select_guess(self, candidates: List[str], history: List[Tuple[str, List[str]]]) -> str:
         """Select a random guess from remaining candidates."""
-        return random.choice(candidates) if candidates else None
+        return self.rng.choice(candidates) if candidates else None
+
+    def select_guess_ids(self, candidate_ids: np.ndarray, history: List[Tuple[int, int]]) -> Optional[int]:
+        """ID-mode select_guess: a random candidate word ID."""
+        return int(self.rng.choice(candidate_ids)) if len(candidate_ids) else None
     
     def _is_consistent(self, word: str, guess: str, feedback: List[str]) -> bool:
         """Check if a word is consistent with the feedback from a guess."""
-        return self._generate_feedback(word, guess) == feedback
+        return self.feedback_matrix.pattern(guess, word) == encode_feedback(feedback)
 
     def _generate_feedback(self, target: str, guess: str) -> List[str]:
-        """Generate feedback for a guess against a target word."""
-        feedback = ["-"] * 5
-        target_chars = list(target)
-        guess_chars = list(guess)
-
-        # Mark greens
-        for i in range(5):
-            if guess_chars[i] == target_chars[i]:
-                feedback[i] = "G"
-                target_chars[i] = None
-                guess_chars[i] = None
-
-        # Mark yellows
-        for i in range(5):
-            if guess_chars[i] and guess_chars[i] in target_chars:
-                feedback[i] = "Y"
-                target_chars[target_chars.index(guess_chars[i])] = None
-
-        return feedback
+        """Look up feedback for a guess against a target word."""
+        return self.feedback_matrix.feedback(guess, target)
@@ -0,0 +1,127 @@
+"""
+Transposition cache for deterministic guess selection.
+
+Different games often reach the same candidate set (same opener, same
+feedback, ...). For deterministic strategy configurations the chosen guess is
+a function of that state, so it can be memoized: the key is a canonical hash
+of the candidate ID set plus the strategy configuration and turn number.
+Entries are evicted in LRU order and can optionally be persisted as JSON.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
+
+from feedback_matrix import get_vocabulary
+
+CACHE_FORMAT_VERSION = 1
+
+_caches: Dict[Optional[Path], 'TranspositionCache'] = {}
+
+
+class TranspositionCache:
+    """LRU map from (candidate set, config, turn) to the selected word ID."""
+
+    def __init__(self, maxsize: int = 100_000, path=None, vocab=None):
+        self.maxsize = maxsize
+        self.path = Path(path) if path is not None else None
+        self.vocab = vocab if vocab is not None else get_vocabulary()
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(candidate_ids: np.ndarray, config: dict, turn: int, extra: bytes = b'') -> str:
+        """
+        Canonical key for a search state.
+
+        The candidate set is hashed in sorted order, so the key does not depend
+        on how the candidates were ordered; extra carries any further state
+        the strategy's choice depends on (e.g. beliefs).
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(np.sort(np.asarray(candidate_ids, dtype=np.int64)).tobytes())
+        h.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+        h.update(int(turn).to_bytes(4, 'little'))
+        h.update(extra)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[int]:
+        """Cached word ID for a key, or None."""
+        guess_id = self._entries.get(key)
+        if guess_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return guess_id
+
+    def put(self, key: str, guess_id: int) -> None:
+        """Store the word ID selected for a key."""
+        self._entries[key] = int(guess_id)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def load(self) -> None:
+        """Merge entries from self.path (ignored if missing or built for another word list)."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (data.get('version') != CACHE_FORMAT_VERSION
+                or data.get('word_list_hash') != self.vocab.fingerprint.hex()):
+            return
+        for key, word in data.get('entries', {}).items():
+            word_id = self.vocab.word_id(word)
+            if word_id is not None:
+                self.put(key, word_id)
+
+    def save(self) -> None:
+        """Write the entries to self.path atomically (no-op without a path)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': CACHE_FORMAT_VERSION,
+            'word_list_hash': self.vocab.fingerprint.hex(),
+            'entries': {key: self.vocab.word(guess_id) for key, guess_id in self._entries.items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_transposition_cache(path=None, maxsize: int = 100_000) -> TranspositionCache:
+    """Return the process-wide transposition cache (one per persistence path)."""
+    path = Path(path).resolve() if path is not None else None
+    if path not in _caches:
+        _caches[path] = TranspositionCache(maxsize=maxsize, path=path)
+    return _caches[path]
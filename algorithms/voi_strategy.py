@@ -1,14 +1,72 @@
 import numpy as np
-from typing import List, Tuple
-import random
+from typing import Dict, List, Optional, Tuple
+import hashlib
 from collections import defaultdict, Counter
+from types import MappingProxyType
+from feedback_matrix import get_feedback_matrix, get_feedback_cache, pattern_digits, encode_feedback, NUM_PATTERNS, ALL_GREEN
+from seeding import make_rng
+
+# Letter/position frequency tables keyed by (vocabulary fingerprint, word subset);
+# shared read-only by every VOIStrategy instance in the process
+_FREQUENCY_TABLES: Dict[tuple, tuple] = {}
+_MAX_FREQUENCY_TABLES = 32
+
+
+def shared_frequency_tables(vocab, word_ids: np.ndarray):
+    """
+    Letter and per-position letter frequencies over a set of words.
+
+    Computed once per vocabulary and word set, then shared read-only
+    (MappingProxyType) across strategy instances.
+    """
+    subset_key = None if word_ids is vocab.all_ids else hashlib.sha1(
+        np.ascontiguousarray(word_ids).tobytes()).digest()
+    key = (vocab.fingerprint, subset_key)
+    if key not in _FREQUENCY_TABLES:
+        letter_frequencies = Counter()
+        position_frequencies = [defaultdict(int) for _ in range(5)]
+        for word in vocab.to_words(word_ids):
+            for i, letter in enumerate(word):
+                letter_frequencies[letter] += 1
+                position_frequencies[i][letter] += 1
+
+        total_words = len(word_ids)
+        for letter in letter_frequencies:
+            letter_frequencies[letter] /= total_words
+        for pos_freq in position_frequencies:
+            for letter in pos_freq:
+                pos_freq[letter] /= total_words
+
+        if len(_FREQUENCY_TABLES) >= _MAX_FREQUENCY_TABLES:
+            _FREQUENCY_TABLES.pop(next(iter(_FREQUENCY_TABLES)))
+        _FREQUENCY_TABLES[key] = (MappingProxyType(dict(letter_frequencies)),
+                                  [MappingProxyType(dict(f)) for f in position_frequencies])
+    return _FREQUENCY_TABLES[key]
+
 
 class VOIStrategy:
     def __init__(self, verbose: bool = False, green_match_weight: float = 0.3, 
-                 green_voi_weight: float = 0.5, letter_freq_multiplier: float = 1.0):
+                 green_voi_weight: float = 0.5, letter_freq_multiplier: float = 1.0,
+                 feedback_matrix=None, sample_size: Optional[int] = None, opening_book=None,
+                 transposition_cache=None, rng=None):
         self.verbose = verbose
-        self.beliefs = {}  
-        self.feedback_cache = {} 
+        self.rng = make_rng(rng)
+        # Optional OpeningBook consulted on turn 2 before any scoring (see select_guess_ids)
+        self.opening_book = opening_book
+        # Optional TranspositionCache memoizing unsampled guess selection
+        self.transposition_cache = transposition_cache
+        # Guesses scored per turn: None scores every candidate (batched VOI
+        # makes this cheap); an int restores random sampling of that many
+        self.sample_size = sample_size
+        self.batch_size = 256
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
+        self.vocab = self.feedback_matrix.vocab
+        self.beliefs = None  # float64 vector indexed by word ID once initialized
+        # True when beliefs were seeded from the whole vocabulary, the state an
+        # opening book's replies are computed from
+        self.seeded_from_vocab = False
+        # Process-wide, size-bounded cache shared with every other VOIStrategy
+        self.feedback_cache = get_feedback_cache(self.feedback_matrix)
         self.letter_frequencies = {}  
         self.position_frequencies = [defaultdict(int) for _ in range(5)] 
         self.common_words = set()  
@@ -32,67 +90,65 @@ class VOIStrategy:
         
     def initialize_beliefs(self, word_list: List[str]):
         """Initialize beliefs to a uniform distribution, but still calculate letter/position frequencies for other uses."""
-        self.beliefs = {}
-        self.letter_frequencies = Counter()
-        self.position_frequencies = [defaultdict(int) for _ in range(5)]
+        self.initialize_belief_ids(self.vocab.ids(word_list))
 
-        # Calculate letter frequencies (for other uses, not for beliefs)
-        for word in word_list:
-            for i, letter in enumerate(word):
-                self.letter_frequencies[letter] += 1
-                self.position_frequencies[i][letter] += 1
-
-        total_words = len(word_list)
-        for letter in self.letter_frequencies:
-            self.letter_frequencies[letter] /= total_words
-        for pos_freq in self.position_frequencies:
-            for letter in pos_freq:
-                pos_freq[letter] /= total_words
+    def initialize_belief_ids(self, word_ids: np.ndarray):
+        """ID-mode initialize_beliefs: uniform beliefs over word_ids."""
+        # Letter frequencies (for other uses, not for beliefs) are shared per vocabulary
+        self.letter_frequencies, self.position_frequencies = shared_frequency_tables(self.vocab, word_ids)
+        self.seeded_from_vocab = len(word_ids) == len(self.vocab)
 
         # Uniform initial beliefs
-        for word in word_list:
-            self.beliefs[word] = 1.0 / total_words
+        self.beliefs = np.zeros(len(self.vocab), dtype=np.float64)
+        self.beliefs[word_ids] = 1.0 / len(word_ids)
     
     def update_belief(self, candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
         """Update beliefs based on the feedback from a guess and return filtered candidates."""
-        if not self.beliefs:  
+        if self.beliefs is None:
             self.initialize_beliefs(candidates)
-        
-        feedback_int = [2 if f == "G" else 1 if f == "Y" else 0 for f in feedback]
-        
-        total_prob = 0
-        new_beliefs = {}
-        
+
+        filtered_candidates = self.feedback_matrix.filter_words(candidates, guess, feedback)
+        self._reweight(self.vocab.ids(filtered_candidates), guess, encode_feedback(feedback))
+        return filtered_candidates
+
+    def update_belief_ids(self, candidate_ids: np.ndarray, guess_id: int, pattern: int) -> np.ndarray:
+        """ID-mode update_belief: returns the filtered candidate IDs."""
+        if self.beliefs is None:
+            self.initialize_belief_ids(candidate_ids)
+
         # FIXED: Properly filter candidates based on feedback constraints
-        filtered_candidates = []
-        for word in candidates:
-            expected_feedback = self.get_feedback(guess, word)
-            
-            # Only keep candidates that match the feedback exactly
-            if expected_feedback == feedback_int:
-                filtered_candidates.append(word)
-                
-                match_score = self.calculate_match_score(expected_feedback, feedback_int)
-                word_score = self.beliefs[word] * match_score
-                
-                for i, (exp, act) in enumerate(zip(expected_feedback, feedback_int)):
-                    if exp == act and exp > 0:  
-                        letter = guess[i]
-                        word_score *= (1 + self.letter_freq_multiplier * self.letter_frequencies.get(letter, 0))
-                
-                new_beliefs[word] = word_score
-                total_prob += word_score
-            
+        filtered_ids = self.feedback_matrix.filter_ids(candidate_ids, guess_id, pattern)
+        self._reweight(filtered_ids, self.vocab.word(guess_id), pattern)
+        return filtered_ids
+
+    def _reweight(self, filtered_ids: np.ndarray, guess: str, pattern: int):
+        """Multiplicative belief update and renormalization over the surviving candidates."""
+        feedback_int = pattern_digits(pattern)
+
+        # Survivors reproduce the observed feedback exactly, so the match score
+        # and letter-frequency boost are the same for all of them
+        word_score = self.calculate_match_score(feedback_int, feedback_int)
+        for i, act in enumerate(feedback_int):
+            if act > 0:
+                letter = guess[i]
+                word_score *= (1 + self.letter_freq_multiplier * self.letter_frequencies.get(letter, 0))
+
+        new_beliefs = self.beliefs[filtered_ids] * word_score
+        total_prob = new_beliefs.sum()
+
         # Normalize beliefs only for filtered candidates
         if total_prob > 0:
-            for word in filtered_candidates:
-                self.beliefs[word] = new_beliefs[word] / total_prob
-        else:
+            self.beliefs[filtered_ids] = new_beliefs / total_prob
+        elif len(filtered_ids):
             # Fallback: uniform distribution over filtered candidates
-            for word in filtered_candidates:
-                self.beliefs[word] = 1.0 / len(filtered_candidates) if filtered_candidates else 0
-                
-        return filtered_candidates
+            self.beliefs[filtered_ids] = 1.0 / len(filtered_ids)
+
+    def belief(self, word: str) -> float:
+        """Current belief that a word is the target."""
+        word_id = self.vocab.word_id(word)
+        if self.beliefs is None or word_id is None:
+            return 0.0
+        return float(self.beliefs[word_id])
     
 
     def calculate_match_score(self, expected: List[int], actual: List[int]) -> float:
@@ -117,112 +173,164 @@ class VOIStrategy:
     
     def get_feedback(self, guess: str, target: str) -> List[int]:
         """Get feedback from cache or calculate it."""
-        key = (guess, target)
-        if key not in self.feedback_cache:
-            self.feedback_cache[key] = self.calculate_feedback(guess, target)
-        return self.feedback_cache[key]
+        return pattern_digits(self.feedback_cache.pattern(guess, target))
     
     def calculate_feedback(self, guess: str, target: str) -> List[int]:
-        """Calculate what feedback a guess would get against a target word."""
-        feedback = [0] * len(guess)
-        used = [False] * len(target)
-        
-        for i in range(len(guess)):
-            if guess[i] == target[i]:
-                feedback[i] = 2
-                used[i] = True
-        
-        for i in range(len(guess)):
-            if feedback[i] == 0:  
-                for j in range(len(target)):
-                    if not used[j] and guess[i] == target[j]:
-                        feedback[i] = 1
-                        used[j] = True
-                        break
-        
-        return feedback
+        """Look up what feedback a guess would get against a target word."""
+        return pattern_digits(self.feedback_cache.pattern(guess, target))
     
     def calculate_voi(self, guess: str, candidates: List[str]) -> float:
         """Calculate the Value of Information for a potential guess."""
         if len(candidates) <= 1:
             return 0.0
-            
-        feedback_groups = defaultdict(list)
-        for target in candidates:
-            feedback = self.get_feedback(guess, target)
-            feedback_groups[tuple(feedback)].append(target)
-        
-        # IMPROVED: Calculate expected entropy reduction (information gain)
-        entropy_before = self.calculate_entropy(candidates)
-        expected_entropy_after = 0
-        
-        for feedback, group in feedback_groups.items():
-            group_prob = sum(self.beliefs.get(word, 0) for word in group)
-            if group_prob > 0:
-                # Calculate entropy within this group
-                group_entropy = 0
-                for word in group:
-                    p = self.beliefs.get(word, 0) / group_prob
-                    if p > 0:
-                        group_entropy -= p * np.log2(p)
-                
-                # Weight by probability of this feedback occurring
-                expected_entropy_after += group_prob * group_entropy
-        
-        # Information gain is the reduction in entropy
-        info_gain = entropy_before - expected_entropy_after
-        
-        # IMPROVED: Add diversity bonus - penalize guesses that create large groups
-        max_group_size = max(len(group) for group in feedback_groups.values())
-        diversity_bonus = -0.1 * (max_group_size / len(candidates))  # Penalty for large groups
-        
-        return info_gain + diversity_bonus
+
+        info_gain, diversity_bonus, _ = self._voi_from_patterns(
+            self.feedback_matrix.patterns(guess, candidates)[None, :], self._belief_vector(candidates))
+        return float(info_gain[0] + diversity_bonus[0])
+
+    def calculate_voi_batch(self, guess_ids: np.ndarray, candidate_ids: np.ndarray,
+                            beliefs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Batched VOI engine over word IDs.
+
+        beliefs holds the belief of each candidate (aligned with candidate_ids).
+        Returns (info_gain, diversity_penalty, expected_reward), one entry per
+        guess, computed from belief-weighted pattern histograms.
+        """
+        n_guesses = len(guess_ids)
+        if len(candidate_ids) <= 1:
+            return (np.zeros(n_guesses), np.zeros(n_guesses),
+                    np.full(n_guesses, self.success_reward + self.attempt_penalty))
+
+        info_gain = np.empty(n_guesses)
+        diversity_penalty = np.empty(n_guesses)
+        expected_reward = np.empty(n_guesses)
+        matrix = self.feedback_matrix.matrix
+        for start in range(0, n_guesses, self.batch_size):
+            batch = slice(start, start + self.batch_size)
+            patterns = matrix[np.ix_(guess_ids[batch], candidate_ids)]
+            info_gain[batch], diversity_penalty[batch], expected_reward[batch] = \
+                self._voi_from_patterns(patterns, beliefs)
+
+        return info_gain, diversity_penalty, expected_reward
+
+    def _voi_from_patterns(self, patterns: np.ndarray,
+                           beliefs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        VOI terms for a (guesses x candidates) block of feedback patterns.
+
+        With P_k the belief mass of feedback group k, the expected entropy
+        after the guess is sum_k P_k log2 P_k - sum_w b_w log2 b_w, so the
+        information gain reduces to -sum_k P_k log2 P_k. The guess can only
+        win in the all-green group, whose mass is the guess's own belief.
+        """
+        n_guesses, n_candidates = patterns.shape
+        offsets = np.arange(n_guesses)[:, None] * NUM_PATTERNS
+        flat = (patterns + offsets).ravel()
+        size = n_guesses * NUM_PATTERNS
+
+        group_prob = np.bincount(flat, weights=np.tile(beliefs, n_guesses),
+                                 minlength=size).reshape(n_guesses, NUM_PATTERNS)
+        group_size = np.bincount(flat, minlength=size).reshape(n_guesses, NUM_PATTERNS)
+
+        log_prob = np.zeros_like(group_prob)
+        np.log2(group_prob, out=log_prob, where=group_prob > 0)
+        info_gain = -np.sum(group_prob * log_prob, axis=1)
+
+        # Penalty for guesses that leave large groups
+        diversity_penalty = -0.1 * (group_size.max(axis=1) / n_candidates)
+
+        expected_reward = self.attempt_penalty + group_prob[:, ALL_GREEN] * self.success_reward
+
+        return info_gain, diversity_penalty, expected_reward
+
+    def _belief_vector(self, candidates: List[str]) -> np.ndarray:
+        """Beliefs of the candidates as an array aligned with the list."""
+        return np.array([self.belief(word) for word in candidates], dtype=np.float64)
+
+    def _belief_vector_ids(self, candidate_ids: np.ndarray) -> np.ndarray:
+        """Beliefs of the candidate IDs (zeros before initialization)."""
+        if self.beliefs is None:
+            return np.zeros(len(candidate_ids), dtype=np.float64)
+        return self.beliefs[candidate_ids]
     
     def calculate_entropy(self, candidates: List[str]) -> float:
         """Calculate the current entropy of the belief distribution."""
-        entropy = 0
-        for word in candidates:
-            p = self.beliefs.get(word, 0)
-            if p > 0:
-                entropy -= p * np.log2(p)
-        return entropy
+        p = self._belief_vector(candidates)
+        p = p[p > 0]
+        return float(-np.sum(p * np.log2(p)))
     
     def select_first_guess(self, candidates: List[str]) -> str:
         """Select an optimal first guess based on letter frequencies and patterns."""
+        return self.vocab.word(self.select_first_guess_ids(self.vocab.ids(candidates)))
+
+    def select_first_guess_ids(self, candidate_ids: np.ndarray) -> int:
+        """ID-mode select_first_guess."""
         # IMPROVED: Add some randomization and better scoring
         best_guesses = []
         best_score = -float('inf')
         
         # Sample candidates if list is too large
-        sample_size = min(len(candidates), 500)
-        sampled_candidates = random.sample(candidates, sample_size)
+        sample_size = min(len(candidate_ids), 500)
+        sampled_candidates = candidate_ids[self.rng.sample(range(len(candidate_ids)), sample_size)]
         
-        for word in sampled_candidates:
-            score = 0
-            used_letters = set()
-            
-            # Score based on unique letters (diversity)
-            for i, letter in enumerate(word):
-                if letter not in used_letters:
-                    # Prioritize common letters
-                    score += self.letter_frequencies.get(letter, 0) * 3
-                    used_letters.add(letter)
-                # Position-specific frequency
-                score += self.position_frequencies[i].get(letter, 0) * 0.5
-            
-            # Bonus for 5 unique letters (maximum information)
-            if len(used_letters) == 5:
-                score += 0.5
+        for word_id in sampled_candidates:
+            score = self._first_guess_score(self.vocab.word(word_id))
             
             if score > best_score:
                 best_score = score
-                best_guesses = [word]
+                best_guesses = [int(word_id)]
             elif score == best_score:
-                best_guesses.append(word)
+                best_guesses.append(int(word_id))
         
         # FIXED: Return a random choice from top guesses to avoid always picking AEROS
-        return random.choice(best_guesses) if best_guesses else candidates[0]
+        return self.rng.choice(best_guesses) if best_guesses else int(candidate_ids[0])
     
+    def book_first_guess_ids(self, candidate_ids: np.ndarray) -> int:
+        """
+        Deterministic first guess for the opening book: best score over all candidates (first on ties).
+
+        Scored with the frequency tables of the candidates themselves, since a
+        fresh strategy has not built its tables yet.
+        """
+        tables = shared_frequency_tables(self.vocab, candidate_ids)
+        scores = [self._first_guess_score(word, *tables) for word in self.vocab.to_words(candidate_ids)]
+        return int(candidate_ids[int(np.argmax(scores))])
+
+    def _first_guess_score(self, word: str, letter_frequencies=None, position_frequencies=None) -> float:
+        """Letter-frequency score of a word as an opening guess (defaults to the strategy's tables)."""
+        letter_frequencies = letter_frequencies if letter_frequencies is not None else self.letter_frequencies
+        position_frequencies = position_frequencies if position_frequencies is not None else self.position_frequencies
+        score = 0
+        used_letters = set()
+        
+        # Score based on unique letters (diversity)
+        for i, letter in enumerate(word):
+            if letter not in used_letters:
+                # Prioritize common letters
+                score += letter_frequencies.get(letter, 0) * 3
+                used_letters.add(letter)
+            # Position-specific frequency
+            score += position_frequencies[i].get(letter, 0) * 0.5
+        
+        # Bonus for 5 unique letters (maximum information)
+        if len(used_letters) == 5:
+            score += 0.5
+        return score
+
+    def opening_book_config(self) -> Optional[dict]:
+        """Configuration an opening book is keyed by, or None when guesses are sampled."""
+        if self.sample_size is not None:
+            return None
+        return {
+            'strategy': 'voi',
+            'green_match_weight': self.green_match_weight,
+            'green_voi_weight': self.green_voi_weight,
+            'letter_freq_multiplier': self.letter_freq_multiplier,
+            'attempt_penalty': self.attempt_penalty,
+            'success_reward': self.success_reward,
+        }
+
     def set_rewards(self, attempt_penalty: float, success_reward: float):
         """Set the reward parameters for the strategy."""
         self.attempt_penalty = attempt_penalty
@@ -232,38 +340,60 @@ class VOIStrategy:
         """Calculate the expected reward for a potential guess."""
         if len(candidates) <= 1:
             return self.success_reward + self.attempt_penalty  # If only one candidate, we'll get it right
-            
-        feedback_groups = defaultdict(list)
-        for target in candidates:
-            feedback = self.get_feedback(guess, target)
-            feedback_groups[tuple(feedback)].append(target)
-            
-        expected_reward = self.attempt_penalty  # Base penalty for making the attempt
-        
-        # Calculate probability of success and expected reward
-        for feedback, group in feedback_groups.items():
-            group_prob = sum(self.beliefs.get(word, 0) for word in group)
-            if guess in group:  # If the guess is in the group, we might win
-                expected_reward += group_prob * self.success_reward
-                
-        return expected_reward
+
+        _, _, expected_reward = self._voi_from_patterns(
+            self.feedback_matrix.patterns(guess, candidates)[None, :], self._belief_vector(candidates))
+        return float(expected_reward[0])
     
     def select_guess(self, candidates: List[str], history: List[Tuple[str, List[int]]]) -> str:
         """Select the next guess using VOI strategy and expected rewards."""
         if not candidates:
             print("[VOIStrategy] Warning: No candidates left to guess from.")
             return None
+
+        # Out-of-vocabulary guesses (e.g. from an LLM) can never be candidates
+        id_history = [(self.vocab.index.get(guess, -1), feedback) for guess, feedback in history]
+        guess_id = self.select_guess_ids(self.vocab.ids(candidates), id_history)
+        return self.vocab.word(guess_id) if guess_id is not None else None
+
+    def select_guess_ids(self, candidate_ids: np.ndarray, history: List[Tuple[int, int]]) -> Optional[int]:
+        """ID-mode select_guess: returns the word ID of the next guess."""
+        if len(candidate_ids) == 0:
+            print("[VOIStrategy] Warning: No candidates left to guess from.")
+            return None
         
         # Track attempt number
         self.current_attempt = len(history) + 1
+
+        # Book replies only hold for beliefs seeded from the whole vocabulary. That
+        # excludes turn 1 (the live opener is a draw from self.rng) and hybrids,
+        # which seed beliefs from the candidates left after another strategy's guess.
+        if self.opening_book is not None and self.seeded_from_vocab:
+            book_guess = self.opening_book.lookup(candidate_ids, history)
+            if book_guess is not None:
+                return book_guess
             
         if not history: 
-            return self.select_first_guess(candidates)
+            return self.select_first_guess_ids(candidate_ids)
+
+        beliefs = self._belief_vector_ids(candidate_ids)
         
         # IMPROVED: If only a few candidates left, just pick the most likely one
-        if len(candidates) <= 2:
+        if len(candidate_ids) <= 2:
             # Pick the candidate with highest belief
-            return max(candidates, key=lambda w: self.beliefs.get(w, 0))
+            return int(candidate_ids[np.argmax(beliefs)])
+
+        previous_guesses = [guess_id for guess_id, _ in history]
+        cache_key = None
+        config = self.opening_book_config()
+        if self.transposition_cache is not None and config is not None:
+            # Beliefs and still-possible previous guesses are part of the state
+            excluded = np.intersect1d(np.asarray(previous_guesses, dtype=np.int64), candidate_ids)
+            cache_key = self.transposition_cache.key(
+                candidate_ids, config, self.current_attempt, beliefs.tobytes() + excluded.tobytes())
+            cached_guess = self.transposition_cache.get(cache_key)
+            if cached_guess is not None:
+                return cached_guess
         
         best_guess = None
         best_score = -float('inf')
@@ -272,33 +402,40 @@ class VOIStrategy:
         # Later attempts should be more exploitative (pick from remaining candidates)
         exploration_factor = max(0.2, 1.0 - (self.current_attempt / 6.0))
         
-        # Sample candidates for efficiency
-        sample_size = min(len(candidates), 200)
-        sampled_candidates = random.sample(candidates, sample_size)
-        
-        for guess in sampled_candidates:
-            if guess not in [h[0] for h in history]:
-                # Calculate both VOI and expected reward
-                voi = self.calculate_voi(guess, candidates)
-                expected_reward = self.calculate_expected_reward(guess, candidates)
-                
-                # IMPROVED: Adaptive weighting based on attempt number
-                # Early attempts: prioritize VOI (exploration)
-                # Late attempts: prioritize expected reward (exploitation)
-                score = (exploration_factor * voi + 
-                        (1 - exploration_factor) * self.reward_weight * expected_reward)
-                
-                # IMPROVED: Bonus for guessing from remaining candidates
-                if guess in candidates:
-                    candidate_bonus = 0.5 * (1 - exploration_factor)  # Increases as attempts increase
-                    score += candidate_bonus
-                
-                if score > best_score:
-                    best_score = score
-                    best_guess = guess
+        # Sample candidates for efficiency (only when a sample size is configured)
+        if self.sample_size is not None:
+            sample_size = min(len(candidate_ids), self.sample_size)
+            sampled_candidates = candidate_ids[self.rng.sample(range(len(candidate_ids)), sample_size)]
+        else:
+            sampled_candidates = candidate_ids
+
+        guess_ids = sampled_candidates[~np.isin(sampled_candidates, previous_guesses)]
+
+        if len(guess_ids):
+            # Calculate both VOI and expected reward for all guesses at once
+            info_gain, diversity_bonus, expected_reward = self.calculate_voi_batch(
+                guess_ids, candidate_ids, beliefs)
+            voi = info_gain + diversity_bonus
+
+            # IMPROVED: Adaptive weighting based on attempt number
+            # Early attempts: prioritize VOI (exploration)
+            # Late attempts: prioritize expected reward (exploitation)
+            scores = (exploration_factor * voi +
+                      (1 - exploration_factor) * self.reward_weight * expected_reward)
+
+            # IMPROVED: Bonus for guessing from remaining candidates
+            # (increases as attempts increase)
+            in_candidates = np.isin(guess_ids, candidate_ids)
+            scores = scores + in_candidates * 0.5 * (1 - exploration_factor)
+
+            best_index = int(np.argmax(scores))
+            best_guess = int(guess_ids[best_index])
+            best_score = scores[best_index]
         
-        if self.verbose:
-            print(f"[Attempt {self.current_attempt}] Selected guess '{best_guess}' with score: {best_score:.4f} (candidates: {len(candidates)})")
+        if self.verbose and best_guess is not None:
+            print(f"[Attempt {self.current_attempt}] Selected guess '{self.vocab.word(best_guess)}' with score: {best_score:.4f} (candidates: {len(candidate_ids)})")
         
-        return best_guess if best_guess else candidates[0]
-
+        best_guess = best_guess if best_guess is not None else int(candidate_ids[0])
+        if cache_key is not None:
+            self.transposition_cache.put(cache_key, best_guess)
+        return best_guess
@@ -6,19 +6,26 @@ to understand iterative reasoning ability in LLMs vs algorithms.
 
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
-import glob
 from typing import Dict, List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+
+from results_store import load_results
+from results_catalog import get_results_catalog
+
+DISTANCE_COLUMNS = [f'{metric}_{round_num}' for metric in ('hamming', 'levenshtein') for round_num in range(1, 7)]
+
 def analyze_algorithm_convergence(file_path: str) -> Dict:
     """Analyze convergence patterns for pure algorithms."""
     print(f"\n{'='*80}")
     print("ANALYZING PURE ALGORITHMS")
     print(f"{'='*80}")
 
-    df = pd.read_csv(file_path)
+    df = load_results(file_path, DISTANCE_COLUMNS)
 
     results = {
         'category': 'Pure Algorithms',
@@ -84,18 +91,17 @@ def analyze_llm_convergence(base_path: str) -> Dict:
     print("ANALYZING PURE LLMs")
     print(f"{'='*80}")
 
-    llm_files = glob.glob(f"{base_path}/results/llms/raw data/model_*.csv")
+    llm_entries = get_results_catalog().query(f"{base_path}/results/llms/raw data", category='llms')
 
     all_results = []
 
-    for file_path in llm_files:
-        file_name = Path(file_path).stem
-        df = pd.read_csv(file_path)
+    for entry in llm_entries:
+        file_name = entry.path.stem
+        df = load_results(entry.path, ['attempt_number', 'candidates_before', 'candidates_after',
+                                       'information_gain_bits'])
 
-        # Extract model name and prompting strategy
-        parts = file_name.replace('model_', '').split('_')
         # Normalize both 'cot' and 'chain-of-thought' to 'chain-of-thought'
-        if 'chain-of-thought' in file_name or '_cot_' in file_name:
+        if entry.prompt_type in ('cot', 'chain-of-thought'):
             prompting = 'chain-of-thought'
         else:
             prompting = 'zero-shot'
@@ -206,18 +212,14 @@ def analyze_hybrid_convergence(base_path: str, stage: str, is_cot: bool = False)
     print(f"ANALYZING {label.upper()}")
     print(f"{'='*80}")
 
-    if is_cot:
-        pattern = f"{base_path}/results/hybrids/{stage_name}/raw data/alternating_*_cot_*.csv"
-    else:
-        pattern = f"{base_path}/results/hybrids/{stage_name}/raw data/alternating_*.csv"
-
-    hybrid_files = glob.glob(pattern)
+    hybrid_entries = get_results_catalog().query(f"{base_path}/results/hybrids/{stage_name}/raw data",
+                                                 category='hybrids', prompt_type='cot' if is_cot else None)
 
     all_results = []
 
-    for file_path in hybrid_files:
-        file_name = Path(file_path).stem
-        df = pd.read_csv(file_path)
+    for entry in hybrid_entries:
+        file_name = entry.path.stem
+        df = load_results(entry.path, DISTANCE_COLUMNS + [f'strategy_{round_num}' for round_num in range(1, 7)])
 
         # Calculate distances by round
         hamming_by_round = {}
@@ -741,7 +743,7 @@ def format_output(algo_results, llm_results, hybrid_results, hybrid_cot_results)
 
 def main():
     """Main analysis pipeline."""
-    base_path = "/Users/kevin/Desktop/wordle"
+    base_path = str(Path(__file__).parent)
 
     # Analyze each category
     print("\nStarting comprehensive convergence analysis...")
@@ -0,0 +1,354 @@
+"""
+Precomputed Wordle feedback patterns.
+
+Feedback for a (guess, target) pair is encoded as a single base-3 integer:
+position i contributes 3**i times 0 (gray), 1 (yellow) or 2 (green), so every
+pattern fits in 0-242 and 242 means all five letters are green.
+
+The FeedbackMatrix holds the pattern for every guess/target pair of the word
+list as a dense uint8 matrix (rows = guesses, columns = targets), so strategies,
+the environment and the analysis scripts can look feedback up instead of
+recomputing it letter by letter.
+
+The matrix is persisted next to the word list (wordlist.txt ->
+wordlist_feedback_matrix.bin) and opened with numpy.memmap, so processes start
+without rebuilding it and share its pages through the OS page cache. The file
+header records the format version and a hash of the word list; a mismatch
+triggers a rebuild.
+"""
+
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from vocabulary import Vocabulary, word_list_hash
+
+WORD_LENGTH = 5
+NUM_PATTERNS = 3 ** WORD_LENGTH
+ALL_GREEN = NUM_PATTERNS - 1
+
+DEFAULT_WORDLIST_PATH = Path(__file__).parent.parent / 'wordlist' / 'wordlist.txt'
+
+# Cache file layout: magic, format version, word count, sha256 of the word list,
+# padded to HEADER_SIZE bytes, followed by the row-major uint8 matrix.
+MATRIX_MAGIC = b'WRDLFBM\x00'
+MATRIX_FORMAT_VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct('<8sII32s')
+
+_SYMBOL_VALUES = {'-': 0, 'Y': 1, 'G': 2}
+_VALUE_SYMBOLS = ['-', 'Y', 'G']
+
+
+def encode_feedback(feedback: Union[str, Sequence[str], Sequence[int]]) -> int:
+    """
+    Encode feedback as a base-3 pattern.
+
+    Accepts a string like 'GY--G', a list like ['G', 'Y', '-', '-', 'G']
+    or an integer list like [2, 1, 0, 0, 2].
+    """
+    pattern = 0
+    for i, f in enumerate(feedback):
+        value = f if isinstance(f, (int, np.integer)) else _SYMBOL_VALUES[f]
+        pattern += int(value) * 3 ** i
+    return pattern
+
+
+def pattern_digits(pattern: int) -> List[int]:
+    """Decode a pattern into integer feedback (2 = green, 1 = yellow, 0 = gray)."""
+    pattern = int(pattern)
+    return [(pattern // 3 ** i) % 3 for i in range(WORD_LENGTH)]
+
+
+def decode_pattern(pattern: int) -> List[str]:
+    """Decode a pattern into string feedback (['G', 'Y', '-', ...])."""
+    return [_VALUE_SYMBOLS[d] for d in pattern_digits(pattern)]
+
+
+def compute_pattern(guess: str, target: str) -> int:
+    """Compute the feedback pattern of a guess against a target word."""
+    pattern = 0
+    target_chars = list(target)
+    guess_chars = list(guess)
+
+    # Mark greens
+    for i in range(WORD_LENGTH):
+        if guess_chars[i] == target_chars[i]:
+            pattern += 2 * 3 ** i
+            target_chars[i] = None
+            guess_chars[i] = None
+
+    # Mark yellows
+    for i in range(WORD_LENGTH):
+        if guess_chars[i] and guess_chars[i] in target_chars:
+            pattern += 3 ** i
+            target_chars[target_chars.index(guess_chars[i])] = None
+
+    return pattern
+
+
+def build_feedback_matrix(words: Sequence[str], chunk_size: int = 64) -> np.ndarray:
+    """
+    Build the dense guess x target pattern matrix for a word list.
+
+    Greens are matched first; a non-green guess letter is yellow while the
+    target still has unmatched copies of it that were not claimed by an
+    earlier guess position (same rule as compute_pattern).
+    """
+    alphabet = {c: i for i, c in enumerate(sorted({c for word in words for c in word}))}
+    letters = np.array([[alphabet[c] for c in word] for word in words], dtype=np.uint8)
+    n = len(words)
+    matrix = np.empty((n, n), dtype=np.uint8)
+
+    targets = letters[None, :, :]
+    for start in range(0, n, chunk_size):
+        guesses = letters[start:start + chunk_size, None, :]
+        green = guesses == targets
+        not_green = ~green
+        pattern = np.zeros(green.shape[:2], dtype=np.uint8)
+
+        for i in range(WORD_LENGTH):
+            letter = guesses[:, :, i]
+            # Copies of this letter in the target not already matched green
+            available = np.zeros_like(pattern)
+            for j in range(WORD_LENGTH):
+                available += (targets[:, :, j] == letter) & not_green[:, :, j]
+            # Earlier non-green guess positions competing for the same copies
+            claimed = np.zeros_like(pattern)
+            for k in range(i):
+                claimed += (guesses[:, :, k] == letter) & not_green[:, :, k]
+            yellow = not_green[:, :, i] & (available > claimed)
+            pattern += (2 * green[:, :, i] + yellow).astype(np.uint8) * np.uint8(3 ** i)
+
+        matrix[start:start + chunk_size] = pattern
+
+    return matrix
+
+
+def load_word_list(filepath=None) -> List[str]:
+    """Load the uppercase 5-letter word list the matrix is indexed by."""
+    filepath = Path(filepath) if filepath is not None else DEFAULT_WORDLIST_PATH
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip().upper() for line in f if len(line.strip()) == WORD_LENGTH]
+
+
+def default_cache_path(wordlist_path) -> Path:
+    """Matrix cache file stored next to a word list."""
+    wordlist_path = Path(wordlist_path)
+    return wordlist_path.with_name(f"{wordlist_path.stem}_feedback_matrix.bin")
+
+
+def save_matrix(matrix: np.ndarray, words: Sequence[str], cache_path) -> None:
+    """Write a matrix and its header atomically (temp file + rename)."""
+    cache_path = Path(cache_path)
+    header = _HEADER.pack(MATRIX_MAGIC, MATRIX_FORMAT_VERSION, len(words), word_list_hash(words))
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE, b'\x00'))
+            f.write(np.ascontiguousarray(matrix, dtype=np.uint8).tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_matrix(words: Sequence[str], cache_path) -> Optional[np.ndarray]:
+    """
+    Memory-map a cached matrix read-only.
+
+    Returns None if the file is missing, truncated, from another format
+    version or built for a different word list.
+    """
+    cache_path = Path(cache_path)
+    n = len(words)
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or cache_path.stat().st_size != HEADER_SIZE + n * n:
+            return None
+    except OSError:
+        return None
+
+    magic, version, count, digest = _HEADER.unpack(header[:_HEADER.size])
+    if magic != MATRIX_MAGIC or version != MATRIX_FORMAT_VERSION:
+        return None
+    if count != n or digest != word_list_hash(words):
+        return None
+    return np.memmap(cache_path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(n, n))
+
+
+def load_or_build_matrix(words: Sequence[str], cache_path) -> np.ndarray:
+    """Open the cached matrix, rebuilding and saving it if it is stale or missing."""
+    matrix = open_matrix(words, cache_path)
+    if matrix is not None:
+        return matrix
+
+    matrix = build_feedback_matrix(words)
+    try:
+        save_matrix(matrix, words, cache_path)
+    except OSError as e:
+        # Read-only checkout: keep the in-memory matrix for this process
+        print(f"Warning: could not write feedback matrix cache {cache_path}: {e}")
+        return matrix
+    return open_matrix(words, cache_path)
+
+
+class FeedbackMatrix:
+    """Guess x target feedback patterns for a fixed word list."""
+
+    def __init__(self, words: Union[Sequence[str], Vocabulary], matrix: Optional[np.ndarray] = None):
+        self.vocab = words if isinstance(words, Vocabulary) else Vocabulary(words)
+        self.words = self.vocab.words
+        self.index: Dict[str, int] = self.vocab.index
+        self.matrix = matrix if matrix is not None else build_feedback_matrix(self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def word_id(self, word: str) -> Optional[int]:
+        """Return the row/column index of a word, or None if it is not in the list."""
+        return self.index.get(word)
+
+    def pattern(self, guess: str, target: str) -> int:
+        """Look up the pattern for a pair, computing it for out-of-list words."""
+        guess_id = self.index.get(guess)
+        target_id = self.index.get(target)
+        if guess_id is None or target_id is None:
+            return compute_pattern(guess, target)
+        return int(self.matrix[guess_id, target_id])
+
+    def patterns(self, guess: str, targets: Sequence[str]) -> np.ndarray:
+        """Patterns of one guess against many targets, as an int array."""
+        guess_id = self.index.get(guess)
+        target_ids = [self.index.get(t) for t in targets]
+        if guess_id is not None and None not in target_ids:
+            return self.matrix[guess_id, target_ids].astype(np.int64)
+        return np.array([self.pattern(guess, t) for t in targets], dtype=np.int64)
+
+    def feedback(self, guess: str, target: str) -> List[str]:
+        """String feedback (['G', 'Y', '-', ...]) for a guess against a target."""
+        return decode_pattern(self.pattern(guess, target))
+
+    def ids(self, words: Sequence[str]) -> np.ndarray:
+        """Word IDs (row/column indices) for in-list words, as an index array."""
+        return self.vocab.ids(words)
+
+    def filter_ids(self, candidate_ids: np.ndarray, guess_id: int, pattern: int) -> np.ndarray:
+        """
+        Candidate IDs consistent with a guess and its feedback pattern.
+
+        One row of the matrix is compared against the observed pattern, so
+        filtering is a single vectorized comparison; order is preserved.
+        """
+        return candidate_ids[self.matrix[guess_id, candidate_ids] == pattern]
+
+    def filter_words(self, candidates: Sequence[str], guess: str,
+                     feedback: Union[int, str, Sequence[str], Sequence[int]]) -> List[str]:
+        """String-based wrapper around filter_ids (falls back for out-of-list words)."""
+        pattern = feedback if isinstance(feedback, (int, np.integer)) else encode_feedback(feedback)
+        guess_id = self.index.get(guess)
+        candidate_ids = [self.index.get(w) for w in candidates]
+        if None in candidate_ids:
+            return [w for w in candidates if self.pattern(guess, w) == pattern]
+
+        candidate_ids = np.array(candidate_ids, dtype=np.int64)
+        if guess_id is None:
+            row = np.array([compute_pattern(guess, self.words[i]) for i in candidate_ids], dtype=np.int64)
+            survivors = candidate_ids[row == pattern]
+        else:
+            survivors = self.filter_ids(candidate_ids, guess_id, pattern)
+        return [self.words[i] for i in survivors]
+
+
+class FeedbackCache:
+    """
+    Bounded LRU cache of feedback patterns, shared by strategies in a process.
+
+    Pairs covered by the feedback matrix are answered straight from the matrix;
+    only pairs involving out-of-list words (e.g. LLM guesses) are computed and
+    stored, as a single int pattern per (guess, target) key.
+    """
+
+    def __init__(self, feedback_matrix: FeedbackMatrix, maxsize: int = 100_000):
+        self.feedback_matrix = feedback_matrix
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[tuple, int]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def pattern(self, guess: str, target: str) -> int:
+        """Pattern for a guess/target pair."""
+        index = self.feedback_matrix.index
+        guess_id = index.get(guess)
+        target_id = index.get(target)
+        if guess_id is not None and target_id is not None:
+            return int(self.feedback_matrix.matrix[guess_id, target_id])
+
+        key = (guess, target)
+        pattern = self._entries.get(key)
+        if pattern is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return pattern
+
+        self.misses += 1
+        pattern = compute_pattern(guess, target)
+        self._entries[key] = pattern
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return pattern
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+_matrices: Dict[Path, FeedbackMatrix] = {}
+_caches: Dict[int, FeedbackCache] = {}
+
+
+def get_vocabulary(wordlist_path=None) -> Vocabulary:
+    """Return the process-wide vocabulary the feedback matrix is indexed by."""
+    return get_feedback_matrix(wordlist_path).vocab
+
+
+def get_feedback_matrix(wordlist_path=None, cache: bool = True) -> FeedbackMatrix:
+    """
+    Return the process-wide feedback matrix for a word list.
+
+    With cache=True the matrix is memory-mapped from the on-disk cache next to
+    the word list (built and written on first use or when the list changed).
+    """
+    path = Path(wordlist_path).resolve() if wordlist_path is not None else DEFAULT_WORDLIST_PATH.resolve()
+    if path not in _matrices:
+        words = load_word_list(path)
+        matrix = load_or_build_matrix(words, default_cache_path(path)) if cache else None
+        _matrices[path] = FeedbackMatrix(words, matrix)
+    return _matrices[path]
+
+
+def get_feedback_cache(feedback_matrix: Optional[FeedbackMatrix] = None) -> FeedbackCache:
+    """Return the process-wide feedback cache for a feedback matrix (default word list if None)."""
+    feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
+    key = id(feedback_matrix)
+    if key not in _caches or _caches[key].feedback_matrix is not feedback_matrix:
+        _caches[key] = FeedbackCache(feedback_matrix)
+    return _caches[key]
@@ -1,25 +1,50 @@
+from feedback_matrix import get_vocabulary, encode_feedback
+from seeding import make_rng
+
 class GuessingAgent:
     
-    def __init__(self, word_list, strategy):
+    def __init__(self, word_list, strategy, use_ids=False, vocab=None, rng=None):
         self.word_list = word_list
         self.strategy = strategy
+        # An injected RNG replaces the strategy's random stream
+        if rng is not None:
+            self.strategy.rng = make_rng(rng)
+        # ID mode: candidates are word-ID arrays and the strategy's *_ids
+        # methods are used; words only cross the env boundary
+        self.use_ids = use_ids
+        if use_ids:
+            self.vocab = vocab if vocab is not None else get_vocabulary()
+            self.word_ids = self.vocab.ids(word_list)
         self.reset()
 
     def reset(self):
-        self.candidates = self.word_list.copy()
+        if self.use_ids:
+            self.candidate_ids = self.word_ids
+        else:
+            self.candidates = self.word_list.copy()
         self.history = []
         self.total_reward = 0
 
     def update(self, guess, feedback, reward):
-        self.candidates = self.strategy.update_belief(self.candidates, guess, feedback)
-        self.history.append((guess, feedback))
+        if self.use_ids:
+            guess_id = self.vocab.index[guess]
+            pattern = encode_feedback(feedback)
+            self.candidate_ids = self.strategy.update_belief_ids(self.candidate_ids, guess_id, pattern)
+            self.history.append((guess_id, pattern))
+        else:
+            self.candidates = self.strategy.update_belief(self.candidates, guess, feedback)
+            self.history.append((guess, feedback))
         self.total_reward += reward
 
     def select_guess(self):
-        guess = self.strategy.select_guess(self.candidates, self.history)
+        if self.use_ids:
+            guess_id = self.strategy.select_guess_ids(self.candidate_ids, self.history)
+            guess = self.vocab.word(guess_id) if guess_id is not None else None
+        else:
+            guess = self.strategy.select_guess(self.candidates, self.history)
         if guess is None:
             raise RuntimeError("No valid guesses left: candidate list is empty.")
         return guess
         
     def get_total_reward(self):
-        return self.total_reward
\ No newline at end of file
+        return self.total_reward
@@ -0,0 +1,40 @@
+"""
+Deterministic seed derivation.
+
+Every game gets its own seed derived from the run seed and what identifies the
+game (strategy name, game_id, ...), so results do not depend on the order in
+which games are executed, serially or across worker processes. Strategies,
+agents and environments take the resulting RNG as an `rng` argument instead
+of drawing from the global `random` module.
+"""
+
+import hashlib
+import random
+
+import numpy as np
+
+
+def derive_seed(run_seed: int, *parts) -> int:
+    """64-bit seed from a run seed and identifying parts, stable across processes and runs."""
+    payload = '\x1f'.join(str(p) for p in (run_seed,) + parts).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(payload).digest()[:8], 'little')
+
+
+def make_rng(rng=None):
+    """
+    Normalize an injected RNG to the random.Random interface.
+
+    None keeps the global `random` module stream (previous behavior); a
+    random.Random is used as is; a numpy Generator seeds a random.Random
+    from its own stream.
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, np.random.Generator):
+        return random.Random(int(rng.integers(2 ** 63)))
+    return rng
+
+
+def game_rng(run_seed: int, *parts) -> random.Random:
+    """Independent RNG for one game, derived from the run seed and the game's identity."""
+    return random.Random(derive_seed(run_seed, *parts))
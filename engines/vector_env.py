@@ -0,0 +1,100 @@
+"""
+Batched Wordle environment.
+
+VectorWordleEnv plays N games at once: targets are held as a word-ID array and
+every step takes one guess ID per game. Feedback patterns, rewards and done
+masks for the whole batch come from a single feedback-matrix gather, using the
+same reward structure as WordleEnv.guess.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from feedback_matrix import get_feedback_matrix, pattern_digits, NUM_PATTERNS
+from seeding import make_rng
+
+
+class VectorWordleEnv:
+
+    def __init__(self, num_envs: int, max_attempts=6, feedback_matrix=None, rng=None):
+        self.num_envs = num_envs
+        self.rng = make_rng(rng)
+        self.max_attempts = max_attempts
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
+        self.vocab = self.feedback_matrix.vocab
+        # Same reward parameters as WordleEnv
+        self.base_penalty = -1.0
+        self.penalty_increase = 0.5
+        self.green_reward = 0.5
+        self.yellow_reward = 0.2
+        self.success_reward = 10.0
+        # Green/yellow reward per pattern (recompute after changing the rewards above)
+        self.pattern_rewards = self._feedback_rewards()
+        self.reset()
+
+    def _feedback_rewards(self) -> np.ndarray:
+        """Green/yellow reward of every pattern, indexed by pattern."""
+        rewards = np.zeros(NUM_PATTERNS, dtype=np.float64)
+        for pattern in range(NUM_PATTERNS):
+            # Accumulate letter by letter, in the same order as WordleEnv.guess
+            feedback_reward = 0
+            for d in pattern_digits(pattern):
+                if d == 2:
+                    feedback_reward += self.green_reward
+                elif d == 1:
+                    feedback_reward += self.yellow_reward
+            rewards[pattern] = feedback_reward
+        return rewards
+
+    def reset(self, target_ids: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Start num_envs new games.
+
+        target_ids fixes the targets (e.g. a test set or the whole vocabulary);
+        otherwise they are drawn at random like WordleEnv.reset.
+        """
+        if target_ids is None:
+            target_ids = [self.rng.randrange(len(self.vocab)) for _ in range(self.num_envs)]
+        self.target_ids = np.asarray(target_ids, dtype=np.int64)
+        if len(self.target_ids) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} targets, got {len(self.target_ids)}")
+        self.attempts = np.zeros(self.num_envs, dtype=np.int64)
+        self.done = np.zeros(self.num_envs, dtype=bool)
+        self.won = np.zeros(self.num_envs, dtype=bool)
+        self.total_reward = np.zeros(self.num_envs, dtype=np.float64)
+        return self.target_ids
+
+    def step(self, guess_ids: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Play one guess per game.
+
+        Games that are already done, or whose guess ID is -1 (no guess this
+        turn), are skipped: their pattern is -1 and their reward 0.
+        Returns (patterns, rewards, done).
+        """
+        guess_ids = np.asarray(guess_ids, dtype=np.int64)
+        if len(guess_ids) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} guesses, got {len(guess_ids)}")
+
+        active = ~self.done & (guess_ids >= 0)
+        patterns = np.full(self.num_envs, -1, dtype=np.int64)
+        patterns[active] = self.feedback_matrix.matrix[guess_ids[active], self.target_ids[active]]
+
+        self.attempts[active] += 1
+
+        # Progressive penalty plus feedback rewards
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        penalty = self.base_penalty * (1 + self.penalty_increase * (self.attempts[active] - 1))
+        rewards[active] = penalty + self.pattern_rewards[patterns[active]]
+
+        solved = active & (guess_ids == self.target_ids)
+        rewards[solved] += self.success_reward
+        self.won |= solved
+        self.done |= solved | (active & (self.attempts >= self.max_attempts))
+
+        self.total_reward += rewards
+        return patterns, rewards, self.done.copy()
+
+    def get_total_reward(self) -> np.ndarray:
+        return self.total_reward.copy()
@@ -0,0 +1,72 @@
+"""
+Word <-> integer ID interning.
+
+A Vocabulary assigns every word of the word list a dense integer ID (its
+position in the list). Strategies and agents running in ID mode pass NumPy ID
+arrays around instead of lists of strings; words are only looked up again at
+the environment boundary and when writing results.
+"""
+
+import hashlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def word_list_hash(words: Sequence[str]) -> bytes:
+    """SHA-256 of the (normalized) word list a vocabulary is built from."""
+    return hashlib.sha256('\n'.join(words).encode('utf-8')).digest()
+
+
+class Vocabulary:
+    """Dense word IDs for a fixed word list."""
+
+    def __init__(self, words: Sequence[str]):
+        self.words: List[str] = list(words)
+        self.index: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        # Shared, read-only "all words" candidate array; filtering always
+        # returns new arrays, so agents can start every game from it without copying.
+        self.all_ids = np.arange(len(self.words), dtype=np.int64)
+        self.all_ids.setflags(write=False)
+        self._fingerprint = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    @property
+    def fingerprint(self) -> bytes:
+        """Hash of the word list, used to key caches built for this vocabulary."""
+        if self._fingerprint is None:
+            self._fingerprint = word_list_hash(self.words)
+        return self._fingerprint
+
+    def word_id(self, word: str) -> Optional[int]:
+        """ID of a word, or None if it is not in the vocabulary."""
+        return self.index.get(word)
+
+    def word(self, word_id: int) -> str:
+        """Word for an ID."""
+        return self.words[word_id]
+
+    def ids(self, words: Sequence[str]) -> np.ndarray:
+        """
+        IDs for a sequence of in-vocabulary words, as an index array.
+
+        Raises ValueError for out-of-vocabulary words: guesses (e.g. from an
+        LLM) may be any string, but candidate sets must come from the word list.
+        """
+        if len(words) == len(self.words) and list(words) == self.words:
+            return self.all_ids
+        try:
+            return np.array([self.index[w] for w in words], dtype=np.int64)
+        except KeyError:
+            unknown = [w for w in words if w not in self.index]
+            raise ValueError(f"Not in the word list: {', '.join(unknown[:5])}"
+                             f"{' ...' if len(unknown) > 5 else ''} (candidates must be vocabulary words)") from None
+
+    def to_words(self, ids: Sequence[int]) -> List[str]:
+        """Words for a sequence of IDs."""
+        return [self.words[i] for i in ids]
@@ -1,10 +1,13 @@
-import random
+from feedback_matrix import get_feedback_matrix
+from seeding import make_rng
 
 class WordleEnv:
     
-    def __init__(self, word_list, max_attempts=6):
+    def __init__(self, word_list, max_attempts=6, feedback_matrix=None, rng=None):
         self.word_list = word_list
+        self.rng = make_rng(rng)
         self.max_attempts = max_attempts
+        self.feedback_matrix = feedback_matrix if feedback_matrix is not None else get_feedback_matrix()
         # Base penalty parameters
         self.base_penalty = -1.0
         self.penalty_increase = 0.5  # 50% increase per attempt
@@ -15,7 +18,7 @@ class WordleEnv:
         self.reset()
 
     def reset(self):
-        self.target_word = random.choice(self.word_list)
+        self.target_word = self.rng.choice(self.word_list)
         self.attempts = 0
         self.history = []
         self.done = False
@@ -54,22 +57,7 @@ class WordleEnv:
         return feedback, reward
 
     def _generate_feedback(self, guess):
-        feedback = ["-"] * 5
-        target_chars = list(self.target_word)
-        guess_chars = list(guess)
-
-        for i in range(5):
-            if guess_chars[i] == target_chars[i]:
-                feedback[i] = "G"
-                target_chars[i] = None  # used
-                guess_chars[i] = None
-
-        for i in range(5):
-            if guess_chars[i] and guess_chars[i] in target_chars:
-                feedback[i] = "Y"
-                target_chars[target_chars.index(guess_chars[i])] = None
-
-        return feedback
+        return self.feedback_matrix.feedback(guess, self.target_word)
 
     def get_total_reward(self):
         return self.total_reward
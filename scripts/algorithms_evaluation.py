@@ -14,24 +14,35 @@ Calculates both Hamming and Levenshtein distances for each guess.
 Outputs detailed CSV with all metrics for analysis.
 """
 
+import argparse
 import random
-import csv
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
 sys.path.insert(0, str(Path(__file__).parent.parent / 'algorithms'))
 sys.path.insert(0, str(Path(__file__).parent))
 
 from wordle_env import WordleEnv
+from vector_env import VectorWordleEnv
+from feedback_matrix import get_feedback_matrix, get_vocabulary, encode_feedback, decode_pattern
+from seeding import derive_seed, make_rng
 from css_strategy import CSSStrategy
 from voi_strategy import VOIStrategy
 from random_strategy import RandomStrategy
 from pure_random_strategy import PureRandomStrategy
-from test_set_loader import load_canonical_test_set
+from opening_book import get_opening_book
+from transposition_cache import get_transposition_cache
+from test_set_loader import load_canonical_test_set, load_full_test_set
+from result_sink import open_sink, SINKS
+from results_catalog import get_results_catalog
 
 
 def load_word_list():
@@ -43,8 +54,7 @@ def load_word_list():
 
 def create_test_set(word_list, num_words=100, seed=42):
     """Create a standardized test set."""
-    random.seed(seed)
-    return random.sample(word_list, num_words)
+    return random.Random(seed).sample(word_list, num_words)
 
 
 def hamming_distance(word1: str, word2: str) -> int:
@@ -79,87 +89,98 @@ def levenshtein_distance(word1: str, word2: str) -> int:
 
 def filter_candidates_by_feedback(candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
     """Filter candidates based on feedback."""
-    filtered = []
-    for word in candidates:
-        if is_consistent(word, guess, feedback):
-            filtered.append(word)
-    return filtered
+    return get_feedback_matrix().filter_words(candidates, guess, feedback)
 
 
 def is_consistent(word: str, guess: str, feedback: List[str]) -> bool:
     """Check if a word is consistent with the feedback."""
-    expected_feedback = generate_feedback(word, guess)
-    return expected_feedback == feedback
+    return get_feedback_matrix().pattern(guess, word) == encode_feedback(feedback)
 
 
 def generate_feedback(target: str, guess: str) -> List[str]:
-    """Generate feedback for a guess against a target word."""
-    feedback = ["-"] * 5
-    target_chars = list(target)
-    guess_chars = list(guess)
-
-    # Mark greens
-    for i in range(5):
-        if guess_chars[i] == target_chars[i]:
-            feedback[i] = "G"
-            target_chars[i] = None
-            guess_chars[i] = None
-
-    # Mark yellows
-    for i in range(5):
-        if guess_chars[i] and guess_chars[i] in target_chars:
-            feedback[i] = "Y"
-            target_chars[target_chars.index(guess_chars[i])] = None
-
-    return feedback
+    """Look up feedback for a guess against a target word."""
+    return get_feedback_matrix().feedback(guess, target)
 
 
 class HybridAgent:
     """Agent that can switch or alternate between strategies."""
 
     def __init__(self, word_list: List[str], strategy_a, strategy_b,
-                 mode: str = "switch_after_1", switch_point: int = 1):
+                 mode: str = "switch_after_1", switch_point: int = 1, use_ids: bool = False,
+                 rng=None):
         """
         mode options:
         - "switch_after_1": Use strategy_a for first guess, then strategy_b
         - "alternating_a_first": Alternate starting with strategy_a (A-B-A-B-A-B)
         - "alternating_b_first": Alternate starting with strategy_b (B-A-B-A-B-A)
+
+        use_ids: keep candidates as word-ID arrays and drive the strategies'
+        *_ids methods; words are only used at the env boundary.
+
+        rng: if given, both strategies draw from this RNG.
         """
         self.word_list = word_list
         self.strategy_a = strategy_a
         self.strategy_b = strategy_b
+        if rng is not None:
+            self.strategy_a.rng = self.strategy_b.rng = make_rng(rng)
         self.mode = mode
         self.switch_point = switch_point
+        self.use_ids = use_ids
+        if use_ids:
+            self.vocab = get_vocabulary()
+            self.word_ids = self.vocab.ids(word_list)
         self.reset()
 
     def reset(self):
-        self.candidates = self.word_list.copy()
+        if self.use_ids:
+            self.candidate_ids = self.word_ids
+        else:
+            self.candidates = self.word_list.copy()
         self.history = []
         self.attempt_count = 0
 
-    def select_guess(self) -> str:
-        """Select guess based on mode."""
+    def _current_strategy(self):
+        """Strategy responsible for the next guess under the configured mode."""
         if self.mode == "switch_after_1":
             if self.attempt_count < self.switch_point:
-                return self.strategy_a.select_guess(self.candidates, self.history)
+                return self.strategy_a
             else:
-                return self.strategy_b.select_guess(self.candidates, self.history)
+                return self.strategy_b
 
         elif self.mode == "alternating_a_first":
             if self.attempt_count % 2 == 0:
-                return self.strategy_a.select_guess(self.candidates, self.history)
+                return self.strategy_a
             else:
-                return self.strategy_b.select_guess(self.candidates, self.history)
+                return self.strategy_b
 
         elif self.mode == "alternating_b_first":
             if self.attempt_count % 2 == 0:
-                return self.strategy_b.select_guess(self.candidates, self.history)
+                return self.strategy_b
             else:
-                return self.strategy_a.select_guess(self.candidates, self.history)
+                return self.strategy_a
+
+    def select_guess(self) -> str:
+        """Select guess based on mode."""
+        strategy = self._current_strategy()
+        if strategy is None:
+            return None
+        if self.use_ids:
+            guess_id = strategy.select_guess_ids(self.candidate_ids, self.history)
+            return self.vocab.word(guess_id) if guess_id is not None else None
+        return strategy.select_guess(self.candidates, self.history)
 
     def update(self, guess: str, feedback: List[str]):
         """Update both strategies."""
         self.attempt_count += 1
+        if self.use_ids:
+            guess_id = self.vocab.index[guess]
+            pattern = encode_feedback(feedback)
+            self.history.append((guess_id, pattern))
+            self.candidate_ids = get_feedback_matrix().filter_ids(self.candidate_ids, guess_id, pattern)
+            self.strategy_a.update_belief_ids(self.candidate_ids, guess_id, pattern)
+            self.strategy_b.update_belief_ids(self.candidate_ids, guess_id, pattern)
+            return
         self.history.append((guess, feedback))
         self.candidates = filter_candidates_by_feedback(self.candidates, guess, feedback)
         self.strategy_a.update_belief(self.candidates, guess, feedback)
@@ -169,166 +190,342 @@ class HybridAgent:
 class SimpleAgent:
     """Agent for single-strategy testing."""
 
-    def __init__(self, word_list: List[str], strategy):
+    def __init__(self, word_list: List[str], strategy, use_ids: bool = False, rng=None):
         self.word_list = word_list
         self.strategy = strategy
+        if rng is not None:
+            self.strategy.rng = make_rng(rng)
+        self.use_ids = use_ids
+        if use_ids:
+            self.vocab = get_vocabulary()
+            self.word_ids = self.vocab.ids(word_list)
         self.reset()
 
     def reset(self):
-        self.candidates = self.word_list.copy()
+        if self.use_ids:
+            self.candidate_ids = self.word_ids
+        else:
+            self.candidates = self.word_list.copy()
         self.history = []
 
     def select_guess(self) -> str:
+        if self.use_ids:
+            guess_id = self.strategy.select_guess_ids(self.candidate_ids, self.history)
+            return self.vocab.word(guess_id) if guess_id is not None else None
         return self.strategy.select_guess(self.candidates, self.history)
 
     def update(self, guess: str, feedback: List[str]):
+        if self.use_ids:
+            guess_id = self.vocab.index[guess]
+            pattern = encode_feedback(feedback)
+            self.history.append((guess_id, pattern))
+            self.candidate_ids = self.strategy.update_belief_ids(self.candidate_ids, guess_id, pattern)
+            return
         self.history.append((guess, feedback))
         self.candidates = self.strategy.update_belief(self.candidates, guess, feedback)
 
 
+def play_game(word_list: List[str], game: Tuple[int, str, int], strategy_name: str,
+              agent_factory, seed: Optional[int] = None) -> dict:
+    """Play one game with a fresh agent (drawing from its own RNG if seeded) and return its result row."""
+    game_id, target_word, tier = game
+
+    env = WordleEnv(word_list)
+    env.target_word = target_word
+    env.attempts = 0
+    env.done = False
+
+    agent = agent_factory(random.Random(seed)) if seed is not None else agent_factory()
+
+    guesses = []
+    feedbacks = []
+    win = False
+    attempts_to_win = 0
+
+    for attempt in range(6):
+        try:
+            guess = agent.select_guess()
+            if not guess:
+                break
+
+            feedback, reward = env.guess(guess)
+            agent.update(guess, feedback)
+
+            guesses.append(guess)
+            feedbacks.append(''.join(feedback))
+
+            if guess == target_word:
+                win = True
+                attempts_to_win = attempt + 1
+                break
+
+        except Exception as e:
+            print(f"  Error in game {game_id + 1} ({target_word}), attempt {attempt + 1}: {e}")
+            break
+
+    if not win:
+        attempts_to_win = 7
+
+    return result_row(strategy_name, game_id, target_word, tier, win, attempts_to_win,
+                      env.get_total_reward() if win else -10, guesses, feedbacks)
+
+
+def game_seed(run_seed: Optional[int], strategy_name: str, game_id: int) -> Optional[int]:
+    """Per-game seed derived from (run seed, strategy, game_id); None leaves the RNG alone."""
+    return derive_seed(run_seed, strategy_name, game_id) if run_seed is not None else None
+
+
 def run_strategy_test(word_list: List[str], test_set: List[Tuple[int, str, int]],
-                     strategy_name: str, agent_factory) -> List[dict]:
+                     strategy_name: str, agent_factory, run_seed: Optional[int] = None) -> List[dict]:
     """Run test for a single strategy and return detailed results."""
     print(f"\nTesting {strategy_name}...")
 
     results = []
 
-    for game_id, target_word, tier in test_set:
-        env = WordleEnv(word_list)
-        env.target_word = target_word
-        env.attempts = 0
-        env.done = False
+    for game in test_set:
+        seed = game_seed(run_seed, strategy_name, game[0])
+        results.append(play_game(word_list, game, strategy_name, agent_factory, seed))
 
-        agent = agent_factory()
+    print_strategy_summary(strategy_name, results)
+    return results
 
-        guesses = []
-        feedbacks = []
-        hamming_distances = []
-        levenshtein_distances = []
-        win = False
-        attempts_to_win = 0
 
-        for attempt in range(6):
-            try:
-                guess = agent.select_guess()
-                if not guess:
-                    break
+# Per-process state of run_strategies_parallel workers
+_worker_state = {}
+
+
+def _init_worker(word_list: List[str], test_set, strategy_options: dict, run_seed: Optional[int]):
+    """Build the strategy factories once per worker process."""
+    options = dict(strategy_options)
+    if options.pop('transposition_cache', False):
+        options['transposition_cache'] = get_transposition_cache()
+    _worker_state['word_list'] = word_list
+    _worker_state['test_set'] = test_set
+    _worker_state['factories'] = dict(build_strategies(word_list, **options))
+    _worker_state['run_seed'] = run_seed
 
-                feedback, reward = env.guess(guess)
-                agent.update(guess, feedback)
 
-                guesses.append(guess)
-                feedbacks.append(''.join(feedback))
-                hamming_distances.append(hamming_distance(guess, target_word))
-                levenshtein_distances.append(levenshtein_distance(guess, target_word))
+def _play_work_item(item: Tuple[str, int]) -> dict:
+    """Play test_set[index] with the named strategy inside a worker."""
+    strategy_name, index = item
+    game = _worker_state['test_set'][index]
+    seed = game_seed(_worker_state['run_seed'], strategy_name, game[0])
+    return play_game(_worker_state['word_list'], game, strategy_name,
+                     _worker_state['factories'][strategy_name], seed)
 
-                if guess == target_word:
-                    win = True
-                    attempts_to_win = attempt + 1
-                    break
 
+def run_strategies_parallel(word_list: List[str], test_set: List[Tuple[int, str, int]],
+                            strategy_names: List[str], strategy_options: dict,
+                            workers: int, run_seed: Optional[int] = None) -> List[dict]:
+    """
+    Shard (strategy, game) work items across a process pool.
+
+    Every game is seeded from (run seed, strategy, game_id) exactly as in the
+    serial run, and results are collected in submission order, so the rows are
+    identical to running run_strategy_test for each strategy in turn.
+    """
+    items = [(name, i) for name in strategy_names for i in range(len(test_set))]
+    print(f"\nRunning {len(items)} games on {workers} worker processes...")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(word_list, test_set, strategy_options, run_seed)) as executor:
+        chunksize = max(1, len(items) // (workers * 8))
+        all_results = list(executor.map(_play_work_item, items, chunksize=chunksize))
+
+    for strategy_name in strategy_names:
+        print_strategy_summary(strategy_name, [r for r in all_results if r['strategy'] == strategy_name])
+    return all_results
+
+
+def run_strategy_batch(word_list: List[str], test_set: List[Tuple[int, str, int]],
+                       strategy_name: str, agent_factory, run_seed: Optional[int] = None) -> List[dict]:
+    """
+    Same as run_strategy_test, but steps all games in lockstep through one
+    VectorWordleEnv: each turn collects one guess per unfinished game and
+    scores the whole batch with a single feedback-matrix gather. With a run
+    seed every agent gets its own per-game RNG, so rows match the serial run.
+    """
+    print(f"\nTesting {strategy_name} on {len(test_set)} targets (batched)...")
+
+    vocab = get_vocabulary()
+    env = VectorWordleEnv(len(test_set))
+    env.reset([vocab.index[target_word] for _, target_word, _ in test_set])
+    agents = []
+    for game_id, _, _ in test_set:
+        seed = game_seed(run_seed, strategy_name, game_id)
+        agents.append(agent_factory(random.Random(seed)) if seed is not None else agent_factory())
+    guesses = [[] for _ in test_set]
+    feedbacks = [[] for _ in test_set]
+    stopped = np.zeros(len(test_set), dtype=bool)
+
+    for attempt in range(6):
+        guess_ids = np.full(len(test_set), -1, dtype=np.int64)
+        for i in np.flatnonzero(~env.done & ~stopped):
+            game_id, target_word = test_set[i][0], test_set[i][1]
+            try:
+                guess = agents[i].select_guess()
             except Exception as e:
                 print(f"  Error in game {game_id + 1} ({target_word}), attempt {attempt + 1}: {e}")
-                break
+                guess = None
+            if not guess:
+                stopped[i] = True
+                continue
+            guess_ids[i] = vocab.index[guess]
+
+        if not np.any(guess_ids >= 0):
+            break
+        patterns, _, _ = env.step(guess_ids)
+
+        for i in np.flatnonzero(guess_ids >= 0):
+            guess = vocab.word(guess_ids[i])
+            feedback = decode_pattern(patterns[i])
+            try:
+                agents[i].update(guess, feedback)
+            except Exception as e:
+                game_id, target_word = test_set[i][0], test_set[i][1]
+                print(f"  Error in game {game_id + 1} ({target_word}), attempt {attempt + 1}: {e}")
+                stopped[i] = True
+                continue
+            guesses[i].append(guess)
+            feedbacks[i].append(''.join(feedback))
+
+    results = []
+    for i, (game_id, target_word, tier) in enumerate(test_set):
+        win = bool(env.won[i])
+        results.append(result_row(
+            strategy_name, game_id, target_word, tier, win, int(env.attempts[i]) if win else 7,
+            float(env.total_reward[i]) if win else -10, guesses[i], feedbacks[i]))
+
+    print_strategy_summary(strategy_name, results)
+    return results
 
-        if not win:
-            attempts_to_win = 7
-
-        # Pad to 6 attempts
-        while len(guesses) < 6:
-            guesses.append('')
-            feedbacks.append('')
-            hamming_distances.append('')
-            levenshtein_distances.append('')
-
-        results.append({
-            'strategy': strategy_name,
-            'game_number': game_id,
-            'target_word': target_word,
-            'tier': tier,
-            'won': win,
-            'attempts': attempts_to_win,
-            'total_reward': env.get_total_reward() if win else -10,
-            'guess_1': guesses[0], 'feedback_1': feedbacks[0],
-            'hamming_1': hamming_distances[0], 'levenshtein_1': levenshtein_distances[0],
-            'guess_2': guesses[1], 'feedback_2': feedbacks[1],
-            'hamming_2': hamming_distances[1], 'levenshtein_2': levenshtein_distances[1],
-            'guess_3': guesses[2], 'feedback_3': feedbacks[2],
-            'hamming_3': hamming_distances[2], 'levenshtein_3': levenshtein_distances[2],
-            'guess_4': guesses[3], 'feedback_4': feedbacks[3],
-            'hamming_4': hamming_distances[3], 'levenshtein_4': levenshtein_distances[3],
-            'guess_5': guesses[4], 'feedback_5': feedbacks[4],
-            'hamming_5': hamming_distances[4], 'levenshtein_5': levenshtein_distances[4],
-            'guess_6': guesses[5], 'feedback_6': feedbacks[5],
-            'hamming_6': hamming_distances[5], 'levenshtein_6': levenshtein_distances[5],
-        })
-
-    # Calculate summary statistics
+
+def result_row(strategy_name: str, game_id: int, target_word: str, tier: int, win: bool,
+               attempts: int, total_reward: float, guesses: List[str], feedbacks: List[str]) -> dict:
+    """One CSV row: game outcome plus the (padded) guesses with distance metrics."""
+    row = {
+        'strategy': strategy_name,
+        'game_number': game_id,
+        'target_word': target_word,
+        'tier': tier,
+        'won': win,
+        'attempts': attempts,
+        'total_reward': total_reward,
+    }
+    for i in range(6):
+        guess = guesses[i] if i < len(guesses) else ''
+        row[f'guess_{i + 1}'] = guess
+        row[f'feedback_{i + 1}'] = feedbacks[i] if i < len(feedbacks) else ''
+        row[f'hamming_{i + 1}'] = hamming_distance(guess, target_word) if guess else ''
+        row[f'levenshtein_{i + 1}'] = levenshtein_distance(guess, target_word) if guess else ''
+    return row
+
+
+def print_strategy_summary(strategy_name: str, results: List[dict]):
+    """Print win rate and average attempts for one strategy."""
     wins = sum(1 for r in results if r['won'])
     total_attempts = sum(r['attempts'] for r in results if r['won'])
-    win_rate = wins / len(test_set) if test_set else 0
+    win_rate = wins / len(results) if results else 0
     avg_attempts = total_attempts / wins if wins > 0 else 0
 
-    print(f"  {strategy_name}: {win_rate:.1%} win rate ({wins}/{len(test_set)}), "
+    print(f"  {strategy_name}: {win_rate:.1%} win rate ({wins}/{len(results)}), "
           f"avg {avg_attempts:.2f} attempts")
 
-    return results
-
-
-def main():
-    print("=" * 80)
-    print("Comprehensive Strategy Comparison")
-    print("=" * 80)
-    print("\nTesting all strategies on same 100 words with distance metrics")
 
-    # Load word list
-    word_list = load_word_list()
-    print(f"\nLoaded {len(word_list)} words")
+def build_strategies(word_list: List[str], css_exact: bool = False, opening_book: bool = False,
+                     transposition_cache=None):
+    """
+    Return (name, agent_factory) pairs for the 8 evaluated strategies.
 
-    # Load canonical test set (ensures algorithms and LLMs use same words)
-    test_set = load_canonical_test_set()  # Returns [(game_id, word, tier), ...]
-    print(f"Testing on {len(test_set)} words from canonical test set")
+    agent_factory(rng) builds a fresh agent whose strategies draw from rng
+    (the global random stream if None).
 
-    all_results = []
+    With opening_book=True, deterministic configurations (exact CSS, unsampled
+    VOI) load or build their opening book once and share it across games.
+    A TranspositionCache passed as transposition_cache is shared by every
+    CSS/VOI instance, so each distinct state is scored once per sweep.
+    """
+    css_book = get_opening_book(lambda: CSSStrategy(exact=css_exact)) if opening_book else None
+    voi_book = get_opening_book(VOIStrategy) if opening_book else None
+    css = lambda: CSSStrategy(exact=css_exact, opening_book=css_book,
+                              transposition_cache=transposition_cache)
+    voi = lambda: VOIStrategy(opening_book=voi_book, transposition_cache=transposition_cache)
 
-    # Define all strategies to test
-    strategies = [
+    return [
         # Pure strategies
-        ("pure_random", lambda: SimpleAgent(word_list, PureRandomStrategy())),
-        ("random", lambda: SimpleAgent(word_list, RandomStrategy())),
-        ("css", lambda: SimpleAgent(word_list, CSSStrategy())),
-        ("voi", lambda: SimpleAgent(word_list, VOIStrategy())),
+        ("pure_random", lambda rng=None: SimpleAgent(word_list, PureRandomStrategy(), use_ids=True, rng=rng)),
+        ("random", lambda rng=None: SimpleAgent(word_list, RandomStrategy(), use_ids=True, rng=rng)),
+        ("css", lambda rng=None: SimpleAgent(word_list, css(), use_ids=True, rng=rng)),
+        ("voi", lambda rng=None: SimpleAgent(word_list, voi(), use_ids=True, rng=rng)),
 
         # Hybrid strategies - one-time switch
-        ("css_then_voi", lambda: HybridAgent(
-            word_list, CSSStrategy(), VOIStrategy(), mode="switch_after_1", switch_point=1
+        ("css_then_voi", lambda rng=None: HybridAgent(
+            word_list, css(), voi(), mode="switch_after_1", switch_point=1, use_ids=True, rng=rng
         )),
-        ("voi_then_css", lambda: HybridAgent(
-            word_list, VOIStrategy(), CSSStrategy(), mode="switch_after_1", switch_point=1
+        ("voi_then_css", lambda rng=None: HybridAgent(
+            word_list, voi(), css(), mode="switch_after_1", switch_point=1, use_ids=True, rng=rng
         )),
 
         # Alternating strategies
-        ("css_voi_alternating", lambda: HybridAgent(
-            word_list, CSSStrategy(), VOIStrategy(), mode="alternating_a_first"
+        ("css_voi_alternating", lambda rng=None: HybridAgent(
+            word_list, css(), voi(), mode="alternating_a_first", use_ids=True, rng=rng
         )),
-        ("voi_css_alternating", lambda: HybridAgent(
-            word_list, VOIStrategy(), CSSStrategy(), mode="alternating_b_first"
+        ("voi_css_alternating", lambda rng=None: HybridAgent(
+            word_list, voi(), css(), mode="alternating_b_first", use_ids=True, rng=rng
         )),
     ]
 
-    print("\n" + "=" * 80)
-    print("Running Tests")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate all algorithm strategies on the canonical test set.")
+    parser.add_argument("--css-exact", action="store_true",
+                        help="score every vocabulary word against the full candidate set in CSS (no sampling)")
+    parser.add_argument("--opening-book", action="store_true",
+                        help="use precomputed first/second guesses for deterministic strategy configurations")
+    parser.add_argument("--transposition-cache", action="store_true",
+                        help="memoize deterministic guess selection by candidate set across games")
+    parser.add_argument("--transposition-cache-file", metavar="PATH",
+                        help="persist the transposition cache to PATH (JSON; implies --transposition-cache)")
+    parser.add_argument("--all-targets", action="store_true",
+                        help="evaluate on every word of the word list instead of the canonical test set (implies --batch)")
+    parser.add_argument("--batch", action="store_true",
+                        help="play all games of a strategy in lockstep through VectorWordleEnv")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="play (strategy, game) items on N worker processes (output identical to N=1)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="run seed; every game gets its own RNG derived from (seed, strategy, game_id)")
+    parser.add_argument("--format", choices=sorted(SINKS), default="csv",
+                        help="results file format (parquet needs pyarrow)")
+    args = parser.parse_args(argv)
+    if args.workers > 1 and (args.batch or args.all_targets):
+        parser.error("--workers cannot be combined with --batch/--all-targets")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 80)
+    print("Comprehensive Strategy Comparison")
     print("=" * 80)
+    print("\nTesting all strategies on same 100 words with distance metrics")
 
-    for strategy_name, agent_factory in strategies:
-        results = run_strategy_test(word_list, test_set, strategy_name, agent_factory)
-        all_results.extend(results)
+    # Load word list
+    word_list = load_word_list()
+    print(f"\nLoaded {len(word_list)} words")
 
-    # Write results to CSV
+    # Load canonical test set (ensures algorithms and LLMs use same words)
+    if args.all_targets:
+        test_set = load_full_test_set()
+        print(f"Testing on all {len(test_set)} words of the word list")
+    else:
+        test_set = load_canonical_test_set()  # Returns [(game_id, word, tier), ...]
+        print(f"Testing on {len(test_set)} words from canonical test set")
+
+    # Rows are streamed to the results file as each strategy finishes
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_dir = Path(__file__).parent.parent / 'results' / 'algorithms'
     output_dir.mkdir(parents=True, exist_ok=True)
-    csv_filename = output_dir / f"algorithm_results_{timestamp}.csv"
+    results_filename = output_dir / f"algorithm_results_{timestamp}.{args.format}"
 
     headers = [
         'strategy', 'game_number', 'target_word', 'tier', 'won', 'attempts', 'total_reward',
@@ -339,26 +536,66 @@ def main():
         'guess_5', 'feedback_5', 'hamming_5', 'levenshtein_5',
         'guess_6', 'feedback_6', 'hamming_6', 'levenshtein_6',
     ]
+    sink = open_sink(results_filename, headers, format=args.format)
+
+    # Summary statistics by strategy, accumulated as rows are written
+    strategy_stats = defaultdict(lambda: {'wins': 0, 'total_games': 0, 'total_attempts': 0})
 
-    with open(csv_filename, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(all_results)
+    def record_results(results: List[dict]):
+        sink.write_many(results)
+        for result in results:
+            stats = strategy_stats[result['strategy']]
+            stats['total_games'] += 1
+            if result['won']:
+                stats['wins'] += 1
+                stats['total_attempts'] += result['attempts']
+
+    # Define all strategies to test
+    transposition_cache = None
+    if (args.transposition_cache or args.transposition_cache_file) and args.workers <= 1:
+        transposition_cache = get_transposition_cache(args.transposition_cache_file)
+    # Also builds/loads opening books here, before any worker processes start
+    strategies = build_strategies(word_list, css_exact=args.css_exact, opening_book=args.opening_book,
+                                  transposition_cache=transposition_cache)
+    if args.css_exact:
+        print("CSS scoring: exact (full vocabulary, no sampling)")
+    if args.opening_book:
+        print("Opening book: enabled for deterministic configurations")
 
     print("\n" + "=" * 80)
-    print("SUMMARY")
+    print("Running Tests")
     print("=" * 80)
 
-    # Calculate summary statistics by strategy
-    from collections import defaultdict
-    strategy_stats = defaultdict(lambda: {'wins': 0, 'total_games': 0, 'total_attempts': 0})
+    if args.workers > 1:
+        # Workers keep their own in-memory transposition caches (not persisted)
+        strategy_options = {
+            'css_exact': args.css_exact,
+            'opening_book': args.opening_book,
+            'transposition_cache': bool(args.transposition_cache or args.transposition_cache_file),
+        }
+        record_results(run_strategies_parallel(
+            word_list, test_set, [name for name, _ in strategies], strategy_options,
+            args.workers, run_seed=args.seed))
+    else:
+        for strategy_name, agent_factory in strategies:
+            if args.batch or args.all_targets:
+                results = run_strategy_batch(word_list, test_set, strategy_name, agent_factory,
+                                             run_seed=args.seed)
+            else:
+                results = run_strategy_test(word_list, test_set, strategy_name, agent_factory,
+                                            run_seed=args.seed)
+            record_results(results)
+    sink.close()
+    get_results_catalog().register(results_filename)
+
+    if transposition_cache is not None:
+        stats = transposition_cache.stats()
+        print(f"\nTransposition cache: {stats['hits']} hits, {stats['misses']} misses, {stats['size']} states")
+        transposition_cache.save()
 
-    for result in all_results:
-        strategy = result['strategy']
-        strategy_stats[strategy]['total_games'] += 1
-        if result['won']:
-            strategy_stats[strategy]['wins'] += 1
-            strategy_stats[strategy]['total_attempts'] += result['attempts']
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
 
     print("\n{:<25} {:>10} {:>12} {:>15}".format(
         "Strategy", "Win Rate", "Wins/Games", "Avg Attempts"))
@@ -374,7 +611,7 @@ def main():
             strategy, win_rate, stats['wins'], stats['total_games'], avg_attempts))
 
     print("\n" + "=" * 80)
-    print(f"✓ Results saved to: {csv_filename}")
+    print(f"✓ Results saved to: {results_filename}")
     print("=" * 80)
     print("\nThe CSV includes:")
     print("  • All 8 strategies tested on same 100 words")
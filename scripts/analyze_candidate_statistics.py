@@ -9,6 +9,9 @@ import numpy as np
 import os
 from pathlib import Path
 
+from results_store import load_results
+from derived_results import select_derived, select_per_run
+
 
 def analyze_algorithm_candidates():
     """Analyze candidate statistics for pure algorithms."""
@@ -16,13 +19,16 @@ def analyze_algorithm_candidates():
     print("ALGORITHM CANDIDATE STATISTICS")
     print("=" * 80)
 
-    file_path = "results/algorithms/raw data/algorithm_results_with_candidates.csv"
+    # The single-pass metrics file (postprocess_results.py) holds the same columns;
+    # it is used only while it matches the current raw results
+    file_path = select_derived(["results/algorithms/raw data/algorithm_results_with_metrics.csv",
+                                "results/algorithms/raw data/algorithm_results_with_candidates.csv"])
 
-    if not os.path.exists(file_path):
-        print(f"Error: {file_path} not found")
+    if file_path is None:
+        print("Error: no current metrics or candidates file in results/algorithms/raw data")
         return None
 
-    df = pd.read_csv(file_path)
+    df = load_results(file_path)
 
     # Get unique strategies
     strategies = df['strategy'].unique()
@@ -75,46 +81,22 @@ def analyze_hybrid_candidates(data_dir, label):
         return None
 
     # Find all processed files
-    files = [f for f in os.listdir(data_dir) if f.endswith('_with_candidates.csv')]
+    entries = select_per_run(data_dir, ('metrics', 'candidates'), category='hybrids')
 
-    if not files:
+    if not entries:
         print(f"No processed files found in {data_dir}")
         return None
 
     all_data = []
 
-    for filename in files:
-        file_path = os.path.join(data_dir, filename)
-        df = pd.read_csv(file_path)
-
-        # Extract model and algorithm from filename
-        # Format: alternating_llm_first_<model>_<algorithm?>_<prompting?>_<timestamp>.csv
-        parts = filename.replace('_with_candidates.csv', '').split('_')
-
-        # Find model name (it's after 'first')
-        try:
-            first_idx = parts.index('first')
-            model_parts = []
-            for i in range(first_idx + 1, len(parts)):
-                if parts[i] in ['random', 'voi', 'css', 'cot'] or parts[i].isdigit():
-                    break
-                model_parts.append(parts[i])
-            model = '_'.join(model_parts)
-
-            # Determine algorithm
-            if 'random' in parts:
-                algorithm = 'random'
-            elif 'voi' in parts:
-                algorithm = 'voi'
-            else:
-                algorithm = 'css'
-
-            # Determine prompting
-            prompting = 'CoT' if 'cot' in parts else 'Zero-shot'
-
-        except Exception as e:
-            print(f"Warning: Could not parse filename {filename}: {e}")
+    for entry in entries:
+        if entry.model is None:
+            print(f"Warning: Could not parse filename {entry.path.name}")
             continue
+        df = load_results(entry.path)
+        model = entry.model
+        algorithm = entry.algorithm
+        prompting = 'CoT' if entry.prompt_type == 'cot' else 'Zero-shot'
 
         df['model'] = model
         df['algorithm'] = algorithm
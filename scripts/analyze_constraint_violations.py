@@ -9,6 +9,10 @@ import numpy as np
 import os
 from pathlib import Path
 
+from results_store import load_results
+from derived_results import select_derived, select_per_run
+from results_catalog import get_results_catalog
+
 
 def analyze_algorithm_violations():
     """Analyze constraint violation statistics for pure algorithms."""
@@ -16,13 +20,16 @@ def analyze_algorithm_violations():
     print("ALGORITHM CONSTRAINT VIOLATIONS")
     print("=" * 80)
 
-    file_path = "results/algorithms/raw data/algorithm_results_with_violations.csv"
+    # The single-pass metrics file (postprocess_results.py) holds the same columns;
+    # it is used only while it matches the current raw results
+    file_path = select_derived(["results/algorithms/raw data/algorithm_results_with_metrics.csv",
+                                "results/algorithms/raw data/algorithm_results_with_violations.csv"])
 
-    if not os.path.exists(file_path):
-        print(f"Error: {file_path} not found")
+    if file_path is None:
+        print("Error: no current metrics or violations file in results/algorithms/raw data")
         return None
 
-    df = pd.read_csv(file_path)
+    df = load_results(file_path)
 
     # Get unique strategies
     strategies = df['strategy'].unique()
@@ -96,52 +103,30 @@ def analyze_hybrid_violations(data_dir, label):
         return None
 
     # Find all processed files
-    files = [f for f in os.listdir(data_dir) if f.endswith('_with_violations.csv')]
+    entries = select_per_run(data_dir, ('metrics', 'violations'), category='hybrids')
 
-    if not files:
+    if not entries:
         print(f"No processed files found in {data_dir}")
         return None
 
     all_data = []
 
-    for filename in files:
-        file_path = os.path.join(data_dir, filename)
-        df = pd.read_csv(file_path)
-
-        # Extract model and algorithm from filename
-        parts = filename.replace('_with_violations.csv', '').split('_')
-
-        try:
-            first_idx = parts.index('first')
-            model_parts = []
-            for i in range(first_idx + 1, len(parts)):
-                if parts[i] in ['random', 'voi', 'css', 'cot'] or parts[i].isdigit():
-                    break
-                model_parts.append(parts[i])
-            model = '_'.join(model_parts)
-
-            # Determine algorithm
-            if 'random' in parts:
-                algorithm = 'random'
-            elif 'voi' in parts:
-                algorithm = 'voi'
-            else:
-                algorithm = 'css'
-
-            # Determine prompting
-            prompting = 'CoT' if 'cot' in parts else 'Zero-shot'
-
-            # Determine who made each guess
-            for round_num in range(1, 7):
-                # In hybrids: LLM on odd rounds (1, 3, 5), Algorithm on even rounds (2, 4, 6)
-                if round_num % 2 == 1:
-                    df[f'strategy_{round_num}'] = 'LLM'
-                else:
-                    df[f'strategy_{round_num}'] = algorithm.upper()
-
-        except Exception as e:
-            print(f"Warning: Could not parse filename {filename}: {e}")
+    for entry in entries:
+        if entry.model is None:
+            print(f"Warning: Could not parse filename {entry.path.name}")
             continue
+        df = load_results(entry.path)
+        model = entry.model
+        algorithm = entry.algorithm
+        prompting = 'CoT' if entry.prompt_type == 'cot' else 'Zero-shot'
+
+        # Determine who made each guess
+        for round_num in range(1, 7):
+            # In hybrids: LLM on odd rounds (1, 3, 5), Algorithm on even rounds (2, 4, 6)
+            if round_num % 2 == 1:
+                df[f'strategy_{round_num}'] = 'LLM'
+            else:
+                df[f'strategy_{round_num}'] = algorithm.upper()
 
         df['model'] = model
         df['algorithm'] = algorithm
@@ -242,17 +227,17 @@ def analyze_llm_violations():
         print(f"Warning: {llm_dir} not found")
         return None
 
-    files = [f for f in os.listdir(llm_dir) if f.endswith('.csv')]
+    entries = get_results_catalog().query(llm_dir, category='llms')
 
     all_data = []
 
-    for filename in files:
-        file_path = os.path.join(llm_dir, filename)
+    for entry in entries:
         try:
-            df = pd.read_csv(file_path)
+            df = load_results(entry.path, ['violated_green_constraint', 'violated_yellow_constraint',
+                                           'violated_gray_constraint', 'total_constraint_violations'])
             all_data.append(df)
         except Exception as e:
-            print(f"Warning: Could not read {filename}: {e}")
+            print(f"Warning: Could not read {entry.path.name}: {e}")
 
     if not all_data:
         return None
@@ -4,10 +4,20 @@ Calculate candidates remaining after each guess for algorithm and hybrid data.
 This post-processes existing CSV files to add candidate count information.
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 import os
-from typing import List, Tuple
-from tqdm import tqdm
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
+
+from feedback_matrix import compute_pattern, get_feedback_matrix, encode_feedback
+from derived_results import Derivation, source_version
+from results_catalog import get_results_catalog
 
 
 def load_word_list(filepath: str = "wordlist/wordlist.txt") -> List[str]:
@@ -19,27 +29,10 @@ def load_word_list(filepath: str = "wordlist/wordlist.txt") -> List[str]:
 
 def generate_feedback(target: str, guess: str) -> List[str]:
     """
-    Generate feedback for a guess against a target word.
-    Same logic as in wordle_env.py and css_strategy.py
+    Look up feedback for a guess against a target word.
+    Same table as wordle_env.py and css_strategy.py
     """
-    feedback = ["-"] * 5
-    target_chars = list(target)
-    guess_chars = list(guess)
-
-    # Mark greens first
-    for i in range(5):
-        if guess_chars[i] == target_chars[i]:
-            feedback[i] = "G"
-            target_chars[i] = None
-            guess_chars[i] = None
-
-    # Mark yellows
-    for i in range(5):
-        if guess_chars[i] and guess_chars[i] in target_chars:
-            feedback[i] = "Y"
-            target_chars[target_chars.index(guess_chars[i])] = None
-
-    return feedback
+    return get_feedback_matrix().feedback(guess, target)
 
 
 def is_consistent(word: str, guess: str, feedback: str) -> bool:
@@ -47,17 +40,97 @@ def is_consistent(word: str, guess: str, feedback: str) -> bool:
     Check if a word is consistent with the feedback from a guess.
     feedback is a string like 'GYGGG' or '---Y-'
     """
-    if len(feedback) != 5:
+    if len(feedback) != 5 or not set(feedback) <= set('GY-'):
         return False
 
-    feedback_list = list(feedback)
-    expected_feedback = generate_feedback(word, guess)
-    return expected_feedback == feedback_list
+    return get_feedback_matrix().pattern(guess, word) == encode_feedback(feedback)
 
 
 def filter_candidates(candidates: List[str], guess: str, feedback: str) -> List[str]:
     """Filter candidates based on guess and feedback."""
-    return [word for word in candidates if is_consistent(word, guess, feedback)]
+    if len(feedback) != 5 or not set(feedback) <= set('GY-'):
+        return []
+    return get_feedback_matrix().filter_words(candidates, guess, feedback)
+
+
+def _feedback_pattern(feedback) -> int:
+    """Pattern of a feedback string, or -1 (matches nothing) if it is malformed, as in filter_candidates()."""
+    if not isinstance(feedback, str) or len(feedback) != 5 or not set(feedback) <= set('GY-'):
+        return -1
+    return encode_feedback(feedback)
+
+
+def replay_candidates(df: pd.DataFrame, word_list: List[str], max_rounds: int = 6) -> Dict[str, object]:
+    """
+    Candidate columns for every game of a results frame, replayed as word-ID masks.
+
+    Each game's candidate set is a boolean row over the vocabulary. Per round,
+    the guesses become word IDs and the feedbacks patterns, and one gather of
+    feedback-matrix rows filters every game at once. A game stops at its first
+    missing guess. Returns candidates_before_N / candidates_after_N (nullable
+    ints) and reduction_rate_N (floats) arrays, in the column order of the
+    per-row replay this replaced.
+    """
+    feedback_matrix = get_feedback_matrix()
+    n_games = len(df)
+    alive = np.zeros((n_games, len(feedback_matrix)), dtype=bool)
+    alive[:, feedback_matrix.ids(word_list)] = True
+    active = np.ones(n_games, dtype=bool)
+    out_of_list_rows = {}
+
+    columns = {}
+    for round_num in range(1, max_rounds + 1):
+        guess_col = f'guess_{round_num}'
+        feedback_col = f'feedback_{round_num}'
+        before = np.zeros(n_games, dtype=np.int64)
+        after = np.zeros(n_games, dtype=np.int64)
+        reduction = np.full(n_games, np.nan)
+
+        if guess_col in df.columns:
+            active &= df[guess_col].notna().to_numpy()
+        else:
+            active[:] = False
+        rows = np.flatnonzero(active)
+        if len(rows):
+            guesses = df[guess_col].to_numpy()[rows]
+            patterns = np.array([_feedback_pattern(f) for f in df[feedback_col].to_numpy()[rows]], dtype=np.int64)
+            guess_ids = np.array([feedback_matrix.index.get(g, -1) for g in guesses], dtype=np.int64)
+            before[rows] = alive[rows].sum(axis=1)
+
+            in_list = guess_ids >= 0
+            games = rows[in_list]
+            alive[games] &= feedback_matrix.matrix[guess_ids[in_list]] == patterns[in_list, None]
+            # Guesses outside the word list (LLM turns) get their pattern row computed once per file
+            for i in np.flatnonzero(~in_list):
+                guess = guesses[i]
+                if guess not in out_of_list_rows:
+                    out_of_list_rows[guess] = np.array(
+                        [compute_pattern(guess, w) for w in feedback_matrix.words], dtype=np.int64)
+                alive[rows[i]] &= out_of_list_rows[guess] == patterns[i]
+
+            after[rows] = alive[rows].sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rates = np.where(before[rows] > 0, (before[rows] - after[rows]) / before[rows] * 100, 0.0)
+            reduction[rows] = rates
+
+        played = np.zeros(n_games, dtype=bool)
+        played[rows] = True
+        for name, counts in (('candidates_before', before), ('candidates_after', after)):
+            column = pd.array(counts, dtype='Int64')
+            column[~played] = pd.NA
+            columns[f'{name}_{round_num}'] = column
+        columns[f'reduction_rate_{round_num}'] = reduction
+    return columns
+
+
+def _add_candidate_columns(input_file: str, output_file: str, word_list: List[str]) -> pd.DataFrame:
+    print(f"\nProcessing: {input_file}")
+    df = pd.read_csv(input_file)
+    for column, values in replay_candidates(df, word_list).items():
+        df[column] = values
+    df.to_csv(output_file, index=False)
+    print(f"Saved to: {output_file}")
+    return df
 
 
 def process_algorithm_data(input_file: str, output_file: str, word_list: List[str]):
@@ -68,53 +141,7 @@ def process_algorithm_data(input_file: str, output_file: str, word_list: List[st
     strategy,game_number,target_word,tier,won,attempts,total_reward,
     guess_1,feedback_1,hamming_1,levenshtein_1,...
     """
-    print(f"\nProcessing: {input_file}")
-    df = pd.read_csv(input_file)
-
-    # Add new columns for each round (1-6)
-    for round_num in range(1, 7):
-        df[f'candidates_before_{round_num}'] = None
-        df[f'candidates_after_{round_num}'] = None
-        df[f'reduction_rate_{round_num}'] = None
-
-    # Process each game
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Games"):
-        candidates = word_list.copy()
-
-        # Process each round
-        for round_num in range(1, 7):
-            guess_col = f'guess_{round_num}'
-            feedback_col = f'feedback_{round_num}'
-
-            # Check if this round exists for this game
-            if guess_col not in row or pd.isna(row[guess_col]):
-                break
-
-            guess = row[guess_col]
-            feedback = row[feedback_col]
-
-            # Record candidates before
-            candidates_before = len(candidates)
-            df.at[idx, f'candidates_before_{round_num}'] = candidates_before
-
-            # Filter candidates based on feedback
-            candidates = filter_candidates(candidates, guess, feedback)
-
-            # Record candidates after
-            candidates_after = len(candidates)
-            df.at[idx, f'candidates_after_{round_num}'] = candidates_after
-
-            # Calculate reduction rate
-            if candidates_before > 0:
-                reduction_rate = ((candidates_before - candidates_after) / candidates_before) * 100
-                df.at[idx, f'reduction_rate_{round_num}'] = reduction_rate
-            else:
-                df.at[idx, f'reduction_rate_{round_num}'] = 0.0
-
-    # Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Saved to: {output_file}")
-    return df
+    return _add_candidate_columns(input_file, output_file, word_list)
 
 
 def process_hybrid_data(input_file: str, output_file: str, word_list: List[str]):
@@ -125,100 +152,80 @@ def process_hybrid_data(input_file: str, output_file: str, word_list: List[str])
     game_number,target_word,won,attempts,
     guess_1,feedback_1,hamming_1,levenshtein_1,strategy_1,...
     """
-    print(f"\nProcessing: {input_file}")
-    df = pd.read_csv(input_file)
-
-    # Add new columns for each round (1-6)
-    for round_num in range(1, 7):
-        df[f'candidates_before_{round_num}'] = None
-        df[f'candidates_after_{round_num}'] = None
-        df[f'reduction_rate_{round_num}'] = None
-
-    # Process each game
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Games"):
-        candidates = word_list.copy()
-
-        # Process each round
-        for round_num in range(1, 7):
-            guess_col = f'guess_{round_num}'
-            feedback_col = f'feedback_{round_num}'
+    return _add_candidate_columns(input_file, output_file, word_list)
 
-            # Check if this round exists for this game
-            if guess_col not in row or pd.isna(row[guess_col]):
-                break
-
-            guess = row[guess_col]
-            feedback = row[feedback_col]
-
-            # Record candidates before
-            candidates_before = len(candidates)
-            df.at[idx, f'candidates_before_{round_num}'] = candidates_before
-
-            # Filter candidates based on feedback
-            candidates = filter_candidates(candidates, guess, feedback)
-
-            # Record candidates after
-            candidates_after = len(candidates)
-            df.at[idx, f'candidates_after_{round_num}'] = candidates_after
-
-            # Calculate reduction rate
-            if candidates_before > 0:
-                reduction_rate = ((candidates_before - candidates_after) / candidates_before) * 100
-                df.at[idx, f'reduction_rate_{round_num}'] = reduction_rate
-            else:
-                df.at[idx, f'reduction_rate_{round_num}'] = 0.0
-
-    # Save processed data
-    df.to_csv(output_file, index=False)
-    print(f"Saved to: {output_file}")
-    return df
 
+def candidate_jobs(directory) -> List[Tuple[Path, Optional[Path]]]:
+    """
+    (input, output) pairs for a directory (output None = default name).
 
-def main():
-    """Main function to process all algorithm and hybrid data files."""
+    Raw results get a _with_candidates file next to them. Candidate files
+    whose raw run is not in the directory (e.g. search_space_pruning/) are
+    refreshed in place.
+    """
+    entries = get_results_catalog().query(directory)
+    raw = {entry.path for entry in entries if entry.derived == ''}
+    jobs = [(path, None) for path in sorted(raw)]
+    for entry in entries:
+        if entry.derived == 'candidates':
+            source = entry.path.with_name(entry.path.name.replace('_with_candidates', ''))
+            if source not in raw:
+                jobs.append((entry.path, entry.path))
+    return jobs
+
+
+def main(argv=None):
+    """Bring the candidate files of the algorithm and hybrid results up to date."""
+    parser = argparse.ArgumentParser(description='Add candidate counts to algorithm and hybrid results.')
+    parser.add_argument('paths', nargs='*',
+                        help='results CSVs or directories (default: the algorithm run and the stage3 hybrids)')
+    parser.add_argument('--force', action='store_true', help='recompute outputs that are already up to date')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='process files on N worker processes')
+    args = parser.parse_args(argv)
 
     print("Loading word list...")
     word_list = load_word_list()
     print(f"Loaded {len(word_list)} words")
 
+    # Outputs depend on this script and the word list; editing either recomputes them
+    version = source_version(__file__, "wordlist/wordlist.txt")
+    algorithms = Derivation('candidates', partial(process_algorithm_data, word_list=word_list), version)
+    hybrids = Derivation('candidates', partial(process_hybrid_data, word_list=word_list), version)
+
+    if args.paths:
+        jobs = []
+        for path in map(Path, args.paths):
+            if path.is_dir():
+                jobs.extend(candidate_jobs(path))
+            elif path.exists():
+                jobs.append((path, path if path.stem.endswith('_with_candidates') else None))
+            else:
+                print(f"Warning: {path} not found")
+        computed, current = hybrids.derive_many(jobs, force=args.force, workers=args.workers)
+        print(f"\n{computed} file(s) processed, {current} up to date")
+        print("\n✓ All processing complete!")
+        return
+
     # Process algorithm data
     algorithm_input = "results/algorithms/raw data/algorithm_results_20251211_175156.csv"
     algorithm_output = "results/algorithms/raw data/algorithm_results_with_candidates.csv"
 
     if os.path.exists(algorithm_input):
-        process_algorithm_data(algorithm_input, algorithm_output, word_list)
+        if not algorithms.derive(algorithm_input, algorithm_output, force=args.force):
+            print(f"\nUp to date: {algorithm_output}")
     else:
         print(f"Warning: {algorithm_input} not found")
 
-    # Process hybrid data - Stage 3 (zero-shot)
-    hybrid_dir_zs = "results/hybrids/stage3/raw data"
-    if os.path.exists(hybrid_dir_zs):
-        hybrid_files_zs = [f for f in os.listdir(hybrid_dir_zs) if f.endswith('.csv')]
-        print(f"\nFound {len(hybrid_files_zs)} hybrid zero-shot files to process")
-
-        for filename in hybrid_files_zs:
-            input_path = os.path.join(hybrid_dir_zs, filename)
-            output_filename = filename.replace('.csv', '_with_candidates.csv')
-            output_path = os.path.join(hybrid_dir_zs, output_filename)
-
-            process_hybrid_data(input_path, output_path, word_list)
-    else:
-        print(f"Warning: {hybrid_dir_zs} not found")
-
-    # Process hybrid data - Stage 3 CoT
-    hybrid_dir_cot = "results/hybrids/stage3-cot/raw data"
-    if os.path.exists(hybrid_dir_cot):
-        hybrid_files_cot = [f for f in os.listdir(hybrid_dir_cot) if f.endswith('.csv')]
-        print(f"\nFound {len(hybrid_files_cot)} hybrid CoT files to process")
-
-        for filename in hybrid_files_cot:
-            input_path = os.path.join(hybrid_dir_cot, filename)
-            output_filename = filename.replace('.csv', '_with_candidates.csv')
-            output_path = os.path.join(hybrid_dir_cot, output_filename)
-
-            process_hybrid_data(input_path, output_path, word_list)
-    else:
-        print(f"Warning: {hybrid_dir_cot} not found")
+    # Process hybrid data - Stage 3 (zero-shot) and CoT; only new or changed runs are processed
+    for label, hybrid_dir in (("zero-shot", "results/hybrids/stage3/raw data"),
+                              ("CoT", "results/hybrids/stage3-cot/raw data")):
+        if os.path.exists(hybrid_dir):
+            computed, current = hybrids.derive_directory(hybrid_dir, category='hybrids', force=args.force,
+                                                         workers=args.workers)
+            print(f"\nHybrid {label} files: {computed} processed, {current} up to date")
+        else:
+            print(f"Warning: {hybrid_dir} not found")
 
     print("\n✓ All processing complete!")
 
@@ -4,11 +4,14 @@ Calculate constraint violations for algorithm and hybrid data.
 Tracks whether guesses respect the feedback from previous rounds.
 """
 
+import argparse
 import pandas as pd
 import os
 from typing import List, Dict, Set, Tuple
 from tqdm import tqdm
 
+from derived_results import Derivation, source_version
+
 
 class ConstraintTracker:
     """Tracks and validates Wordle constraints."""
@@ -200,8 +203,11 @@ def process_hybrid_data(input_file: str, output_file: str):
     return df
 
 
-def main():
-    """Main function to process all data files."""
+def main(argv=None):
+    """Bring the violation files of the algorithm and hybrid results up to date."""
+    parser = argparse.ArgumentParser(description='Add constraint violation counts to algorithm and hybrid results.')
+    parser.add_argument('--force', action='store_true', help='recompute outputs that are already up to date')
+    args = parser.parse_args(argv)
 
     print("="*80)
     print("CONSTRAINT VIOLATION ANALYSIS")
@@ -213,48 +219,29 @@ def main():
     print("  - Gray: Using a letter that was marked as not in word")
     print("="*80)
 
+    # Outputs depend on this script; editing it recomputes them
+    version = source_version(__file__)
+    algorithms = Derivation('violations', process_algorithm_data, version)
+    hybrids = Derivation('violations', process_hybrid_data, version)
+
     # Process algorithm data
     algorithm_input = "results/algorithms/raw data/algorithm_results_20251211_175156.csv"
     algorithm_output = "results/algorithms/raw data/algorithm_results_with_violations.csv"
 
     if os.path.exists(algorithm_input):
-        process_algorithm_data(algorithm_input, algorithm_output)
+        if not algorithms.derive(algorithm_input, algorithm_output, force=args.force):
+            print(f"\nUp to date: {algorithm_output}")
     else:
         print(f"Warning: {algorithm_input} not found")
 
-    # Process hybrid data - Stage 3 (zero-shot)
-    hybrid_dir_zs = "results/hybrids/stage3/raw data"
-    if os.path.exists(hybrid_dir_zs):
-        hybrid_files_zs = [f for f in os.listdir(hybrid_dir_zs)
-                          if f.endswith('.csv') and not f.endswith('_with_violations.csv')
-                          and not f.endswith('_with_candidates.csv')]
-        print(f"\nFound {len(hybrid_files_zs)} hybrid zero-shot files to process")
-
-        for filename in hybrid_files_zs:
-            input_path = os.path.join(hybrid_dir_zs, filename)
-            output_filename = filename.replace('.csv', '_with_violations.csv')
-            output_path = os.path.join(hybrid_dir_zs, output_filename)
-
-            process_hybrid_data(input_path, output_path)
-    else:
-        print(f"Warning: {hybrid_dir_zs} not found")
-
-    # Process hybrid data - Stage 3 CoT
-    hybrid_dir_cot = "results/hybrids/stage3-cot/raw data"
-    if os.path.exists(hybrid_dir_cot):
-        hybrid_files_cot = [f for f in os.listdir(hybrid_dir_cot)
-                           if f.endswith('.csv') and not f.endswith('_with_violations.csv')
-                           and not f.endswith('_with_candidates.csv')]
-        print(f"\nFound {len(hybrid_files_cot)} hybrid CoT files to process")
-
-        for filename in hybrid_files_cot:
-            input_path = os.path.join(hybrid_dir_cot, filename)
-            output_filename = filename.replace('.csv', '_with_violations.csv')
-            output_path = os.path.join(hybrid_dir_cot, output_filename)
-
-            process_hybrid_data(input_path, output_path)
-    else:
-        print(f"Warning: {hybrid_dir_cot} not found")
+    # Process hybrid data - Stage 3 (zero-shot) and CoT; only new or changed runs are processed
+    for label, hybrid_dir in (("zero-shot", "results/hybrids/stage3/raw data"),
+                              ("CoT", "results/hybrids/stage3-cot/raw data")):
+        if os.path.exists(hybrid_dir):
+            computed, current = hybrids.derive_directory(hybrid_dir, category='hybrids', force=args.force)
+            print(f"\nHybrid {label} files: {computed} processed, {current} up to date")
+        else:
+            print(f"Warning: {hybrid_dir} not found")
 
     print("\n" + "="*80)
     print("✓ All processing complete!")
@@ -0,0 +1,140 @@
+"""
+Per-game checkpoints for long evaluation runs.
+
+A RunCheckpoint records, after every finished game, which game IDs are done,
+their outcomes, the size of each output file at that point, the state of the
+global random/NumPy RNGs and any strategy state that carries over between
+games. Output files are fsync'ed before the checkpoint is replaced
+atomically. On resume, partial rows from the interrupted game are truncated
+away and the run continues at the first unfinished game, appending to the
+same files.
+"""
+
+import json
+import os
+import random
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def capture_rng_state() -> dict:
+    """JSON-serializable state of the global random and NumPy RNGs."""
+    version, internal, gauss_next = random.getstate()
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return {
+        'random': [version, list(internal), gauss_next],
+        'numpy': [name, keys.tolist(), pos, has_gauss, cached_gaussian],
+    }
+
+
+def restore_rng_state(state: dict) -> None:
+    """Restore RNG state captured by capture_rng_state()."""
+    version, internal, gauss_next = state['random']
+    random.setstate((version, tuple(internal), gauss_next))
+    name, keys, pos, has_gauss, cached_gaussian = state['numpy']
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+
+def fsync_file(path) -> None:
+    """Flush a file's contents to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RunCheckpoint:
+    """Completed games and resume state for one evaluation run."""
+
+    def __init__(self, path, config: dict, outputs: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.config = config
+        # Output files of the run (e.g. {'csv': ..., 'summary': ...})
+        self.outputs = dict(outputs or {})
+        self.completed: Dict[int, object] = {}
+        self.offsets: Dict[str, int] = {}
+        self.rng_state: Optional[dict] = None
+        self.strategy_state = None
+        self.complete = False
+
+    @classmethod
+    def load(cls, path, config: dict) -> Optional['RunCheckpoint']:
+        """Checkpoint at path, or None if it is missing or belongs to a different run configuration."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != CHECKPOINT_FORMAT_VERSION or data.get('config') != config:
+            return None
+        checkpoint = cls(path, config, data.get('outputs'))
+        checkpoint.completed = {int(game_id): outcome for game_id, outcome in data.get('completed', {}).items()}
+        checkpoint.offsets = data.get('offsets', {})
+        checkpoint.rng_state = data.get('rng_state')
+        checkpoint.strategy_state = data.get('strategy_state')
+        checkpoint.complete = data.get('complete', False)
+        return checkpoint
+
+    def restore_outputs(self) -> None:
+        """Truncate output files to their size at the last checkpoint (drops rows of an unfinished game)."""
+        for name, size in self.offsets.items():
+            path = self.outputs.get(name)
+            if path and os.path.isfile(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def restore_rng(self) -> None:
+        if self.rng_state is not None:
+            restore_rng_state(self.rng_state)
+
+    def record_game(self, game_id: int, outcome, strategy_state=None) -> None:
+        """Mark a game finished and persist the checkpoint (outputs are fsync'ed first)."""
+        self.completed[int(game_id)] = outcome
+        self.strategy_state = strategy_state
+        self.rng_state = capture_rng_state()
+        self._sync_outputs()
+        self.save()
+
+    def mark_complete(self) -> None:
+        """Record that every game has finished and the summary is written."""
+        self.complete = True
+        self._sync_outputs()
+        self.save()
+
+    def _sync_outputs(self) -> None:
+        for name, path in self.outputs.items():
+            if path and os.path.isfile(path):
+                fsync_file(path)
+                self.offsets[name] = os.path.getsize(path)
+
+    def save(self) -> None:
+        """Write the checkpoint atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': CHECKPOINT_FORMAT_VERSION,
+            'config': self.config,
+            'outputs': self.outputs,
+            'completed': {str(game_id): outcome for game_id, outcome in sorted(self.completed.items())},
+            'offsets': self.offsets,
+            'rng_state': self.rng_state,
+            'strategy_state': self.strategy_state,
+            'complete': self.complete,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
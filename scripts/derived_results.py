@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Incremental derivation of post-processed results files.
+
+calculate_candidates.py and calculate_constraint_violations.py turn each raw
+results CSV into a `<stem>_with_<kind>.csv` next to it. A Derivation does that
+work only where it is needed. Each time it writes an output, it records the
+output's lineage in the results catalog: the input file, the input's SHA-256
+and a version string for the code (and data) that computed it. An output is
+rebuilt only when one of these holds:
+    - it is missing, or it was modified after it was written
+    - the input's content hash changed
+    - the version changed, e.g. the calculator script or the word list was edited
+
+Inputs are taken from the catalog as raw results (derived=''), so outputs
+written next to them are never picked up as inputs. Adding one new run to a
+directory then costs one derivation, plus a stat of each file. Stale outputs
+can be computed in a process pool (derive_many(..., workers=N)).
+
+Analysis scripts that accept several kinds of derived file (e.g. metrics or
+candidates) pick one per run with select_derived() / select_per_run().
+"""
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from results_catalog import DERIVED, CatalogEntry, ResultsCatalog, get_results_catalog
+
+
+def source_version(*paths) -> str:
+    """Short combined hash of the files that determine a derivation's output (scripts, word lists)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def derived_path(input_path, kind: str) -> Path:
+    """Default output name of a derivation: `<stem>_with_<kind>.csv` next to the input."""
+    input_path = Path(input_path)
+    return input_path.with_name(f"{input_path.stem}_with_{kind}.csv")
+
+
+def matches_input(output_path, catalog: Optional[ResultsCatalog] = None) -> Optional[bool]:
+    """
+    Whether a derived file still matches its input's current contents.
+
+    None if the file has no lineage (written before lineage was recorded), so
+    nothing is known about it; False if it or its input changed since.
+    """
+    catalog = catalog or get_results_catalog()
+    output_path = Path(output_path)
+    record = catalog.derivation_of(output_path)
+    if record is None:
+        return None
+    input_entry = catalog.entry(record['input'])
+    stat = output_path.stat()
+    return (input_entry is not None and record['input_sha256'] == input_entry.sha256
+            and (record['size'], record['mtime']) == (stat.st_size, stat.st_mtime))
+
+
+def select_derived(candidates: Sequence[object], catalog: Optional[ResultsCatalog] = None) -> Optional[Path]:
+    """
+    The derived file to analyze for one run, from candidate paths in order of preference.
+
+    The first existing file that matches its input wins; failing that, the newest
+    one without lineage (earlier candidates win ties). Files known to be stale are
+    skipped. None if no usable file.
+    """
+    existing = [Path(path) for path in candidates if Path(path).exists()]
+    status = [matches_input(path, catalog) for path in existing]
+    for path, current in zip(existing, status):
+        if current:
+            return path
+    unknown = [path for path, current in zip(existing, status) if current is None]
+    return max(unknown, key=lambda path: path.stat().st_mtime) if unknown else None
+
+
+def select_per_run(directory, kinds: Sequence[str], category: Optional[str] = None,
+                   catalog: Optional[ResultsCatalog] = None) -> List[CatalogEntry]:
+    """
+    One derived file per run in a directory, preferring kinds in the given order.
+
+    A run missing the preferred kind, or whose file of that kind is stale, falls
+    back to the next kind; runs with no usable file are reported and skipped.
+    """
+    catalog = catalog or get_results_catalog()
+    runs = {}
+    for entry in catalog.query(directory, category=category):
+        run = entry.path.with_name(DERIVED.sub('', entry.path.stem))
+        runs.setdefault(run, {})[entry.derived] = entry
+
+    selected = []
+    for run, files in runs.items():
+        options = {files[kind].path: files[kind] for kind in kinds if kind in files}
+        chosen = select_derived(list(options), catalog)
+        if chosen is None:
+            print(f"Warning: no current {' or '.join(kinds)} file for {run.name}; "
+                  f"run postprocess_results.py")
+            continue
+        selected.append(options[chosen])
+    return selected
+
+
+class Derivation:
+    """One kind of derived file (e.g. candidates) computed by `process(input_path, output_path)`."""
+
+    def __init__(self, kind: str, process: Callable[[str, str], object], version: str,
+                 catalog: Optional[ResultsCatalog] = None):
+        self.kind = kind
+        self.process = process
+        self.version = version
+        self.catalog = catalog or get_results_catalog()
+
+    def output_path(self, input_path) -> Path:
+        return derived_path(input_path, self.kind)
+
+    def is_current(self, input_entry, output_path) -> bool:
+        """True if output_path was derived from the input's current contents by this version."""
+        output_path = Path(output_path)
+        record = self.catalog.derivation_of(output_path)
+        if record is None or not output_path.exists():
+            return False
+        stat = output_path.stat()
+        return (record['derivation'] == self.kind and record['version'] == self.version
+                and record['input_sha256'] == input_entry.sha256
+                and Path(record['input']).resolve() == Path(input_entry.path).resolve()
+                and (record['size'], record['mtime']) == (stat.st_size, stat.st_mtime))
+
+    def derive(self, input_path, output_path=None, force: bool = False) -> bool:
+        """Bring one output up to date; returns True if it was (re)computed."""
+        return self.derive_many([(input_path, output_path)], force=force)[0] > 0
+
+    def derive_many(self, pairs: Sequence[Tuple[object, object]], force: bool = False,
+                    workers: int = 1) -> Tuple[int, int]:
+        """
+        Bring several outputs up to date; returns (computed, up to date).
+
+        `pairs` holds (input, output) paths, with output None for the default
+        name. With workers > 1 the stale outputs are computed in a process pool
+        (process must then be picklable, e.g. a module-level function or a
+        functools.partial of one); lineage is recorded here as each one finishes.
+        """
+        stale = []
+        for input_path, output_path in pairs:
+            output_path = Path(output_path) if output_path is not None else self.output_path(input_path)
+            input_entry = self.catalog.entry(input_path)
+            if input_entry is None:
+                raise FileNotFoundError(f"Not a results file: {input_path}")
+            if force or not self.is_current(input_entry, output_path):
+                stale.append((input_entry, str(input_path), str(output_path)))
+
+        # Lineage is recorded only after process() returns; a partial output left by an
+        # interrupted run no longer matches the recorded size/mtime and is rebuilt next time
+        if workers > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self.process, input_path, output_path)
+                           for _, input_path, output_path in stale]
+                for (input_entry, _, output_path), future in zip(stale, futures):
+                    future.result()
+                    self._record(output_path, input_entry)
+        else:
+            for input_entry, input_path, output_path in stale:
+                self.process(input_path, output_path)
+                self._record(output_path, input_entry)
+        return len(stale), len(pairs) - len(stale)
+
+    def _record(self, output_path, input_entry) -> None:
+        self.catalog.record_derivation(output_path, self.kind, input_entry, self.version)
+        self.catalog.register(output_path)
+
+    def derive_directory(self, directory, category: Optional[str] = None,
+                         force: bool = False, workers: int = 1) -> Tuple[int, int]:
+        """Derive outputs for every raw results file in a directory; returns (computed, up to date)."""
+        entries = self.catalog.query(directory, category=category, derived='')
+        return self.derive_many([(entry.path, None) for entry in entries], force=force, workers=workers)
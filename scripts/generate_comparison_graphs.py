@@ -9,6 +9,12 @@ import seaborn as sns
 from pathlib import Path
 import numpy as np
 
+from results_store import load_results
+from results_catalog import get_results_catalog
+
+# Columns the plots use (skips the large prompt/CoT text columns)
+LLM_COLUMNS = ['game_id', 'target_word', 'model_name', 'prompt_type', 'attempt_number', 'guess', 'win']
+
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -38,8 +44,9 @@ def calculate_levenshtein_distance(word1, word2):
 
 def load_algorithm_results(results_dir):
     """Load algorithm results in long format."""
-    csv_file = list(Path(results_dir).glob('algorithm_results_*.csv'))[0]
-    df = pd.read_csv(csv_file)
+    # Latest raw algorithm run
+    csv_file = get_results_catalog().query(results_dir, category='algorithms', derived='')[-1].path
+    df = load_results(csv_file)
 
     # Convert wide format to long format
     long_data = []
@@ -68,8 +75,8 @@ def load_llm_results(results_dir):
     """Load LLM results and calculate distances."""
     all_results = []
 
-    for csv_file in Path(results_dir).glob('model_*.csv'):
-        df = pd.read_csv(csv_file)
+    for entry in get_results_catalog().query(results_dir, category='llms'):
+        df = load_results(entry.path, LLM_COLUMNS)
 
         # Calculate distances
         df['hamming_distance'] = df.apply(
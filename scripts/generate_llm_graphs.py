@@ -11,6 +11,12 @@ from pathlib import Path
 from collections import defaultdict
 import numpy as np
 
+from results_store import load_results
+from results_catalog import get_results_catalog
+
+# Columns the plots use (skips the large prompt/CoT text columns)
+LLM_COLUMNS = ['game_id', 'target_word', 'model_name', 'prompt_type', 'attempt_number', 'guess', 'win']
+
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -42,11 +48,11 @@ def load_and_process_llm_results(results_dir):
     """Load all LLM CSV files and calculate distances."""
     all_results = []
 
-    csv_files = list(Path(results_dir).glob('model_*.csv'))
+    csv_files = [entry.path for entry in get_results_catalog().query(results_dir, category='llms')]
     print(f"Loading {len(csv_files)} LLM result files...")
 
     for csv_file in csv_files:
-        df = pd.read_csv(csv_file)
+        df = load_results(csv_file, LLM_COLUMNS)
 
         # Calculate distances
         df['hamming_distance'] = df.apply(
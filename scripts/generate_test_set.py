@@ -66,7 +66,7 @@ def generate_test_set(tiers, total_words=100, seed=42):
     Returns:
         list of tuples: [(game_id, word, tier), ...]
     """
-    random.seed(seed)
+    rng = random.Random(seed)
 
     # Filter out empty tiers
     available_tiers = {t: words for t, words in tiers.items() if len(words) > 0}
@@ -101,7 +101,7 @@ def generate_test_set(tiers, total_words=100, seed=42):
             )
 
         # Random sample without replacement
-        sampled_words = random.sample(tier_words, num_words)
+        sampled_words = rng.sample(tier_words, num_words)
 
         # Add to test set with game IDs
         for word in sampled_words:
@@ -8,8 +8,8 @@ Tests whether alternating between human-like intuition (LLM) and optimal
 information theory (CSS) on each guess improves performance.
 """
 
+import argparse
 import os
-import csv
 import time
 import json
 import random
@@ -18,6 +18,7 @@ import sys
 from datetime import datetime
 from typing import List, Tuple
 from pathlib import Path
+import numpy as np
 
 # Add parent directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'engines'))
@@ -27,8 +28,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from wordle_env import WordleEnv
 from test_set_loader import get_test_words_only
 from css_strategy import CSSStrategy
-from voi_strategy import VOIStrategy
+from voi_strategy import VOIStrategy, shared_frequency_tables
 from random_strategy import RandomStrategy
+from llm_client import get_client
+from llm_cache import get_llm_cache, response_text, CacheMiss
+from rate_limiter import get_rate_limiter, estimate_tokens
+from checkpoint import RunCheckpoint
+from result_sink import open_sink
+from results_store import columnar_format, write_columnar
+from results_catalog import get_results_catalog
 
 
 # ----------------- Hybrid Strategy -----------------
@@ -55,8 +63,37 @@ class AlternatingHybridStrategy:
             raise ValueError(f"Unknown algorithm: {algorithm}. Must be 'css', 'voi', or 'random'")
 
         self.turn_number = 0
+        # Response-cache sample index (the game index), so each game samples independently
+        self.sample_index = 0
         self.api_base = os.getenv("NAVIGATOR_API_ENDPOINT", "https://api.navigator.uf.edu/v1")
 
+    def checkpoint_state(self) -> dict:
+        """
+        State carried over between games: VOI beliefs, and the letter/position
+        frequency tables built when the beliefs were first initialized (used
+        to score opening guesses).
+        """
+        beliefs = getattr(self.algo_strategy, 'beliefs', None)
+        if beliefs is None:
+            return {'beliefs': None}
+        return {
+            'beliefs': beliefs.tolist(),
+            'letter_frequencies': dict(self.algo_strategy.letter_frequencies),
+            'position_frequencies': [dict(f) for f in self.algo_strategy.position_frequencies],
+        }
+
+    def restore_state(self, state: dict):
+        """Restore state saved by checkpoint_state()."""
+        if state and state.get('beliefs') is not None:
+            self.algo_strategy.beliefs = np.array(state['beliefs'], dtype=np.float64)
+            if state.get('letter_frequencies') is not None:
+                self.algo_strategy.letter_frequencies = state['letter_frequencies']
+                self.algo_strategy.position_frequencies = state['position_frequencies']
+            else:
+                # Checkpoints written before the tables were saved: rebuild them over the full word list
+                self.algo_strategy.letter_frequencies, self.algo_strategy.position_frequencies = \
+                    shared_frequency_tables(self.algo_strategy.vocab, self.algo_strategy.vocab.all_ids)
+
     def update_belief(self, candidates: List[str], guess: str, feedback: List[str]) -> List[str]:
         """Update candidates based on feedback - delegates to algorithm."""
         return self.algo_strategy.update_belief(candidates, guess, feedback)
@@ -85,33 +122,34 @@ class AlternatingHybridStrategy:
     def _get_llm_guess(self, candidates: List[str], history: List[Tuple[str, List[str]]]) -> str:
         """Get guess from LLM with retry logic."""
         try:
-            import openai
-            client = openai.OpenAI(
-                api_key=os.getenv("NAVIGATOR_UF_API_KEY"),
-                base_url=self.api_base
-            )
+            limiter = get_rate_limiter(self.model_name, self.api_base)
+            client = limiter.wrap_client(get_client(self.api_base))
 
             prompt = self._build_prompt(candidates, history)
+            request = dict(
+                model=self.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.temperature,
+                max_tokens=150
+            )
 
             def api_call():
-                return client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=150
-                )
+                response = limiter.call(lambda: client.chat.completions.create(**request), estimate_tokens(request))
+                return response_text(response)
 
             # Retry logic
             for attempt in range(5):
                 try:
-                    response = api_call()
-                    text = response.choices[0].message.content.strip()
+                    text = get_llm_cache().complete(request, api_call, self.sample_index).strip()
                     guess = self._extract_guess(text, history, candidates)
                     if guess:
                         return guess
                     # If no valid guess, fallback to algorithm
                     print(f"LLM failed to provide valid guess, falling back to {self.algorithm.upper()}")
                     return self.algo_strategy.select_guess(candidates, history)
+                except CacheMiss as e:
+                    print(f"{e}, using {self.algorithm.upper()}")
+                    return self.algo_strategy.select_guess(candidates, history)
                 except Exception as e:
                     print(f"LLM API attempt {attempt+1}/5 failed: {e}")
                     if attempt < 4:
@@ -282,8 +320,57 @@ def levenshtein_distance(word1: str, word2: str) -> int:
 
 # ----------------- Main Evaluation -----------------
 
-def run_evaluation(num_games=100, model_name="llama-3.3-70b-instruct", start_with="llm", prompt_type="zero-shot", algorithm="css"):
-    """Run evaluation on canonical test set."""
+def csv_header() -> List[str]:
+    header = ['game_number', 'target_word', 'won', 'attempts']
+    for i in range(1, 7):
+        header.extend([f'guess_{i}', f'feedback_{i}', f'hamming_{i}', f'levenshtein_{i}', f'strategy_{i}'])
+    return header
+
+
+def csv_row(result: dict) -> dict:
+    row = [result['game_number'], result['target_word'], result['won'], result['attempts']]
+    for i in range(6):
+        if i < len(result['guesses']):
+            row.extend([
+                result['guesses'][i],
+                result['feedbacks'][i],
+                result['hamming_distances'][i],
+                result['levenshtein_distances'][i],
+                result['strategy_used'][i] if i < len(result['strategy_used']) else ''
+            ])
+        else:
+            row.extend(['', '', '', '', ''])
+    return dict(zip(csv_header(), row))
+
+
+def run_summary(results: List[dict], model_name: str, start_with: str, prompt_type: str,
+                algorithm: str, timestamp: str) -> dict:
+    """Summary statistics of a run from its per-game results."""
+    wins = sum(1 for result in results if result['won'])
+    total_attempts = sum(result['attempts'] for result in results if result['won'])
+    return {
+        'strategy': f'alternating_{start_with}_first',
+        'model_name': model_name,
+        'start_with': start_with,
+        'prompt_type': prompt_type,
+        'algorithm': algorithm,
+        'total_games': len(results),
+        'wins': wins,
+        'win_rate': wins / len(results) if results else 0,
+        'avg_attempts_when_won': total_attempts / wins if wins > 0 else 0,
+        'timestamp': timestamp
+    }
+
+
+def run_evaluation(num_games=100, model_name="llama-3.3-70b-instruct", start_with="llm", prompt_type="zero-shot", algorithm="css",
+                   resume=False):
+    """
+    Run evaluation on canonical test set.
+
+    Each game's row is appended to the CSV and checkpointed as soon as it
+    finishes; with resume=True an interrupted run with the same configuration
+    continues at its first unfinished game.
+    """
 
     print("="*80)
     print(f"HYBRID STRATEGY EVALUATION: Alternating LLM-{algorithm.upper()}")
@@ -311,18 +398,63 @@ def run_evaluation(num_games=100, model_name="llama-3.3-70b-instruct", start_wit
     strategy = AlternatingHybridStrategy(model_name=model_name, start_with=start_with, prompt_type=prompt_type, algorithm=algorithm)
     agent = GuessingAgent(word_list, strategy)
 
+    output_dir = script_dir / 'results' / 'hybrids'
+    output_dir.mkdir(parents=True, exist_ok=True)
+    prompt_suffix = "_cot" if prompt_type == "cot" else ""
+    algo_suffix = f"_{algorithm}" if algorithm != "css" else ""
+    run_name = f"alternating_{start_with}_first_{model_name}{algo_suffix}{prompt_suffix}"
+    checkpoint_file = output_dir / 'checkpoints' / f"{run_name}.json"
+    checkpoint_config = {'model_name': model_name, 'start_with': start_with, 'prompt_type': prompt_type,
+                         'algorithm': algorithm, 'test_words': test_words}
+
+    checkpoint = RunCheckpoint.load(checkpoint_file, checkpoint_config) if resume else None
+    if checkpoint is not None and checkpoint.complete:
+        print(f"Run already complete: {checkpoint.outputs['csv']}")
+        results = [checkpoint.completed[i] for i in sorted(checkpoint.completed)]
+        try:
+            with open(checkpoint.outputs['summary'], 'r') as f:
+                summary = json.load(f)
+        except FileNotFoundError:
+            # The sweep script moves finished outputs away; the checkpoint holds every game
+            summary = run_summary(results, model_name, start_with, prompt_type, algorithm,
+                                  checkpoint.outputs['timestamp'])
+        return results, summary
+
+    if checkpoint is not None:
+        # Continue the interrupted run: same files, RNG and strategy state as after its last finished game
+        timestamp = checkpoint.outputs['timestamp']
+        csv_file = Path(checkpoint.outputs['csv'])
+        json_file = Path(checkpoint.outputs['summary'])
+        checkpoint.restore_outputs()
+        checkpoint.restore_rng()
+        strategy.restore_state(checkpoint.strategy_state)
+        sink = open_sink(csv_file, csv_header(), format='csv', append=True)
+        print(f"Resuming after {len(checkpoint.completed)}/{num_games} completed games: {csv_file}")
+    else:
+        if resume:
+            print("No checkpoint for this run, starting from the first game")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        csv_file = output_dir / f"{run_name}_{timestamp}.csv"
+        json_file = output_dir / f"summary_{run_name}_{timestamp}.json"
+        sink = open_sink(csv_file, csv_header(), format='csv')
+        checkpoint = RunCheckpoint(checkpoint_file, checkpoint_config,
+                                   {'csv': str(csv_file), 'summary': str(json_file), 'timestamp': timestamp})
+        sink.sync()
+        checkpoint.save()
+
     # Results storage
-    results = []
-    wins = 0
-    total_attempts = 0
+    results = [checkpoint.completed[i] for i in sorted(checkpoint.completed)]
 
     # Run games
     for game_num, target_word in enumerate(test_words, 1):
+        if game_num - 1 in checkpoint.completed:
+            continue
         print(f"\nGame {game_num}/{num_games}: Target = {target_word}")
 
         env = WordleEnv([target_word])
         env.reset()
         agent.reset()
+        strategy.sample_index = game_num - 1
 
         game_result = {
             'game_number': game_num,
@@ -372,8 +504,6 @@ def run_evaluation(num_games=100, model_name="llama-3.3-70b-instruct", start_wit
             # Check if won (feedback is strings: "G", "Y", "-")
             if all(f == "G" for f in feedback):
                 game_result['won'] = True
-                wins += 1
-                total_attempts += attempt
                 print(f"  ✓ Won in {attempt} attempts!")
                 break
 
@@ -381,80 +511,49 @@ def run_evaluation(num_games=100, model_name="llama-3.3-70b-instruct", start_wit
             print(f"  ✗ Failed to find word")
 
         results.append(game_result)
+        sink.write(csv_row(game_result))
+        sink.sync()
+        checkpoint.record_game(game_num - 1, game_result, strategy.checkpoint_state())
+
+    sink.close()
 
-    # Calculate statistics
-    win_rate = wins / num_games
-    avg_attempts = total_attempts / wins if wins > 0 else 0
+    # Save summary JSON (game rows were written as each game finished)
+    summary = run_summary(results, model_name, start_with, prompt_type, algorithm, timestamp)
 
     print("\n" + "="*80)
     print("RESULTS SUMMARY")
     print("="*80)
     print(f"Games played: {num_games}")
-    print(f"Wins: {wins}")
-    print(f"Win rate: {win_rate*100:.1f}%")
-    print(f"Average attempts (when won): {avg_attempts:.2f}")
+    print(f"Wins: {summary['wins']}")
+    print(f"Win rate: {summary['win_rate']*100:.1f}%")
+    print(f"Average attempts (when won): {summary['avg_attempts_when_won']:.2f}")
     print("="*80)
 
-    # Save results
-    output_dir = script_dir / 'results' / 'hybrids'
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Typed columnar copy for the analysis scripts (RESULT_COLUMNAR=parquet|arrow)
+    if columnar_format():
+        summary['columnar_file'] = str(write_columnar(csv_file, columnar_format()))
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    prompt_suffix = "_cot" if prompt_type == "cot" else ""
-    algo_suffix = f"_{algorithm}" if algorithm != "css" else ""
-    csv_file = output_dir / f"alternating_{start_with}_first_{model_name}{algo_suffix}{prompt_suffix}_{timestamp}.csv"
-
-    with open(csv_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-
-        # Header
-        header = ['game_number', 'target_word', 'won', 'attempts']
-        for i in range(1, 7):
-            header.extend([f'guess_{i}', f'feedback_{i}', f'hamming_{i}', f'levenshtein_{i}', f'strategy_{i}'])
-        writer.writerow(header)
-
-        # Data rows
-        for result in results:
-            row = [result['game_number'], result['target_word'], result['won'], result['attempts']]
-            for i in range(6):
-                if i < len(result['guesses']):
-                    row.extend([
-                        result['guesses'][i],
-                        result['feedbacks'][i],
-                        result['hamming_distances'][i],
-                        result['levenshtein_distances'][i],
-                        result['strategy_used'][i] if i < len(result['strategy_used']) else ''
-                    ])
-                else:
-                    row.extend(['', '', '', '', ''])
-            writer.writerow(row)
-
-    # Save summary JSON
-    summary = {
-        'strategy': f'alternating_{start_with}_first',
-        'model_name': model_name,
-        'start_with': start_with,
-        'prompt_type': prompt_type,
-        'algorithm': algorithm,
-        'total_games': num_games,
-        'wins': wins,
-        'win_rate': win_rate,
-        'avg_attempts_when_won': avg_attempts,
-        'timestamp': timestamp
-    }
-
-    json_file = output_dir / f"summary_alternating_{start_with}_first_{model_name}{algo_suffix}{prompt_suffix}_{timestamp}.json"
     with open(json_file, 'w') as f:
         json.dump(summary, f, indent=2)
+    checkpoint.mark_complete()
+    get_results_catalog().register(csv_file)
 
     print(f"\nResults saved to:")
     print(f"  {csv_file}")
     print(f"  {json_file}")
+    llm_cache = get_llm_cache()
+    if llm_cache.mode != 'off':
+        print(f"LLM cache ({llm_cache.mode}): {llm_cache.stats()}")
 
     return results, summary
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Alternating LLM/algorithm hybrid evaluation (configured by environment variables).')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run from its checkpoint instead of starting over')
+    args = parser.parse_args()
+
     # Get configuration from environment
     model_name = os.getenv("MODEL", "llama-3.3-70b-instruct")
     num_games = int(os.getenv("NUM_GAMES", "100"))
@@ -462,9 +561,10 @@ if __name__ == "__main__":
     prompt_type = os.getenv("PROMPT_TYPE", "zero-shot")  # "zero-shot" or "cot"
     algorithm = os.getenv("ALGORITHM", "css")  # "css", "voi", or "random"
 
-    # Check API key
-    if not os.getenv("NAVIGATOR_UF_API_KEY"):
+    # Check API key (not needed when replaying cached responses)
+    if not os.getenv("NAVIGATOR_UF_API_KEY") and get_llm_cache().mode != 'replay':
         print("ERROR: NAVIGATOR_UF_API_KEY environment variable not set")
         sys.exit(1)
 
-    run_evaluation(num_games=num_games, model_name=model_name, start_with=start_with, prompt_type=prompt_type, algorithm=algorithm)
+    run_evaluation(num_games=num_games, model_name=model_name, start_with=start_with, prompt_type=prompt_type, algorithm=algorithm,
+                   resume=args.resume)
@@ -2,6 +2,9 @@
 
 # Comprehensive Hybrid Evaluation Script
 # Runs both zero-shot and CoT evaluations across all algorithms
+# Safe to re-run after an interruption: every run is started with --resume,
+# so finished runs are skipped and an interrupted run continues at its first
+# unfinished game (checkpoints in results/hybrids/checkpoints/)
 
 # Load .env file
 set -a
@@ -41,6 +44,14 @@ mkdir -p "$RESULTS_DIR_COT/raw data"
 mkdir -p "$RESULTS_DIR_COT/summary stats"
 mkdir -p "$RESULTS_DIR_COT/logs"
 
+CHECKPOINT_DIR="$(dirname "$0")/../../results/hybrids/checkpoints"
+
+# True if the run's checkpoint records that every game finished and the summary
+# was written. Outputs of unfinished runs stay where --resume appends to them.
+run_complete() {
+    grep -q '"complete": true' "$CHECKPOINT_DIR/$1.json" 2>/dev/null
+}
+
 # Array of models to test (same 9 models from Stage 3)
 MODELS=(
     "codestral-22b"
@@ -107,7 +118,7 @@ for ALGORITHM in "voi" "random"; do
         LOG_FILE="$RESULTS_DIR_ZEROSHOT/logs/alternating_hybrid_${MODEL}_${ALGORITHM}_zeroshot_$(date +%Y%m%d_%H%M%S).log"
 
         # Run evaluation
-        "$(dirname "$0")/../../venv/bin/python3" "$(dirname "$0")/alternating_hybrid.py" 2>&1 | tee "$LOG_FILE"
+        "$(dirname "$0")/../../venv/bin/python3" "$(dirname "$0")/alternating_hybrid.py" --resume 2>&1 | tee "$LOG_FILE"
 
         EXIT_CODE=${PIPESTATUS[0]}
 
@@ -118,9 +129,14 @@ for ALGORITHM in "voi" "random"; do
             echo "✅ $MODEL + $ALGO_UPPER (zero-shot) completed successfully"
         fi
 
-        # Move output files to appropriate directories
-        mv "$(dirname "$0")/../../results/hybrids"/alternating_llm_first_${MODEL}_${ALGORITHM}_*.csv "$RESULTS_DIR_ZEROSHOT/raw data/" 2>/dev/null || true
-        mv "$(dirname "$0")/../../results/hybrids"/summary_alternating_llm_first_${MODEL}_${ALGORITHM}_*.json "$RESULTS_DIR_ZEROSHOT/summary stats/" 2>/dev/null || true
+        # Move output files to appropriate directories (finished runs only)
+        RUN_NAME="alternating_llm_first_${MODEL}_${ALGORITHM}"
+        if [ $EXIT_CODE -eq 0 ] && run_complete "$RUN_NAME"; then
+            mv "$(dirname "$0")/../../results/hybrids"/${RUN_NAME}_*.csv "$RESULTS_DIR_ZEROSHOT/raw data/" 2>/dev/null || true
+            mv "$(dirname "$0")/../../results/hybrids"/summary_${RUN_NAME}_*.json "$RESULTS_DIR_ZEROSHOT/summary stats/" 2>/dev/null || true
+        else
+            echo "Run not complete; outputs left in results/hybrids for --resume"
+        fi
 
         echo ""
     done
@@ -161,7 +177,7 @@ for ALGORITHM in "css" "voi" "random"; do
         LOG_FILE="$RESULTS_DIR_COT/logs/alternating_hybrid_${MODEL}_${ALGORITHM}_cot_$(date +%Y%m%d_%H%M%S).log"
 
         # Run evaluation
-        "$(dirname "$0")/../../venv/bin/python3" "$(dirname "$0")/alternating_hybrid.py" 2>&1 | tee "$LOG_FILE"
+        "$(dirname "$0")/../../venv/bin/python3" "$(dirname "$0")/alternating_hybrid.py" --resume 2>&1 | tee "$LOG_FILE"
 
         EXIT_CODE=${PIPESTATUS[0]}
 
@@ -172,13 +188,17 @@ for ALGORITHM in "css" "voi" "random"; do
             echo "✅ $MODEL + $ALGO_UPPER (CoT) completed successfully"
         fi
 
-        # Move output files to appropriate directories
+        # Move output files to appropriate directories (finished runs only)
         if [ "$ALGORITHM" == "css" ]; then
-            mv "$(dirname "$0")/../../results/hybrids"/alternating_llm_first_${MODEL}_cot_*.csv "$RESULTS_DIR_COT/raw data/" 2>/dev/null || true
-            mv "$(dirname "$0")/../../results/hybrids"/summary_alternating_llm_first_${MODEL}_cot_*.json "$RESULTS_DIR_COT/summary stats/" 2>/dev/null || true
+            RUN_NAME="alternating_llm_first_${MODEL}_cot"
+        else
+            RUN_NAME="alternating_llm_first_${MODEL}_${ALGORITHM}_cot"
+        fi
+        if [ $EXIT_CODE -eq 0 ] && run_complete "$RUN_NAME"; then
+            mv "$(dirname "$0")/../../results/hybrids"/${RUN_NAME}_*.csv "$RESULTS_DIR_COT/raw data/" 2>/dev/null || true
+            mv "$(dirname "$0")/../../results/hybrids"/summary_${RUN_NAME}_*.json "$RESULTS_DIR_COT/summary stats/" 2>/dev/null || true
         else
-            mv "$(dirname "$0")/../../results/hybrids"/alternating_llm_first_${MODEL}_${ALGORITHM}_cot_*.csv "$RESULTS_DIR_COT/raw data/" 2>/dev/null || true
-            mv "$(dirname "$0")/../../results/hybrids"/summary_alternating_llm_first_${MODEL}_${ALGORITHM}_cot_*.json "$RESULTS_DIR_COT/summary stats/" 2>/dev/null || true
+            echo "Run not complete; outputs left in results/hybrids for --resume"
         fi
 
         echo ""
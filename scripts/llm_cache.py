@@ -0,0 +1,160 @@
+"""
+Persistent LLM response cache.
+
+Responses are stored in SQLite (WAL mode, so several worker processes can read
+and write the same file) under a content hash of the request: model, messages,
+temperature, max_tokens and a sample index. The sample index keeps independent
+samples of the same prompt apart -- the evaluation scripts use the game index,
+so every game still gets its own response to the (identical) opening prompt.
+
+Configured from the environment:
+    LLM_CACHE_MODE   off (default) | read-through | write-through | replay
+    LLM_CACHE_PATH   SQLite file (default: results/llm_cache.sqlite)
+
+Modes:
+    read-through   serve hits from the cache, call the API on a miss and store it
+    write-through  always call the API and store (refresh) the response
+    replay         never call the API; a miss raises CacheMiss
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / 'results' / 'llm_cache.sqlite'
+CACHE_MODES = ('off', 'read-through', 'write-through', 'replay')
+
+_caches: Dict[Tuple[str, str], 'LLMResponseCache'] = {}
+_caches_lock = threading.Lock()
+
+
+class CacheMiss(LookupError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+def response_text(response) -> str:
+    """Message content of a chat-completions response."""
+    if not response.choices or len(response.choices) == 0:
+        raise ValueError("API returned empty choices array")
+    return response.choices[0].message.content or ""
+
+
+class LLMResponseCache:
+    """SQLite-backed map from request fingerprint to response text."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, mode: str = 'read-through'):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}. Must be one of {', '.join(CACHE_MODES)}")
+        self.path = Path(path)
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread (and process), created on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT, created REAL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def key(request: dict, sample_index: int = 0) -> str:
+        """Fingerprint of a chat-completions request (other arguments, e.g. timeout, are ignored)."""
+        payload = json.dumps({
+            'model': request.get('model'),
+            'messages': request.get('messages'),
+            'temperature': request.get('temperature'),
+            'max_tokens': request.get('max_tokens'),
+            'sample_index': sample_index,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response text for a key, or None."""
+        row = self._connection().execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, text: str) -> None:
+        """Store (or replace) the response text for a key."""
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, created) VALUES (?, ?, ?, ?)",
+            (key, model, text, time.time()))
+        conn.commit()
+        with self._lock:
+            self.writes += 1
+
+    def _lookup(self, request: dict, sample_index: int):
+        """(key, cached text or None) for the read side of the current mode."""
+        if self.mode == 'off':
+            return None, None
+        key = self.key(request, sample_index)
+        if self.mode == 'write-through':
+            return key, None
+        text = self.get(key)
+        if text is None and self.mode == 'replay':
+            raise CacheMiss(f"No cached response for {request.get('model')} (sample {sample_index})")
+        return key, text
+
+    def complete(self, request: dict, call, sample_index: int = 0) -> str:
+        """
+        Response text for a request, from the cache or from call().
+
+        call() performs the API request (including any retries) and returns the
+        response text.
+        """
+        key, text = self._lookup(request, sample_index)
+        if text is not None:
+            return text
+        text = call()
+        if key is not None:
+            self.put(key, request.get('model'), text)
+        return text
+
+    async def acomplete(self, request: dict, call, sample_index: int = 0) -> str:
+        """complete() for a coroutine call()."""
+        key, text = self._lookup(request, sample_index)
+        if text is not None:
+            return text
+        text = await call()
+        if key is not None:
+            self.put(key, request.get('model'), text)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/write counters for this process."""
+        return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes}
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide response cache configured by LLM_CACHE_MODE / LLM_CACHE_PATH."""
+    mode = os.getenv('LLM_CACHE_MODE', 'off').lower()
+    path = str(Path(os.getenv('LLM_CACHE_PATH', str(DEFAULT_CACHE_PATH))).resolve())
+    with _caches_lock:
+        if (path, mode) not in _caches:
+            _caches[(path, mode)] = LLMResponseCache(path, mode)
+        return _caches[(path, mode)]
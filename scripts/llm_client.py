@@ -0,0 +1,94 @@
+"""
+Shared, pooled OpenAI-compatible clients.
+
+Strategies used to build a new openai.OpenAI client for every guess, paying a
+fresh TCP/TLS handshake on each call. get_client()/get_async_client() return
+one client per (endpoint, API key) for the whole process, backed by an HTTP
+connection pool with keep-alive, so every strategy talking to the same
+endpoint reuses the same connections.
+
+Pool size and timeouts come from the environment:
+    LLM_POOL_SIZE            max connections per client (default 32)
+    LLM_KEEPALIVE_EXPIRY     seconds an idle connection is kept (default 60)
+    LLM_CONNECT_TIMEOUT      connect timeout in seconds (default 10)
+    LLM_READ_TIMEOUT         read/write/pool timeout in seconds (default 60)
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+DEFAULT_API_BASE = "https://api.navigator.uf.edu/v1"
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> {(base, key): client}
+_lock = threading.Lock()
+
+
+def _pool_settings():
+    """httpx limits and timeout built from the LLM_* environment variables."""
+    import httpx
+
+    pool_size = int(os.getenv("LLM_POOL_SIZE", "32"))
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60")),
+    )
+    read_timeout = float(os.getenv("LLM_READ_TIMEOUT", "60"))
+    timeout = httpx.Timeout(read_timeout, connect=float(os.getenv("LLM_CONNECT_TIMEOUT", "10")))
+    return limits, timeout
+
+
+def _endpoint(api_base=None, api_key=None):
+    api_base = api_base or os.getenv("NAVIGATOR_API_ENDPOINT", DEFAULT_API_BASE)
+    api_key = api_key if api_key is not None else os.getenv("NAVIGATOR_UF_API_KEY")
+    return api_base, api_key
+
+
+def get_client(api_base=None, api_key=None):
+    """Process-wide synchronous client for an endpoint (thread-safe, pooled, keep-alive)."""
+    key = _endpoint(api_base, api_key)
+    with _lock:
+        if key not in _clients:
+            import openai
+            limits, timeout = _pool_settings()
+            _clients[key] = openai.OpenAI(
+                base_url=key[0],
+                api_key=key[1],
+                timeout=timeout,
+                http_client=openai.DefaultHttpxClient(limits=limits, timeout=timeout),
+            )
+        return _clients[key]
+
+
+def get_async_client(api_base=None, api_key=None):
+    """
+    Async client for an endpoint, shared by all tasks of the running event loop.
+
+    Async connection pools are bound to the loop they were created on, so each
+    loop gets its own client (released when the loop is garbage collected).
+    """
+    key = _endpoint(api_base, api_key)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        if key not in loop_clients:
+            import openai
+            limits, timeout = _pool_settings()
+            loop_clients[key] = openai.AsyncOpenAI(
+                base_url=key[0],
+                api_key=key[1],
+                timeout=timeout,
+                http_client=openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout),
+            )
+        return loop_clients[key]
+
+
+def close_clients():
+    """Close the pooled synchronous clients (e.g. before forking worker processes)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -5,6 +5,8 @@ Runs one model with one prompting type on the standardized word set.
 Logs full chain-of-thought (CoT) traces and final guesses per attempt.
 """
 
+import argparse
+import asyncio
 import os
 import csv
 import time
@@ -23,7 +25,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'algorithms'))
 sys.path.insert(0, str(Path(__file__).parent))
 
 from wordle_env import WordleEnv
+from feedback_matrix import get_feedback_matrix
 from test_set_loader import get_test_words_only
+from llm_client import get_client, get_async_client
+from checkpoint import RunCheckpoint
+from result_sink import open_sink
+from results_store import columnar_format, write_columnar
+from results_catalog import get_results_catalog
+from llm_cache import get_llm_cache, response_text
+from rate_limiter import get_rate_limiter, estimate_tokens
 
 
 # ----------------- GuessingAgent -----------------
@@ -47,6 +57,10 @@ class GuessingAgent:
         guess = self.strategy.get_guess(self.candidates, self.history)
         return guess
 
+    async def aselect_guess(self):
+        """select_guess for concurrent evaluation (awaits the strategy's async client)."""
+        return await self.strategy.aget_guess(self.candidates, self.history)
+
     def update(self, guess, feedback, reward):
         """Update agent state after a guess."""
         # Convert feedback to string format if needed
@@ -78,6 +92,20 @@ def call_with_retry(fn, tries=5, base_delay=1.0):
             time.sleep(delay)
 
 
+async def async_call_with_retry(fn, tries=5, base_delay=1.0):
+    """call_with_retry for coroutine functions: backs off with asyncio.sleep instead of blocking."""
+    for i in range(tries):
+        try:
+            return await fn()
+        except Exception as e:
+            print(f"API call attempt {i+1}/{tries} failed: {e}")
+            if i == tries - 1:
+                raise
+            # Exponential backoff with jitter
+            delay = base_delay * (2 ** i) + random.uniform(0, 1)
+            await asyncio.sleep(delay)
+
+
 def extract_valid_guess(text: str, used: set, word_list: List[str]) -> str | None:
     """
     Extract a single valid 5-letter word from LLM output.
@@ -246,10 +274,15 @@ class LLMStrategy:
 
 class NavigatorUFStrategy(LLMStrategy):
     """Base strategy for Navigator UF models (zero-shot)."""
+    max_tokens = 16
+    api_tries = 3
+
     def __init__(self, model_name, temperature=0.7):
         super().__init__(model_name, temperature)
         self.api_base = os.getenv("NAVIGATOR_API_ENDPOINT", "https://api.navigator.uf.edu/v1")
         self.used = set()
+        # Response-cache sample index (the game index), so each game samples independently
+        self.sample_index = 0
 
     def _build_prompt(self, word_list, feedback_history):
         prior = ""
@@ -298,61 +331,90 @@ class NavigatorUFStrategy(LLMStrategy):
         self.last_prompt = prompt  # Store for CSV logging
         return prompt
 
+    def _prepare_prompt(self, word_list, feedback_history):
+        return self._build_prompt(word_list, feedback_history or [])
+
+    def _request_kwargs(self, prompt):
+        """Chat-completions arguments for one guess."""
+        return dict(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            timeout=30.0  # Add explicit timeout
+        )
+
     def get_guess(self, word_list, feedback_history=None):
         try:
-            import openai
-            client = openai.OpenAI(
-                api_key=os.getenv("NAVIGATOR_UF_API_KEY"),
-                base_url=self.api_base
-            )
-            feedback_history = feedback_history or []
-            prompt = self._build_prompt(word_list, feedback_history)
+            limiter = get_rate_limiter(self.model_name, self.api_base)
+            client = limiter.wrap_client(get_client(self.api_base))
+            prompt = self._prepare_prompt(word_list, feedback_history)
+            request = self._request_kwargs(prompt)
 
             def api_call():
-                return client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=16,
-                    timeout=30.0  # Add explicit timeout
-                )
-
-            response = call_with_retry(api_call, tries=3, base_delay=0.75)
-
-            # Check if response has choices and content
-            if not response.choices or len(response.choices) == 0:
-                raise ValueError("API returned empty choices array")
-
-            raw = (response.choices[0].message.content or "").strip()
-            # zero-shot has no explicit CoT; we still log raw response as "cot_trace" for parity
-            cot_trace = raw
-            guess = extract_valid_guess(raw, self.used, word_list)
-
-            # Debug logging
-            if not guess:
-                print(f"[WARNING] Could not extract valid guess from response: {raw[:100]}")
-                print(f"[WARNING] Used words: {self.used}")
-                print(f"[WARNING] Candidates available: {len(word_list)}")
-
-            if not guess:
-                pool = [w for w in word_list if w not in self.used]
-                guess = random.choice(pool) if pool else random.choice(word_list)
-
-            self.used.add(guess)
-            # Store latest trace/raw for the agent to log (agent can read from strategy if needed)
-            self.last_trace = shorten(cot_trace, 2000)
-            self.last_raw = shorten(raw, 2000)
-            return guess
+                response = limiter.call(lambda: client.chat.completions.create(**request), estimate_tokens(request))
+                return response_text(response)
+
+            raw = get_llm_cache().complete(
+                request, lambda: call_with_retry(api_call, tries=self.api_tries, base_delay=0.75),
+                self.sample_index)
+            return self._guess_from_response(raw, word_list)
+
+        except Exception as e:
+            return self._fallback_guess(word_list, e)
+
+    async def aget_guess(self, word_list, feedback_history=None):
+        """get_guess over the async client, so many games can wait on the API at once."""
+        try:
+            limiter = get_rate_limiter(self.model_name, self.api_base)
+            client = limiter.wrap_client(get_async_client(self.api_base))
+            prompt = self._prepare_prompt(word_list, feedback_history)
+            request = self._request_kwargs(prompt)
+
+            async def api_call():
+                response = await limiter.acall(lambda: client.chat.completions.create(**request),
+                                               estimate_tokens(request))
+                return response_text(response)
+
+            raw = await get_llm_cache().acomplete(
+                request, lambda: async_call_with_retry(api_call, tries=self.api_tries, base_delay=0.75),
+                self.sample_index)
+            return self._guess_from_response(raw, word_list)
 
         except Exception as e:
-            print(f"Error with {self.model_name}: {e}")
-            print(f"Error type: {type(e).__name__}")
+            return self._fallback_guess(word_list, e)
+
+    def _guess_from_response(self, raw, word_list):
+        raw = raw.strip()
+        # zero-shot has no explicit CoT; we still log raw response as "cot_trace" for parity
+        cot_trace = raw
+        guess = extract_valid_guess(raw, self.used, word_list)
+
+        # Debug logging
+        if not guess:
+            print(f"[WARNING] Could not extract valid guess from response: {raw[:100]}")
+            print(f"[WARNING] Used words: {self.used}")
+            print(f"[WARNING] Candidates available: {len(word_list)}")
+
+        if not guess:
             pool = [w for w in word_list if w not in self.used]
             guess = random.choice(pool) if pool else random.choice(word_list)
-            self.used.add(guess)
-            self.last_trace = f"[ERROR] {type(e).__name__}: {e}"
-            self.last_raw = self.last_trace
-            return guess
+
+        self.used.add(guess)
+        # Store latest trace/raw for the agent to log (agent can read from strategy if needed)
+        self.last_trace = shorten(cot_trace, 2000)
+        self.last_raw = shorten(raw, 2000)
+        return guess
+
+    def _fallback_guess(self, word_list, e):
+        print(f"Error with {self.model_name}: {e}")
+        print(f"Error type: {type(e).__name__}")
+        pool = [w for w in word_list if w not in self.used]
+        guess = random.choice(pool) if pool else random.choice(word_list)
+        self.used.add(guess)
+        self.last_trace = f"[ERROR] {type(e).__name__}: {e}"
+        self.last_raw = self.last_trace
+        return guess
 
     def update_belief(self, candidates, guess, feedback):
         """Filter candidates based on feedback (handles duplicate letters correctly)."""
@@ -362,37 +424,22 @@ class NavigatorUFStrategy(LLMStrategy):
         else:
             str_feedback = feedback
 
-        # Filter using consistency check (handles duplicates correctly)
-        return [word for word in candidates if self._is_consistent(word, guess, str_feedback)]
+        # Filter using the feedback matrix (handles duplicates correctly)
+        return get_feedback_matrix().filter_words(candidates, guess, str_feedback)
 
     def _is_consistent(self, word, guess, feedback):
         """Check if a word is consistent with the feedback from a guess."""
         return self._generate_feedback(word, guess) == feedback
 
     def _generate_feedback(self, target, guess):
-        """Generate feedback for a guess against a target word (handles duplicates)."""
-        feedback = ["-"] * 5
-        target_chars = list(target)
-        guess_chars = list(guess)
-
-        # Mark greens first
-        for i in range(5):
-            if guess_chars[i] == target_chars[i]:
-                feedback[i] = "G"
-                target_chars[i] = None
-                guess_chars[i] = None
-
-        # Mark yellows
-        for i in range(5):
-            if guess_chars[i] and guess_chars[i] in target_chars:
-                feedback[i] = "Y"
-                target_chars[target_chars.index(guess_chars[i])] = None
-
-        return feedback
+        """Look up feedback for a guess against a target word (handles duplicates)."""
+        return get_feedback_matrix().feedback(guess, target)
 
 
 class NavigatorUFCoTStrategy(NavigatorUFStrategy):
     """Chain-of-thought version for Navigator UF models with trace capture."""
+    max_tokens = 300
+    api_tries = 1
 
     def _construct_prompt(self, word_list, feedback_history):
         # Ask for visible reasoning that we can capture, then a single final guess.
@@ -474,62 +521,39 @@ class NavigatorUFCoTStrategy(NavigatorUFStrategy):
 
         return thinking, guess
 
-    def get_guess(self, word_list, feedback_history=None):
-        """
-        Call Navigator UF (OpenAI-compatible) endpoint, capture THINKING trace and FINAL guess.
-        """
-        try:
-            import openai
-            client = openai.OpenAI(
-                api_key=os.getenv("NAVIGATOR_UF_API_KEY"),
-                base_url=self.api_base
-            )
-
-            prompt = self._construct_prompt(word_list, feedback_history or [])
-
-            # Call API
-            resp = client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=self.temperature,
-                max_tokens=300,
-                timeout=30.0  # Add explicit timeout
-            )
-            
-            # Check if response has choices and content
-            if not resp.choices or len(resp.choices) == 0:
-                raise ValueError("API returned empty choices array")
-            
-            raw = (resp.choices[0].message.content or "").strip()
-
-            thinking, guess = self._parse_thinking_and_final(raw)
-            
-            # Store traces in the format expected by the evaluation code
-            self.last_trace = shorten(thinking, 2000)
-            self.last_raw = shorten(raw, 2000)
-
-            # Validate guess; fall back if invalid
-            guess = guess.upper()
-            if guess not in word_list:
-                print(f"[WARNING] Extracted guess '{guess}' not in candidates (size={len(word_list)})")
-                print(f"[WARNING] THINKING: {thinking[:200]}")
-                # Prefer a new word if we can (avoid repeats)
-                pool = list(word_list)
-                import random
-                guess = random.choice(pool) if pool else "CRANE"
-                print(f"[WARNING] Falling back to random guess: {guess}")
-
-            return guess
+    def _prepare_prompt(self, word_list, feedback_history):
+        return self._construct_prompt(word_list, feedback_history or [])
+
+    def _guess_from_response(self, raw, word_list):
+        """Capture THINKING trace and FINAL guess from a Navigator UF (OpenAI-compatible) response."""
+        raw = raw.strip()
+
+        thinking, guess = self._parse_thinking_and_final(raw)
+        
+        # Store traces in the format expected by the evaluation code
+        self.last_trace = shorten(thinking, 2000)
+        self.last_raw = shorten(raw, 2000)
+
+        # Validate guess; fall back if invalid
+        guess = guess.upper()
+        if guess not in word_list:
+            print(f"[WARNING] Extracted guess '{guess}' not in candidates (size={len(word_list)})")
+            print(f"[WARNING] THINKING: {thinking[:200]}")
+            # Prefer a new word if we can (avoid repeats)
+            pool = list(word_list)
+            guess = random.choice(pool) if pool else "CRANE"
+            print(f"[WARNING] Falling back to random guess: {guess}")
 
-        except Exception as e:
-            # On error, record trace as the error message for debugging
-            print(f"Error with {self.model_name}: {e}")
-            print(f"Error type: {type(e).__name__}")
-            error_msg = f"[ERROR] {type(e).__name__}: {e}"
-            self.last_trace = error_msg
-            self.last_raw = error_msg
-            import random
-            return random.choice(word_list)
+        return guess
+
+    def _fallback_guess(self, word_list, e):
+        # On error, record trace as the error message for debugging
+        print(f"Error with {self.model_name}: {e}")
+        print(f"Error type: {type(e).__name__}")
+        error_msg = f"[ERROR] {type(e).__name__}: {e}"
+        self.last_trace = error_msg
+        self.last_raw = error_msg
+        return random.choice(word_list)
 
 # ----------------- Word List + Test Set -----------------
 
@@ -565,16 +589,11 @@ def create_standardized_test_set(word_list, num_words=100, seed=42):
 def test_api_connection(model_name=None):
     """Test if the Navigator UF API is accessible."""
     try:
-        import openai
-
         # Test API with actual authenticated call
         api_endpoint = os.getenv("NAVIGATOR_API_ENDPOINT", "https://api.navigator.uf.edu/v1")
         print(f"Testing API connection to {api_endpoint}...")
 
-        client = openai.OpenAI(
-            api_key=os.getenv("NAVIGATOR_UF_API_KEY"),
-            base_url=api_endpoint
-        )
+        client = get_client(api_endpoint)
 
         # Use the actual model if provided, otherwise use a test model
         test_model = model_name if model_name else "mistral-7b-instruct"
@@ -597,12 +616,297 @@ def test_api_connection(model_name=None):
         error_type = type(e).__name__
         return False, f"API connection failed ({error_type}): {str(e)}"
 
-def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_games=100):
-    """Evaluate a single model on the test words and log CoT traces."""
+# ----------------- Game Loop -----------------
+
+def make_strategy(model_name, prompt_type):
+    """Navigator strategy for a prompting type."""
+    return NavigatorUFCoTStrategy(model_name) if prompt_type == "chain-of-thought" else NavigatorUFStrategy(model_name)
+
+
+class GameRun:
+    """Settings shared by every game of one model evaluation."""
+    def __init__(self, model_name, prompt_type, word_list, num_games, debug_dir=None):
+        self.model_name = model_name
+        self.prompt_type = prompt_type
+        self.word_list = word_list
+        self.num_games = num_games
+        self.debug_dir = debug_dir
+        # Wall-clock seconds of every guess request (LLM call included)
+        self.turn_latencies = []
+
+
+def start_game(run, game_id, strategy, target_word):
+    """Fresh environment and agent for one game."""
+    env = WordleEnv(run.word_list)
+    agent = GuessingAgent(run.word_list, strategy)
+    env.target_word = target_word
+    env.attempts = 0
+    env.done = False
+    agent.reset()
+    strategy.used.clear()
+    strategy.sample_index = game_id
+    return env, agent
+
+
+def record_turn(run, game_id, target_word, attempt, guess, env, agent, strategy,
+                remaining, game_feedback_history):
+    """Play a guess, compute its metrics and return (row, remaining candidates)."""
+    # Capture candidates BEFORE the guess
+    candidates_before = len(remaining)
+
+    feedback, reward = env.guess(guess)
+    agent.update(guess, feedback, reward)
+
+    # shrink candidates for next attempt
+    # Convert string feedback to integer feedback for filtering
+    int_feedback = [2 if f == "G" else 1 if f == "Y" else 0 for f in feedback]
+    remaining = filter_candidates_by_feedback(remaining, guess, int_feedback)
+    candidates_after = len(remaining)
+
+    # Calculate metrics
+    is_valid = is_valid_guess(guess, run.word_list)
+    is_error = False
+    reduction_rate = calculate_candidate_reduction_rate(candidates_before, candidates_after)
+    info_gain = calculate_information_gain(candidates_before, candidates_after)
+
+    # Check constraint violations (using history from BEFORE this guess)
+    violations = calculate_constraint_violations(guess, game_feedback_history, target_word)
+
+    # Update history for next iteration
+    game_feedback_history.append((guess, ''.join(feedback)))
+
+    # collect traces saved by the strategy
+    cot_trace = getattr(strategy, "last_trace", "")
+    raw_resp  = getattr(strategy, "last_raw", "")
+
+    # Add additional context to traces for better analysis
+    context_info = f"Game {game_id+1}/{run.num_games} | Target: {target_word} | Attempt {attempt+1}/6 | Candidates: {candidates_before}"
+    if cot_trace and not cot_trace.startswith("ERROR"):
+        cot_trace = f"{context_info}\n\n{cot_trace}"
+    if raw_resp and not raw_resp.startswith("ERROR"):
+        raw_resp = f"{context_info}\n\n{raw_resp}"
+
+    # Save raw response to debug folder if debug mode is enabled
+    if run.debug_dir and raw_resp:
+        debug_filename = f"{run.debug_dir}/game{game_id+1:03d}_attempt{attempt+1}_raw.txt"
+        with open(debug_filename, 'w') as f:
+            f.write(f"=== RAW RESPONSE DEBUG ===\n")
+            f.write(f"Game: {game_id+1}/{run.num_games}\n")
+            f.write(f"Target: {target_word}\n")
+            f.write(f"Attempt: {attempt+1}/6\n")
+            f.write(f"Guess: {guess}\n")
+            f.write(f"Feedback: {''.join(feedback)}\n")
+            f.write(f"Candidates before: {candidates_before}\n")
+            f.write(f"Candidates after: {candidates_after}\n")
+            f.write(f"Prompt type: {run.prompt_type}\n")
+            f.write(f"\n=== PROMPT SENT ===\n")
+            f.write(getattr(strategy, 'last_prompt', '[Prompt not available]'))
+            f.write(f"\n\n=== RAW RESPONSE ===\n")
+            f.write(raw_resp)
+            f.write(f"\n\n=== EXTRACTED COT TRACE ===\n")
+            f.write(cot_trace if cot_trace else "(none)")
+            f.write(f"\n\n=== CONSTRAINT VIOLATIONS ===\n")
+            f.write(f"Green violations: {violations['violated_green']}\n")
+            f.write(f"Yellow violations: {violations['violated_yellow']}\n")
+            f.write(f"Gray violations: {violations['violated_gray']}\n")
+            f.write(f"Total violations: {violations['violation_count']}\n")
+
+    # Get the prompt from the strategy if available
+    prompt_sent = getattr(strategy, 'last_prompt', '')
+
+    row_data = {
+        'game_id': game_id,
+        'target_word': target_word,
+        'model_name': run.model_name,
+        'prompt_type': run.prompt_type,
+        'attempt_number': attempt + 1,
+        'guess': guess,
+        'feedback': ''.join(feedback),  # feedback is already in G/Y/- format
+        'win': (guess == target_word),
+        'attempts_to_win': attempt + 1,
+        'timestamp': datetime.now().isoformat(),
+        'prompt': prompt_sent,
+        'cot_trace': cot_trace,
+        'raw_response': raw_resp,
+        # New metrics
+        'is_valid_word': is_valid,
+        'is_error': is_error,
+        'candidates_before': candidates_before,
+        'candidates_after': candidates_after,
+        'candidate_reduction_rate': f"{reduction_rate:.4f}",
+        'information_gain_bits': f"{info_gain:.4f}",
+        'violated_green_constraint': violations['violated_green'],
+        'violated_yellow_constraint': violations['violated_yellow'],
+        'violated_gray_constraint': violations['violated_gray'],
+        'total_constraint_violations': violations['violation_count']
+    }
+    return row_data, remaining
+
+
+def error_row(run, game_id, target_word, attempt, e, remaining):
+    """Row logged for a failed attempt so diagnostics are preserved."""
+    return {
+        'game_id': game_id,
+        'target_word': target_word,
+        'model_name': run.model_name,
+        'prompt_type': run.prompt_type,
+        'attempt_number': attempt + 1,
+        'guess': 'ERROR',
+        'feedback': 'ERROR',
+        'win': False,
+        'attempts_to_win': attempt + 1,
+        'timestamp': datetime.now().isoformat(),
+        'cot_trace': f"ERROR: {e}",
+        'raw_response': f"ERROR: {e}",
+        # Error metrics
+        'is_valid_word': False,
+        'is_error': True,
+        'candidates_before': len(remaining),
+        'candidates_after': len(remaining),
+        'candidate_reduction_rate': 0.0,
+        'information_gain_bits': 0.0,
+        'violated_green_constraint': False,
+        'violated_yellow_constraint': False,
+        'violated_gray_constraint': False,
+        'total_constraint_violations': 0
+    }
+
+
+def play_game(run, game_id, target_word, strategy, write_row):
+    """Play one game, writing each attempt's row as it happens. Returns (win, attempts_to_win)."""
+    env, agent = start_game(run, game_id, strategy, target_word)
+
+    # per-game working candidate list
+    remaining = list(run.word_list)
+    # Track feedback history for constraint violation checking
+    game_feedback_history = []
+
+    for attempt in range(6):
+        try:
+            start = time.perf_counter()
+            guess = agent.select_guess()
+            run.turn_latencies.append(time.perf_counter() - start)
+            row_data, remaining = record_turn(run, game_id, target_word, attempt, guess, env, agent,
+                                              strategy, remaining, game_feedback_history)
+        except Exception as e:
+            write_row(error_row(run, game_id, target_word, attempt, e, remaining))
+            # continue to next attempt (don't kill whole game on one hiccup)
+            continue
+        write_row(row_data)
+        if row_data['win']:
+            return True, attempt + 1
+
+    return False, 7
+
+
+async def play_game_async(run, game_id, target_word, strategy):
+    """play_game over the async client; rows are returned instead of written. Returns (rows, win, attempts_to_win)."""
+    env, agent = start_game(run, game_id, strategy, target_word)
+    remaining = list(run.word_list)
+    game_feedback_history = []
+    rows = []
+
+    for attempt in range(6):
+        try:
+            start = time.perf_counter()
+            guess = await agent.aselect_guess()
+            run.turn_latencies.append(time.perf_counter() - start)
+            row_data, remaining = record_turn(run, game_id, target_word, attempt, guess, env, agent,
+                                              strategy, remaining, game_feedback_history)
+        except Exception as e:
+            rows.append(error_row(run, game_id, target_word, attempt, e, remaining))
+            continue
+        rows.append(row_data)
+        if row_data['win']:
+            return rows, True, attempt + 1
+
+    return rows, False, 7
+
+
+async def play_games_concurrently(run, games, strategy_factory, concurrency, write_row, game_done):
+    """
+    Play (game_id, target_word) games with at most `concurrency` in flight, each with its own strategy.
+
+    Rows are written game by game in test-set order as soon as every earlier
+    game has finished, so the CSV layout matches the sequential run;
+    game_done(game_id, win, attempts_to_win) is called after each game's rows.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(game_id, target_word):
+        async with semaphore:
+            return await play_game_async(run, game_id, target_word, strategy_factory())
+
+    tasks = [(game_id, asyncio.create_task(run_one(game_id, target_word)))
+             for game_id, target_word in games]
+    for game_id, task in tasks:
+        rows, win, attempts_to_win = await task
+        for row_data in rows:
+            write_row(row_data)
+        game_done(game_id, win, attempts_to_win)
+
+
+def checkpoint_path(out_dir, model_name, prompt_type):
+    """Resume checkpoint of a model/prompt-type run (one per output directory)."""
+    return Path(out_dir) / 'checkpoints' / f"model_{model_name.replace('-', '_')}_{prompt_type}.json"
+
+
+def completed_summary(checkpoint: RunCheckpoint, model_name: str, prompt_type: str, num_games: int) -> dict:
+    """Win statistics of a finished run from its checkpoint (per-guess metrics need the CSV)."""
+    outcomes = list(checkpoint.completed.values())
+    wins = sum(1 for win, _ in outcomes if win)
+    total_attempts = sum(attempts for win, attempts in outcomes if win)
+    return {
+        'model_name': model_name,
+        'prompt_type': prompt_type,
+        'total_games': num_games,
+        'wins': wins,
+        'win_rate': wins / num_games if num_games else 0,
+        'avg_attempts_when_won': total_attempts / wins if wins > 0 else 7,
+        'csv_file': checkpoint.outputs['csv'],
+    }
+
+
+def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_games=100, resume=False):
+    """
+    Evaluate a single model on the test words and log CoT traces.
+
+    Every finished game is checkpointed; with resume=True an interrupted run of
+    the same model, prompt type and test words continues at its first
+    unfinished game and appends to the same CSV.
+    """
     print(f"Evaluating {model_name} with {prompt_type} prompting...")
 
+    # Set output directory (default to results/llms/)
+    default_out_dir = str(Path(__file__).parent.parent / 'results' / 'llms')
+    out_dir = os.getenv('OUT_DIR', default_out_dir)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    checkpoint_config = {'model_name': model_name, 'prompt_type': prompt_type, 'test_words': list(test_words)}
+    checkpoint = None
+    if resume:
+        checkpoint = RunCheckpoint.load(checkpoint_path(out_dir, model_name, prompt_type), checkpoint_config)
+        if checkpoint is None:
+            print("No checkpoint for this run, starting from the first game")
+        elif checkpoint.complete:
+            print(f"Run already complete: {checkpoint.outputs['csv']}")
+            try:
+                with open(checkpoint.outputs['summary'], 'r') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                # Outputs were moved after the run finished; the checkpoint still has every game's outcome
+                return completed_summary(checkpoint, model_name, prompt_type, len(test_words))
+        else:
+            print(f"Resuming after {len(checkpoint.completed)}/{len(test_words)} completed games: "
+                  f"{checkpoint.outputs['csv']}")
+
     # Test API connection first - warn if it fails but continue
-    api_ok, api_msg = test_api_connection(model_name)
+    llm_cache = get_llm_cache()
+    if llm_cache.mode == 'replay':
+        api_ok, api_msg = True, "replaying cached responses"
+        print(f"Replaying cached responses from {llm_cache.path} (no API calls)\n")
+    else:
+        api_ok, api_msg = test_api_connection(model_name)
     if not api_ok:
         print(f"\n⚠️  API CONNECTION WARNING: {api_msg}")
         print("Continuing anyway - will attempt to use API during evaluation...")
@@ -615,30 +919,28 @@ def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_ga
             print("3. Ensure you have network access to the API endpoint")
             print("4. Run diagnose_api_issues.py for detailed diagnostics")
             raise RuntimeError(f"API connection test failed: {api_msg}")
-    else:
+    elif llm_cache.mode != 'replay':
         print(f"✓ API connection test passed\n")
 
+    # A resumed run keeps the original timestamp, so it appends to the same files
+    if checkpoint is not None:
+        timestamp = checkpoint.outputs['timestamp']
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
     # Set up debug mode for saving raw responses
     debug_mode = os.getenv('DEBUG_RESPONSES', '0') == '1'
     debug_dir = None
     if debug_mode:
-        default_out_dir = str(Path(__file__).parent.parent / 'results' / 'llms')
-        out_dir = os.getenv('OUT_DIR', default_out_dir)
-        Path(out_dir).mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         debug_dir = f"{out_dir}/debug_responses/{model_name.replace('-', '_')}_{prompt_type}_{timestamp}"
         os.makedirs(debug_dir, exist_ok=True)
         print(f"🔍 DEBUG MODE: Saving raw responses to {debug_dir}\n")
 
     # choose strategy (Navigator API)
-    strategy = NavigatorUFCoTStrategy(model_name) if prompt_type == "chain-of-thought" else NavigatorUFStrategy(model_name)
+    strategy = make_strategy(model_name, prompt_type)
 
-    # Set output directory (default to results/llms/)
-    default_out_dir = str(Path(__file__).parent.parent / 'results' / 'llms')
-    out_dir = os.getenv('OUT_DIR', default_out_dir)
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     individual_csv = f"{out_dir}/model_{model_name.replace('-', '_')}_{prompt_type}_{timestamp}.csv"
+    summary_filename = f"{out_dir}/summary_{model_name.replace('-', '_')}_{prompt_type}_{timestamp}.json"
 
     headers = [
         'game_id', 'target_word', 'model_name', 'prompt_type', 'attempt_number',
@@ -650,170 +952,52 @@ def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_ga
         'violated_green_constraint', 'violated_yellow_constraint',
         'violated_gray_constraint', 'total_constraint_violations'
     ]
-    with open(individual_csv, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader()
+    if checkpoint is not None:
+        # Drop rows of the game that was interrupted, then continue where it stopped
+        checkpoint.restore_outputs()
+        checkpoint.restore_rng()
+        sink = open_sink(individual_csv, headers, format='csv', append=True)
+    else:
+        sink = open_sink(individual_csv, headers, format='csv')
+        checkpoint = RunCheckpoint(checkpoint_path(out_dir, model_name, prompt_type), checkpoint_config,
+                                   {'csv': individual_csv, 'summary': summary_filename, 'timestamp': timestamp})
+        sink.sync()
+        checkpoint.save()
+
+    run = GameRun(model_name, prompt_type, word_list, len(test_words), debug_dir)
+
+    # Rows are buffered in the sink and synced to disk at every checkpoint
+    write_row = sink.write
+
+    def game_done(game_id, win, attempts_to_win):
+        sink.sync()
+        checkpoint.record_game(game_id, [win, attempts_to_win])
+
+    # Games already finished by an interrupted run are skipped
+    pending = [(game_id, target_word) for game_id, target_word in enumerate(test_words)
+               if game_id not in checkpoint.completed]
+
+    # CONCURRENCY > 1 plays that many games at once over the async client
+    concurrency = int(os.getenv('CONCURRENCY', '1'))
+    play_start = time.perf_counter()
+    with sink:
+        if concurrency > 1:
+            print(f"Playing up to {concurrency} games concurrently")
+            asyncio.run(play_games_concurrently(
+                run, pending, lambda: make_strategy(model_name, prompt_type), concurrency, write_row, game_done))
+        else:
+            for game_id, target_word in pending:
+                game_done(game_id, *play_game(run, game_id, target_word, strategy, write_row))
+    play_seconds = time.perf_counter() - play_start
 
     results = []
     wins = 0
     total_attempts = 0
-
-    # fixed number of games equals number of test_words provided
     for game_id, target_word in enumerate(test_words):
-        env = WordleEnv(word_list)
-        agent = GuessingAgent(word_list, strategy)
-        env.target_word = target_word
-        env.attempts = 0
-        env.done = False
-        agent.reset()
-        strategy.used.clear()
-
-        # per-game working candidate list
-        remaining = list(word_list)
-        # Track feedback history for constraint violation checking
-        game_feedback_history = []
-
-        win = False
-        attempts_to_win = 0
-        for attempt in range(6):
-            try:
-                # Capture candidates BEFORE the guess
-                candidates_before = len(remaining)
-
-                guess = agent.select_guess()
-                feedback, reward = env.guess(guess)
-                agent.update(guess, feedback, reward)
-
-                # shrink candidates for next attempt
-                # Convert string feedback to integer feedback for filtering
-                int_feedback = [2 if f == "G" else 1 if f == "Y" else 0 for f in feedback]
-                remaining = filter_candidates_by_feedback(remaining, guess, int_feedback)
-                candidates_after = len(remaining)
-
-                # Calculate metrics
-                is_valid = is_valid_guess(guess, word_list)
-                is_error = False
-                reduction_rate = calculate_candidate_reduction_rate(candidates_before, candidates_after)
-                info_gain = calculate_information_gain(candidates_before, candidates_after)
-
-                # Check constraint violations (using history from BEFORE this guess)
-                violations = calculate_constraint_violations(guess, game_feedback_history, target_word)
-
-                # Update history for next iteration
-                game_feedback_history.append((guess, ''.join(feedback)))
-
-                # collect traces saved by the strategy
-                cot_trace = getattr(strategy, "last_trace", "")
-                raw_resp  = getattr(strategy, "last_raw", "")
-
-                # Add additional context to traces for better analysis
-                context_info = f"Game {game_id+1}/{len(test_words)} | Target: {target_word} | Attempt {attempt+1}/6 | Candidates: {candidates_before}"
-                if cot_trace and not cot_trace.startswith("ERROR"):
-                    cot_trace = f"{context_info}\n\n{cot_trace}"
-                if raw_resp and not raw_resp.startswith("ERROR"):
-                    raw_resp = f"{context_info}\n\n{raw_resp}"
-
-                # Save raw response to debug folder if debug mode is enabled
-                if debug_mode and debug_dir and raw_resp:
-                    debug_filename = f"{debug_dir}/game{game_id+1:03d}_attempt{attempt+1}_raw.txt"
-                    with open(debug_filename, 'w') as f:
-                        f.write(f"=== RAW RESPONSE DEBUG ===\n")
-                        f.write(f"Game: {game_id+1}/{len(test_words)}\n")
-                        f.write(f"Target: {target_word}\n")
-                        f.write(f"Attempt: {attempt+1}/6\n")
-                        f.write(f"Guess: {guess}\n")
-                        f.write(f"Feedback: {''.join(feedback)}\n")
-                        f.write(f"Candidates before: {candidates_before}\n")
-                        f.write(f"Candidates after: {candidates_after}\n")
-                        f.write(f"Prompt type: {prompt_type}\n")
-                        f.write(f"\n=== PROMPT SENT ===\n")
-                        f.write(getattr(strategy, 'last_prompt', '[Prompt not available]'))
-                        f.write(f"\n\n=== RAW RESPONSE ===\n")
-                        f.write(raw_resp)
-                        f.write(f"\n\n=== EXTRACTED COT TRACE ===\n")
-                        f.write(cot_trace if cot_trace else "(none)")
-                        f.write(f"\n\n=== CONSTRAINT VIOLATIONS ===\n")
-                        f.write(f"Green violations: {violations['violated_green']}\n")
-                        f.write(f"Yellow violations: {violations['violated_yellow']}\n")
-                        f.write(f"Gray violations: {violations['violated_gray']}\n")
-                        f.write(f"Total violations: {violations['violation_count']}\n")
-
-                # Get the prompt from the strategy if available
-                prompt_sent = getattr(strategy, 'last_prompt', '')
-
-                row_data = {
-                    'game_id': game_id,
-                    'target_word': target_word,
-                    'model_name': model_name,
-                    'prompt_type': prompt_type,
-                    'attempt_number': attempt + 1,
-                    'guess': guess,
-                    'feedback': ''.join(feedback),  # feedback is already in G/Y/- format
-                    'win': (guess == target_word),
-                    'attempts_to_win': attempt + 1,
-                    'timestamp': datetime.now().isoformat(),
-                    'prompt': prompt_sent,
-                    'cot_trace': cot_trace,
-                    'raw_response': raw_resp,
-                    # New metrics
-                    'is_valid_word': is_valid,
-                    'is_error': is_error,
-                    'candidates_before': candidates_before,
-                    'candidates_after': candidates_after,
-                    'candidate_reduction_rate': f"{reduction_rate:.4f}",
-                    'information_gain_bits': f"{info_gain:.4f}",
-                    'violated_green_constraint': violations['violated_green'],
-                    'violated_yellow_constraint': violations['violated_yellow'],
-                    'violated_gray_constraint': violations['violated_gray'],
-                    'total_constraint_violations': violations['violation_count']
-                }
-                with open(individual_csv, 'a', newline='') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=headers)
-                    writer.writerow(row_data)
-
-                if guess == target_word:
-                    win = True
-                    attempts_to_win = attempt + 1
-                    wins += 1
-                    total_attempts += attempts_to_win
-                    break
-
-            except Exception as e:
-                # log an error row so diagnostics are preserved
-                row_data = {
-                    'game_id': game_id,
-                    'target_word': target_word,
-                    'model_name': model_name,
-                    'prompt_type': prompt_type,
-                    'attempt_number': attempt + 1,
-                    'guess': 'ERROR',
-                    'feedback': 'ERROR',
-                    'win': False,
-                    'attempts_to_win': attempt + 1,
-                    'timestamp': datetime.now().isoformat(),
-                    'cot_trace': f"ERROR: {e}",
-                    'raw_response': f"ERROR: {e}",
-                    # Error metrics
-                    'is_valid_word': False,
-                    'is_error': True,
-                    'candidates_before': len(remaining) if 'remaining' in locals() else 0,
-                    'candidates_after': len(remaining) if 'remaining' in locals() else 0,
-                    'candidate_reduction_rate': 0.0,
-                    'information_gain_bits': 0.0,
-                    'violated_green_constraint': False,
-                    'violated_yellow_constraint': False,
-                    'violated_gray_constraint': False,
-                    'total_constraint_violations': 0
-                }
-                with open(individual_csv, 'a', newline='') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=headers)
-                    writer.writerow(row_data)
-                # continue to next attempt (don't kill whole game on one hiccup)
-                continue
-
-        if not win:
-            attempts_to_win = 7
-
+        win, attempts_to_win = checkpoint.completed[game_id]
+        if win:
+            wins += 1
+            total_attempts += attempts_to_win
         results.append({
             'game_id': game_id,
             'target_word': target_word,
@@ -867,17 +1051,32 @@ def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_ga
         'total_constraint_violations': total_violations,
         'avg_constraint_violations_per_guess': avg_violations_per_guess,
         'avg_information_gain_bits': avg_info_gain,
-        'avg_candidate_reduction_rate': avg_reduction_rate
+        'avg_candidate_reduction_rate': avg_reduction_rate,
+        # Throughput of the evaluation run itself
+        'games_per_sec': len(pending) / play_seconds if play_seconds > 0 else 0.0,
+        'turn_latency_p50_s': float(np.percentile(run.turn_latencies, 50)) if run.turn_latencies else 0.0,
+        'turn_latency_p99_s': float(np.percentile(run.turn_latencies, 99)) if run.turn_latencies else 0.0
     }
-    summary_filename = f"{out_dir}/summary_{model_name.replace('-', '_')}_{prompt_type}_{timestamp}.json"
+    # Typed columnar copy for the analysis scripts (RESULT_COLUMNAR=parquet|arrow)
+    if columnar_format():
+        summary['columnar_file'] = str(write_columnar(individual_csv, columnar_format()))
     with open(summary_filename, 'w') as f:
         json.dump(summary, f, indent=2)
+    checkpoint.mark_complete()
+    get_results_catalog().register(individual_csv)
 
     print(f"Win rate: {win_rate:.2%} | Avg attempts (wins): {avg_attempts:.2f}")
     print(f"Valid guess rate: {valid_guess_rate:.2%} | Avg info gain: {avg_info_gain:.3f} bits")
     print(f"Avg constraint violations: {avg_violations_per_guess:.3f} | Errors: {total_errors}")
+    print(f"Throughput: {summary['games_per_sec']:.2f} games/sec | Turn latency p50 "
+          f"{summary['turn_latency_p50_s']:.3f}s, p99 {summary['turn_latency_p99_s']:.3f}s")
     print(f"Results: {individual_csv}")
     print(f"Summary: {summary_filename}")
+    if llm_cache.mode != 'off':
+        print(f"LLM cache ({llm_cache.mode}): {llm_cache.stats()}")
+    limiter = get_rate_limiter(model_name, strategy.api_base)
+    if limiter.enabled:
+        print(f"Rate limiter: {limiter.stats()}")
 
     return summary
 
@@ -885,6 +1084,11 @@ def evaluate_single_model(model_name, prompt_type, word_list, test_words, num_ga
 # ----------------- Main -----------------
 
 def main():
+    parser = argparse.ArgumentParser(description='Evaluate one LLM (MODEL/PROMPT_TYPE environment variables) on the canonical test set.')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run from its checkpoint instead of starting over')
+    args = parser.parse_args()
+
     # Validate environment variables
     model_name = os.getenv('MODEL')
     prompt_type = os.getenv('PROMPT_TYPE')
@@ -945,7 +1149,7 @@ def main():
 
     start = time.time()
     try:
-        evaluate_single_model(model_name, prompt_type, word_list, test_words)
+        evaluate_single_model(model_name, prompt_type, word_list, test_words, resume=args.resume)
         elapsed = time.time() - start
         print(f"\n✅ Evaluation completed successfully in {elapsed:.2f} seconds")
         return 0
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Local mock of an OpenAI-compatible chat-completions endpoint.
+
+Stands in for the Navigator endpoint so llm_evaluation.py and the hybrid
+runners can be load-tested offline:
+
+    python3 mock_llm_server.py --port 8000 --latency lognormal:0.8,0.5 --rate-limit-rate 0.05
+    export NAVIGATOR_API_ENDPOINT='http://127.0.0.1:8000/v1'
+    export NAVIGATOR_UF_API_KEY='mock'
+    CONCURRENCY=16 MODEL=mock PROMPT_TYPE=zero-shot python3 llm_evaluation.py
+
+Responders pick the word to answer with:
+    random   a random word from the prompt's candidate list
+    css      the CSS strategy's guess for the feedback history in the prompt
+    replay   the logged raw_response for the same prompt, from llm_evaluation CSVs
+             (--replay FILE ...); prompts not in the logs fall back to random
+
+Replies follow the prompt's format: "THINKING: ...\\nFINAL: WORD" when the prompt
+asks for a FINAL line, otherwise just the word.
+"""
+
+import argparse
+import csv
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'algorithms'))
+
+from feedback_matrix import get_feedback_matrix, encode_feedback
+
+csv.field_size_limit(sys.maxsize)
+
+HISTORY_PATTERNS = [
+    # llm_evaluation / hybrid CoT prompts: "Guess: CRANE, Feedback: G-Y--"
+    re.compile(r'Guess:\s*([A-Za-z]{5}),?\s+Feedback:\s*([GY\-]{5})'),
+    # hybrid zero-shot prompt: "CRANE: 🟩⬜🟨⬜⬜"
+    re.compile(r'^([A-Z]{5}):\s*([🟩🟨⬜]{5})\s*$', re.MULTILINE),
+]
+EMOJI_FEEDBACK = {'🟩': 'G', '🟨': 'Y', '⬜': '-'}
+# Context prefix llm_evaluation adds to the logged raw_response
+LOG_CONTEXT_PREFIX = re.compile(r'^Game \d+/\d+ \|.*?\n\n', re.DOTALL)
+
+
+# ----------------- Latency -----------------
+
+def parse_latency(spec: str):
+    """
+    Latency distribution from a spec string; returns a function rng -> seconds.
+
+    fixed:S | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA
+    """
+    kind, _, params = spec.partition(':')
+    values = [float(v) for v in params.split(',')] if params else []
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'normal' and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == 'lognormal' and len(values) == 2:
+        import math
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+# ----------------- Responders -----------------
+
+def prompt_candidates(prompt: str):
+    """Candidate words listed in the prompt (falls back to any 5-letter uppercase word)."""
+    m = re.search(r'(?:Candidate words|Remaining possible words[^:]*):\s*(.*)', prompt)
+    words = re.findall(r'\b[A-Z]{5}\b', m.group(1)) if m else []
+    return words or re.findall(r'\b[A-Z]{5}\b', prompt)
+
+
+def prompt_history(prompt: str):
+    """(guess, feedback) pairs shown in the prompt, feedback as a G/Y/- string."""
+    for pattern in HISTORY_PATTERNS:
+        pairs = pattern.findall(prompt)
+        if pairs:
+            return [(g.upper(), ''.join(EMOJI_FEEDBACK.get(c, c) for c in fb)) for g, fb in pairs]
+    return []
+
+
+# A responder is called as responder(prompt, rng) and returns the reply text.
+
+class RandomResponder:
+    """Answers with a random candidate from the prompt."""
+
+    def __init__(self):
+        self.words = get_feedback_matrix().words
+
+    def __call__(self, prompt, rng):
+        candidates = prompt_candidates(prompt)
+        return format_reply(prompt, rng.choice(candidates) if candidates else rng.choice(self.words))
+
+
+class CSSResponder:
+    """Answers with the CSS strategy's guess for the feedback history in the prompt."""
+
+    def __init__(self):
+        self.feedback_matrix = get_feedback_matrix()
+        self.vocab = self.feedback_matrix.vocab
+        self.fallback = RandomResponder()
+
+    def __call__(self, prompt, rng):
+        from css_strategy import CSSStrategy
+
+        candidate_ids = self.vocab.all_ids
+        history = []
+        for guess, feedback in prompt_history(prompt):
+            guess_id = self.vocab.word_id(guess)
+            if guess_id is None:
+                continue
+            pattern = encode_feedback(feedback)
+            candidate_ids = self.feedback_matrix.filter_ids(candidate_ids, guess_id, pattern)
+            history.append((guess_id, pattern))
+        guess_id = CSSStrategy(self.feedback_matrix, rng=rng).select_guess_ids(candidate_ids, history)
+        if guess_id is None:
+            return self.fallback(prompt, rng)
+        return format_reply(prompt, self.vocab.word(guess_id))
+
+
+class ReplayResponder:
+    """Replays logged raw responses for identical prompts (cycling through repeats)."""
+
+    def __init__(self, paths):
+        self.responses = defaultdict(list)
+        for path in paths:
+            with open(path, 'r', newline='') as f:
+                for row in csv.DictReader(f):
+                    prompt, raw = row.get('prompt'), row.get('raw_response', '')
+                    if not prompt or not raw or raw.startswith('ERROR') or raw.startswith('[ERROR]'):
+                        continue
+                    self.responses[prompt].append(LOG_CONTEXT_PREFIX.sub('', raw, count=1))
+        self.served = defaultdict(int)
+        self.lock = threading.Lock()
+        self.fallback = RandomResponder()
+
+    def __call__(self, prompt, rng):
+        logged = self.responses.get(prompt)
+        if not logged:
+            return self.fallback(prompt, rng)
+        with self.lock:
+            i = self.served[prompt]
+            self.served[prompt] += 1
+        return logged[i % len(logged)]
+
+
+def format_reply(prompt: str, word: str) -> str:
+    """Reply in the format the prompt asks for."""
+    if 'FINAL' in prompt:
+        return f"THINKING: Mock reasoning over the remaining candidates.\nFINAL: {word}"
+    return word
+
+
+# ----------------- Server -----------------
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, responder, latency, error_rate=0.0, rate_limit_rate=0.0,
+                 retry_after=1.0, seed=None):
+        super().__init__(address, MockLLMHandler)
+        self.responder = responder
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.counts = defaultdict(int)
+
+    def draw(self, fn):
+        """Call fn(rng) under the shared RNG lock."""
+        with self.rng_lock:
+            return fn(self.rng)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'mock', 'object': 'model'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+            return
+
+        delay, roll, seed = server.draw(lambda rng: (server.latency(rng), rng.random(), rng.getrandbits(64)))
+        time.sleep(delay)
+
+        if roll < server.rate_limit_rate:
+            server.counts['429'] += 1
+            self._send_json(429, {'error': {'message': 'Rate limit exceeded (mock)', 'type': 'rate_limit_error'}},
+                            {'Retry-After': f"{server.retry_after:g}"})
+            return
+        if roll < server.rate_limit_rate + server.error_rate:
+            server.counts['500'] += 1
+            self._send_json(500, {'error': {'message': 'Injected server error (mock)', 'type': 'server_error'}})
+            return
+
+        messages = request.get('messages') or [{}]
+        prompt = messages[-1].get('content', '')
+        # Per-request RNG so slow responders do not hold the shared lock
+        text = server.responder(prompt, random.Random(seed))
+        server.counts['200'] += 1
+
+        self._send_json(200, {
+            'id': f"chatcmpl-mock-{sum(server.counts.values())}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': text}}],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(text) // 4,
+                      'total_tokens': (len(prompt) + len(text)) // 4},
+        })
+
+
+def make_responder(name, replay_paths=None):
+    if name == 'random':
+        return RandomResponder()
+    if name == 'css':
+        return CSSResponder()
+    if name == 'replay':
+        if not replay_paths:
+            raise ValueError("The replay responder needs --replay CSV files")
+        return ReplayResponder(replay_paths)
+    raise ValueError(f"Unknown responder: {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock OpenAI-compatible chat-completions server for load testing.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--responder', choices=['random', 'css', 'replay'], default='random')
+    parser.add_argument('--replay', nargs='+', metavar='CSV',
+                        help='llm_evaluation result CSVs to replay (responder=replay)')
+    parser.add_argument('--latency', default='fixed:0.05',
+                        help='fixed:S, uniform:LO,HI, normal:MEAN,SD or lognormal:MEDIAN,SIGMA (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockLLMServer((args.host, args.port), make_responder(args.responder, args.replay),
+                           parse_latency(args.latency), args.error_rate, args.rate_limit_rate,
+                           args.retry_after, args.seed)
+    print(f"Mock LLM server ({args.responder} responder, latency {args.latency}) on "
+          f"http://{args.host}:{server.server_port}/v1")
+    print(f"export NAVIGATOR_API_ENDPOINT='http://{args.host}:{server.server_port}/v1'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Responses served: {dict(server.counts)}")
+
+
+if __name__ == '__main__':
+    main()
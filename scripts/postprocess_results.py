@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Single-pass post-processing of algorithm and hybrid results.
+
+calculate_candidates.py and calculate_constraint_violations.py each reload a
+results CSV and replay every game with df.iterrows(). This script streams the
+CSV once, replays each game once and writes every per-round metric together
+to `<stem>_with_metrics.csv`:
+
+    candidates_before_N, candidates_after_N, reduction_rate_N
+    information_gain_N     bits, log2(before) - log2(max(after, 1))
+    violated_green_N, violated_yellow_N, violated_gray_N, total_violations_N
+    hamming_N, levenshtein_N   guess vs target
+
+Candidate sets are word-ID arrays filtered with the feedback matrix. Violations
+use the ConstraintTracker of calculate_constraint_violations.py, so the
+columns match the separate scripts' outputs. Outputs are derived
+incrementally (see derived_results.py).
+
+    python3 scripts/postprocess_results.py                 # algorithm + stage3 hybrids
+    python3 scripts/postprocess_results.py PATH ... [--force]
+"""
+
+import argparse
+import csv
+import sys
+from math import log2
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from tqdm import tqdm
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'engines'))
+
+import calculate_constraint_violations
+from calculate_constraint_violations import ConstraintTracker
+from derived_results import Derivation, source_version
+from feedback_matrix import FeedbackMatrix, compute_pattern, encode_feedback, get_feedback_matrix
+from result_sink import CSVSink
+
+MAX_ROUNDS = 6
+ALGORITHM_INPUT = "results/algorithms/raw data/algorithm_results_20251211_175156.csv"
+ALGORITHM_OUTPUT = "results/algorithms/raw data/algorithm_results_with_metrics.csv"
+HYBRID_DIRS = ["results/hybrids/stage3/raw data", "results/hybrids/stage3-cot/raw data"]
+
+
+def metric_columns(round_num: int) -> List[str]:
+    n = round_num
+    return [f'candidates_before_{n}', f'candidates_after_{n}', f'reduction_rate_{n}', f'information_gain_{n}',
+            f'violated_green_{n}', f'violated_yellow_{n}', f'violated_gray_{n}', f'total_violations_{n}',
+            f'hamming_{n}', f'levenshtein_{n}']
+
+
+def hamming_distance(word1: str, word2: str) -> int:
+    return sum(c1 != c2 for c1, c2 in zip(word1, word2))
+
+
+def levenshtein_distance(word1: str, word2: str) -> int:
+    if len(word1) < len(word2):
+        return levenshtein_distance(word2, word1)
+    previous_row = list(range(len(word2) + 1))
+    for i, c1 in enumerate(word1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(word2):
+            current_row.append(min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def information_gain(candidates_before: int, candidates_after: int) -> float:
+    """Entropy reduction in bits (same definition as llm_evaluation.py)."""
+    if candidates_before <= 0:
+        return 0.0
+    return max(0.0, log2(candidates_before) - log2(max(candidates_after, 1)))
+
+
+def filter_candidate_ids(feedback_matrix: FeedbackMatrix, candidate_ids: np.ndarray,
+                         guess: str, feedback: str) -> np.ndarray:
+    """Candidate IDs consistent with a guess and its feedback string (none if the feedback is malformed)."""
+    if len(feedback) != 5 or not set(feedback) <= set('GY-'):
+        return candidate_ids[:0]
+    pattern = encode_feedback(feedback)
+    guess_id = feedback_matrix.index.get(guess)
+    if guess_id is None:
+        words = feedback_matrix.words
+        row = np.array([compute_pattern(guess, words[i]) for i in candidate_ids], dtype=np.int64)
+        return candidate_ids[row == pattern]
+    return feedback_matrix.filter_ids(candidate_ids, guess_id, pattern)
+
+
+def replay_game(row: Dict[str, str], feedback_matrix: FeedbackMatrix) -> Dict[str, object]:
+    """
+    Metrics for every round of one game row.
+
+    Rounds that were not played keep empty candidate/distance cells and zero
+    violations, as in the separate scripts; round 1 cannot violate anything.
+    """
+    metrics = {}
+    for round_num in range(1, MAX_ROUNDS + 1):
+        metrics.update(dict.fromkeys(metric_columns(round_num), ''))
+        for kind in ('violated_green', 'violated_yellow', 'violated_gray', 'total_violations'):
+            metrics[f'{kind}_{round_num}'] = 0
+
+    target = row.get('target_word') or ''
+    candidate_ids = np.arange(len(feedback_matrix), dtype=np.int64)
+    tracker = ConstraintTracker()
+    for round_num in range(1, MAX_ROUNDS + 1):
+        guess = row.get(f'guess_{round_num}') or ''
+        if not guess:
+            break
+        feedback = row.get(f'feedback_{round_num}') or ''
+
+        candidates_before = len(candidate_ids)
+        candidate_ids = filter_candidate_ids(feedback_matrix, candidate_ids, guess, feedback)
+        candidates_after = len(candidate_ids)
+        metrics[f'candidates_before_{round_num}'] = candidates_before
+        metrics[f'candidates_after_{round_num}'] = candidates_after
+        metrics[f'reduction_rate_{round_num}'] = (
+            (candidates_before - candidates_after) / candidates_before * 100 if candidates_before > 0 else 0.0)
+        metrics[f'information_gain_{round_num}'] = information_gain(candidates_before, candidates_after)
+
+        # Violations are checked against the feedback of earlier rounds only
+        if round_num > 1:
+            violations = tracker.check_violations(guess)
+            metrics[f'violated_green_{round_num}'] = violations['violated_green_constraint']
+            metrics[f'violated_yellow_{round_num}'] = violations['violated_yellow_constraint']
+            metrics[f'violated_gray_{round_num}'] = violations['violated_gray_constraint']
+            metrics[f'total_violations_{round_num}'] = violations['total_constraint_violations']
+        tracker.add_feedback(guess, feedback)
+
+        if target:
+            metrics[f'hamming_{round_num}'] = hamming_distance(guess, target)
+            metrics[f'levenshtein_{round_num}'] = levenshtein_distance(guess, target)
+    return metrics
+
+
+def postprocess_file(input_file: str, output_file: str) -> int:
+    """Stream a wide results CSV into its metrics file; returns the number of games."""
+    print(f"\nProcessing: {input_file}")
+    feedback_matrix = get_feedback_matrix()
+    with open(input_file, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        # Existing columns (e.g. hamming_N) are overwritten in place, new ones appended
+        fieldnames = list(reader.fieldnames or [])
+        for round_num in range(1, MAX_ROUNDS + 1):
+            fieldnames += [c for c in metric_columns(round_num) if c not in fieldnames]
+        games = 0
+        with CSVSink(output_file, fieldnames) as sink:
+            for row in tqdm(reader, desc="Games"):
+                row.update(replay_game(row, feedback_matrix))
+                sink.write(row)
+                games += 1
+    print(f"Saved to: {output_file}")
+    return games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Add candidate, violation and distance metrics to results in one pass.')
+    parser.add_argument('paths', nargs='*',
+                        help='results CSVs or directories (default: the algorithm run and the stage3 hybrids)')
+    parser.add_argument('--force', action='store_true', help='recompute outputs that are already up to date')
+    args = parser.parse_args(argv)
+
+    # Outputs depend on this script, the violation rules and the word list
+    version = source_version(__file__, calculate_constraint_violations.__file__, "wordlist/wordlist.txt")
+    derivation = Derivation('metrics', postprocess_file, version)
+
+    if not args.paths:
+        if Path(ALGORITHM_INPUT).exists():
+            if not derivation.derive(ALGORITHM_INPUT, ALGORITHM_OUTPUT, force=args.force):
+                print(f"\nUp to date: {ALGORITHM_OUTPUT}")
+        else:
+            print(f"Warning: {ALGORITHM_INPUT} not found")
+    for path in args.paths or HYBRID_DIRS:
+        if Path(path).is_dir():
+            computed, current = derivation.derive_directory(path, force=args.force)
+            print(f"\n{path}: {computed} processed, {current} up to date")
+        elif Path(path).exists():
+            if not derivation.derive(path, force=args.force):
+                print(f"\nUp to date: {derivation.output_path(path)}")
+        else:
+            print(f"Warning: {path} not found")
+
+    print("\n✓ All processing complete!")
+
+
+if __name__ == "__main__":
+    main()
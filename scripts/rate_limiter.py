@@ -0,0 +1,266 @@
+"""
+Token-bucket rate limiting for LLM API calls, shared across workers.
+
+One limiter per (endpoint, model) enforces a request rate and a token rate.
+Its bucket state lives in a small file guarded by an exclusive file lock.
+Threads, asyncio tasks and separate worker processes on one machine all draw
+from the same budget. Callers reserve capacity and then sleep until their
+reservation is due, so waiting requests are served in arrival order.
+
+The rate adapts AIMD-style. A 429 halves it and pauses every caller for the
+Retry-After period. Each successful call then adds back a small step, up to
+the configured maximum, so a sweep settles just below the endpoint's real limit.
+
+Configured from the environment (limits are per model; unset = unlimited):
+    LLM_RATE_LIMIT_RPS   max requests per second
+    LLM_RATE_LIMIT_TPM   max tokens per minute (prompt estimate + max_tokens)
+    LLM_RATE_LIMIT_DIR   directory for the shared state files
+                         (default: <tmp>/wordle_llm_rate_limits)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # no cross-process coordination (e.g. Windows); threads/tasks still share
+    fcntl = None
+
+DEFAULT_STATE_DIR = Path(tempfile.gettempdir()) / 'wordle_llm_rate_limits'
+MIN_SCALE = 0.05        # never slow below 5% of the configured rate
+INCREASE_STEP = 0.02    # additive recovery per successful call
+DEFAULT_RETRY_AFTER = 1.0
+STALE_STATE_SECONDS = 300.0
+
+_limiters: Dict[tuple, 'RateLimiter'] = {}
+_limiters_lock = threading.Lock()
+
+
+def is_rate_limited(e: Exception) -> bool:
+    """True for HTTP 429 errors raised by the OpenAI client."""
+    return getattr(e, 'status_code', None) == 429
+
+
+def retry_after_seconds(e: Exception) -> Optional[float]:
+    """Retry-After (seconds) of an API error response, if present."""
+    response = getattr(e, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    for name in ('retry-after-ms', 'retry-after'):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        return seconds / 1000.0 if name == 'retry-after-ms' else seconds
+    return None
+
+
+def estimate_tokens(request: dict) -> int:
+    """Rough token cost of a chat-completions request (~4 characters per token plus max_tokens)."""
+    prompt_chars = sum(len(m.get('content') or '') for m in request.get('messages', []))
+    return prompt_chars // 4 + int(request.get('max_tokens') or 0)
+
+
+class RateLimiter:
+    """Shared, adaptive request/token bucket for one model."""
+
+    def __init__(self, key: str, requests_per_sec: Optional[float] = None,
+                 tokens_per_min: Optional[float] = None, state_path=None):
+        self.key = key
+        self.requests_per_sec = requests_per_sec
+        self.tokens_per_min = tokens_per_min
+        self.state_path = Path(state_path) if state_path is not None and fcntl is not None else None
+        self._memory_state = None
+        self._lock = threading.Lock()
+        # Process-local counters
+        self.requests = 0
+        self.rate_limited = 0
+        self.waited = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests_per_sec) or bool(self.tokens_per_min)
+
+    # ----- shared state -----
+
+    def _fresh_state(self, now: float) -> dict:
+        return {
+            'config': [self.requests_per_sec, self.tokens_per_min],
+            'requests': self._request_capacity(),
+            'tokens': self._token_capacity(),
+            'updated': now,
+            'scale': 1.0,
+            'paused_until': 0.0,
+        }
+
+    def _request_capacity(self) -> float:
+        return max(1.0, self.requests_per_sec) if self.requests_per_sec else 0.0
+
+    def _token_capacity(self) -> float:
+        return float(self.tokens_per_min) if self.tokens_per_min else 0.0
+
+    def _update(self, fn):
+        """Apply fn(state, now) to the shared state under the thread and file locks."""
+        with self._lock:
+            if self.state_path is None:
+                now = time.time()
+                if self._memory_state is None:
+                    self._memory_state = self._fresh_state(now)
+                return fn(self._memory_state, now)
+
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    now = time.time()
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read())
+                    except ValueError:
+                        state = None
+                    if (state is None or state.get('config') != [self.requests_per_sec, self.tokens_per_min]
+                            or now - state.get('updated', 0.0) > STALE_STATE_SECONDS):
+                        state = self._fresh_state(now)
+                    result = fn(state, now)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ----- reservations -----
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve one request (and `tokens` tokens); returns seconds to wait before sending it."""
+        def take(state, now):
+            scale = state['scale']
+            elapsed = max(0.0, now - state['updated'])
+            state['updated'] = now
+            wait = max(0.0, state['paused_until'] - now)
+            if self.requests_per_sec:
+                rate = self.requests_per_sec * scale
+                state['requests'] = min(self._request_capacity(), state['requests'] + elapsed * rate) - 1
+                if state['requests'] < 0:
+                    wait = max(wait, -state['requests'] / rate)
+            if self.tokens_per_min and tokens:
+                rate = self.tokens_per_min / 60.0 * scale
+                state['tokens'] = min(self._token_capacity(), state['tokens'] + elapsed * rate) - tokens
+                if state['tokens'] < 0:
+                    wait = max(wait, -state['tokens'] / rate)
+            return wait
+
+        if not self.enabled:
+            return 0.0
+        wait = self._update(take)
+        with self._lock:
+            self.requests += 1
+            self.waited += wait
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """acquire() for asyncio tasks (sleeps without blocking the event loop)."""
+        # reserve() can wait on the state file lock held by other processes
+        wait = await asyncio.to_thread(self.reserve, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # ----- adaptation -----
+
+    def on_success(self) -> None:
+        """Additive increase after a successful call."""
+        def grow(state, now):
+            state['scale'] = min(1.0, state['scale'] + INCREASE_STEP)
+
+        if self.enabled:
+            self._update(grow)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease after a 429, pausing all callers for Retry-After."""
+        def shrink(state, now):
+            state['scale'] = max(MIN_SCALE, state['scale'] / 2)
+            pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+            state['paused_until'] = max(state['paused_until'], now + pause)
+
+        with self._lock:
+            self.rate_limited += 1
+        if self.enabled:
+            self._update(shrink)
+
+    # ----- calls -----
+
+    def wrap_client(self, client):
+        """Client to use under this limiter: internal 429 retries are disabled so the limiter sees them."""
+        return client.with_options(max_retries=0) if self.enabled else client
+
+    def call(self, fn, tokens: int = 0, tries: int = 5):
+        """Call fn() within the rate limit, retrying 429s (other errors propagate)."""
+        for i in range(tries):
+            self.acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if not (self.enabled and is_rate_limited(e)) or i == tries - 1:
+                    raise
+                self.on_rate_limited(retry_after_seconds(e))
+                continue
+            self.on_success()
+            return result
+
+    async def acall(self, fn, tokens: int = 0, tries: int = 5):
+        """call() for a coroutine function."""
+        for i in range(tries):
+            await self.aacquire(tokens)
+            try:
+                result = await fn()
+            except Exception as e:
+                if not (self.enabled and is_rate_limited(e)) or i == tries - 1:
+                    raise
+                await asyncio.to_thread(self.on_rate_limited, retry_after_seconds(e))
+                continue
+            await asyncio.to_thread(self.on_success)
+            return result
+
+    def stats(self) -> dict:
+        """Process-local counters plus the shared rate scale."""
+        scale = self._update(lambda state, now: state['scale']) if self.enabled else 1.0
+        return {'requests': self.requests, 'rate_limited': self.rate_limited,
+                'waited_s': round(self.waited, 3), 'rate_scale': round(scale, 3)}
+
+
+def get_rate_limiter(model_name: str, api_base: str = '') -> RateLimiter:
+    """Process-wide limiter for a model on an endpoint, configured from LLM_RATE_LIMIT_*."""
+    rps = os.getenv('LLM_RATE_LIMIT_RPS')
+    tpm = os.getenv('LLM_RATE_LIMIT_TPM')
+    state_dir = Path(os.getenv('LLM_RATE_LIMIT_DIR', str(DEFAULT_STATE_DIR)))
+    key = (api_base, model_name, rps, tpm, str(state_dir))
+    with _limiters_lock:
+        if key not in _limiters:
+            digest = hashlib.sha256(f"{api_base}|{model_name}".encode('utf-8')).hexdigest()[:12]
+            safe_model = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+            _limiters[key] = RateLimiter(
+                f"{api_base}|{model_name}",
+                requests_per_sec=float(rps) if rps else None,
+                tokens_per_min=float(tpm) if tpm else None,
+                state_path=state_dir / f"{safe_model}_{digest}.json",
+            )
+        return _limiters[key]
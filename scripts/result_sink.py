@@ -0,0 +1,216 @@
+"""
+Buffered result writers shared by the evaluation scripts.
+
+A ResultSink keeps one handle open for the whole run and writes rows through
+an in-memory buffer that is flushed once it holds `flush_rows` rows or its
+oldest row is `flush_interval` seconds old, whichever comes first. This bounds memory on huge
+runs and stops per-row open/close syscalls. sync() flushes and fsyncs, and is
+meant for checkpoint boundaries.
+
+Backends are chosen by file extension or explicitly:
+    .csv      CSVSink      (default; append supported)
+    .jsonl    JSONLSink    (one JSON object per line; append supported)
+    .parquet  ParquetSink  (needs pyarrow; one row group per flush)
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_FLUSH_ROWS = 1000
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+class ResultSink:
+    """Base class: buffering and flush policy; subclasses implement _write_rows."""
+
+    extension = ''
+
+    def __init__(self, path, fieldnames: Sequence[str], flush_rows: int = DEFAULT_FLUSH_ROWS,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL, append: bool = False):
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.append = append
+        self.rows_written = 0
+        self._buffer: List[dict] = []
+        self._buffer_started = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write_rows(self, rows: List[dict]):
+        raise NotImplementedError
+
+    def _sync_file(self):
+        """fsync the underlying file after a flush."""
+
+    def write(self, row: dict) -> None:
+        """Buffer one row; flushes when the row count or interval is reached."""
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(row)
+        self.rows_written += 1
+        if len(self._buffer) >= self.flush_rows or (
+                self.flush_interval is not None
+                and time.monotonic() - self._buffer_started >= self.flush_interval):
+            self.flush()
+
+    def write_many(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """Write buffered rows to the file."""
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self._buffer = []
+
+    def sync(self) -> None:
+        """Flush and fsync (checkpoint boundary)."""
+        self.flush()
+        self._sync_file()
+
+    def close(self) -> None:
+        self.sync()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CSVSink(ResultSink):
+    extension = '.csv'
+
+    def _open(self):
+        write_header = not (self.append and self.path.exists() and self.path.stat().st_size > 0)
+        self._file = open(self.path, 'a' if self.append else 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        if write_header:
+            self._writer.writeheader()
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _sync_file(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            super().close()
+            self._file.close()
+
+
+class JSONLSink(ResultSink):
+    extension = '.jsonl'
+
+    def _open(self):
+        self._file = open(self.path, 'a' if self.append else 'w')
+
+    def _write_rows(self, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(json.dumps({name: row.get(name) for name in self.fieldnames}, default=str))
+            buffer.write('\n')
+        self._file.write(buffer.getvalue())
+        self._file.flush()
+
+    def _sync_file(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            super().close()
+            self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    Parquet output (one row group per flush). Needs pyarrow; cannot append to an existing file.
+
+    Empty strings (the CSV writers' padding for unused guess slots) are stored
+    as nulls. Without an explicit schema, known results columns get the typed,
+    dictionary-encoded layout of results_store; other columns are inferred from
+    the first flushed batch, with integers widened to float64 (a later batch may
+    hold fractional values) and all-null columns stored as strings.
+    """
+
+    extension = '.parquet'
+
+    def __init__(self, path, fieldnames: Sequence[str], schema=None, **kwargs):
+        self.schema = schema
+        super().__init__(path, fieldnames, **kwargs)
+
+    def _open(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        if self.append and self.path.exists():
+            raise ValueError(f"Cannot append to existing Parquet file {self.path}")
+        self._writer = None
+
+    @staticmethod
+    def _widen(field):
+        import pyarrow as pa
+
+        if pa.types.is_null(field.type):
+            return pa.field(field.name, pa.string())
+        if pa.types.is_integer(field.type):
+            return pa.field(field.name, pa.float64())
+        return field
+
+    def _write_rows(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {name: [None if row.get(name) == '' else row.get(name) for row in rows]
+                   for name in self.fieldnames}
+        if self._writer is None:
+            schema = self.schema
+            if schema is None:
+                inferred = pa.Table.from_pydict(columns).schema
+                from results_store import results_schema
+                schema = results_schema(self.fieldnames, pa.schema([self._widen(f) for f in inferred]))
+            self._writer = pq.ParquetWriter(str(self.path), schema)
+        for field in self._writer.schema:
+            if pa.types.is_dictionary(field.type):
+                columns[field.name] = [None if v is None else str(v) for v in columns[field.name]]
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self._writer.schema))
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINKS: Dict[str, type] = {'csv': CSVSink, 'jsonl': JSONLSink, 'parquet': ParquetSink}
+
+
+def open_sink(path, fieldnames: Sequence[str], format: Optional[str] = None, **kwargs) -> ResultSink:
+    """
+    Open a result sink; format defaults to the path's extension (csv if unknown).
+
+    flush_rows / flush_interval default to the RESULT_FLUSH_ROWS and
+    RESULT_FLUSH_INTERVAL environment variables when not given.
+    """
+    if format is None:
+        format = Path(path).suffix.lstrip('.').lower()
+        if format not in SINKS:
+            format = 'csv'
+    if format not in SINKS:
+        raise ValueError(f"Unknown result format: {format}. Must be one of {', '.join(SINKS)}")
+    kwargs.setdefault('flush_rows', int(os.getenv('RESULT_FLUSH_ROWS', str(DEFAULT_FLUSH_ROWS))))
+    kwargs.setdefault('flush_interval', float(os.getenv('RESULT_FLUSH_INTERVAL', str(DEFAULT_FLUSH_INTERVAL))))
+    return SINKS[format](path, fieldnames, **kwargs)
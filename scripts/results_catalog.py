@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Results catalog.
+
+A small SQLite manifest of evaluation result files. Each dataset (a results
+CSV or JSON Lines file, and any columnar copy with the same stem) is indexed by category
+(algorithms, llms, hybrids), model, prompt type, algorithm, derived kind
+(candidates / violations / metrics for post-processed files), which side opens a
+hybrid run (llm or algorithm), run timestamp, row count
+and content hash. Analysis scripts query the catalog for the slice they need
+instead of globbing directories and parsing file names themselves.
+
+Runs register their outputs when they finish. query() also refreshes the
+directory it is asked about: files are re-read only when their size or mtime
+changed, so an up-to-date directory costs one stat per file and the rest of the
+tree is not touched.
+
+The catalog also keeps the lineage of derived files (see derived_results.py):
+which input and input hash each output was computed from, and the version of
+the code that computed it.
+
+Configured from the environment:
+    RESULTS_CATALOG_PATH   SQLite file (default: results/catalog.sqlite)
+
+    python3 results_catalog.py refresh ../results ../search_space_pruning
+    python3 results_catalog.py list --category hybrids --algorithm voi --prompt-type cot
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from results_store import COLUMNAR_EXTENSIONS, RESULT_EXTENSIONS, read_table
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_CATALOG_PATH = REPO_ROOT / 'results' / 'catalog.sqlite'
+
+csv.field_size_limit(sys.maxsize)
+
+TIMESTAMP = re.compile(r'_(\d{8}_\d{6})$')
+DERIVED = re.compile(r'_with_(candidates|violations|metrics)$')
+HYBRID_NAME = re.compile(r'^alternating_(?P<start_with>llm|algorithm)_first_(?P<model>.+?)(?:_(?P<algorithm>random|voi))?(?P<cot>_cot)?$')
+LLM_NAME = re.compile(r'^model_(?P<model>.+)_(?P<prompt_type>zero-shot|chain-of-thought|cot)$')
+
+ENTRY_COLUMNS = "path, category, model, prompt_type, algorithm, start_with, derived, timestamp, rows, sha256, formats"
+
+_catalogs: Dict[str, 'ResultsCatalog'] = {}
+_catalogs_lock = threading.Lock()
+
+
+class CatalogEntry(NamedTuple):
+    path: Path             # results CSV, or the columnar file when there is no CSV
+    category: str          # algorithms | llms | hybrids
+    model: Optional[str]
+    prompt_type: Optional[str]
+    algorithm: Optional[str]
+    start_with: Optional[str]  # hybrids: llm | algorithm (the side playing turn 1)
+    derived: str           # '' for raw results, else candidates | violations | metrics
+    timestamp: Optional[str]
+    rows: int
+    sha256: str
+    formats: str           # e.g. 'csv,parquet'
+
+
+def parse_result_name(path) -> Optional[dict]:
+    """Catalog metadata implied by a results file name, or None if it is not a results file."""
+    stem = Path(path).stem
+    metadata = {'derived': '', 'timestamp': None, 'model': None, 'prompt_type': None, 'algorithm': None,
+                'start_with': None}
+    m = DERIVED.search(stem)
+    if m:
+        metadata['derived'] = m.group(1)
+        stem = stem[:m.start()]
+    m = TIMESTAMP.search(stem)
+    if m:
+        metadata['timestamp'] = m.group(1)
+        stem = stem[:m.start()]
+
+    if stem == 'algorithm_results':
+        metadata['category'] = 'algorithms'
+    elif stem.startswith('model_'):
+        metadata['category'] = 'llms'
+        m = LLM_NAME.match(stem)
+        if m:
+            # llm_evaluation writes model names with '-' replaced by '_'; the file contents have the real name
+            metadata['model'] = m.group('model')
+            metadata['prompt_type'] = m.group('prompt_type')
+    elif stem.startswith('alternating_'):
+        metadata['category'] = 'hybrids'
+        m = HYBRID_NAME.match(stem)
+        if m:
+            metadata['model'] = m.group('model')
+            metadata['start_with'] = m.group('start_with')
+            metadata['algorithm'] = m.group('algorithm') or 'css'
+            metadata['prompt_type'] = 'cot' if m.group('cot') else 'zero-shot'
+    else:
+        return None
+    return metadata
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _csv_summary(path) -> tuple:
+    """(row count, first row) of a CSV; rows may span lines (CoT traces)."""
+    with open(path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        first = next(reader, None)
+        rows = 0 if first is None else 1 + sum(1 for _ in reader)
+    return rows, first or {}
+
+
+def _jsonl_summary(path) -> tuple:
+    """(row count, first row) of a JSON Lines results file."""
+    with open(path, 'r') as f:
+        first = next((line for line in f if line.strip()), None)
+        rows = 0 if first is None else 1 + sum(1 for line in f if line.strip())
+    return rows, json.loads(first) if first is not None else {}
+
+
+def _columnar_summary(path) -> tuple:
+    """(row count, first row) of a Parquet/Arrow results file."""
+    table = read_table(path, ['model_name', 'prompt_type'])
+    first = table.slice(0, 1).to_pylist()
+    return table.num_rows, first[0] if first else {}
+
+
+def _formats(path: Path) -> str:
+    """Formats a dataset is available in, e.g. 'csv,parquet'."""
+    return ','.join(ext.lstrip('.') for ext in RESULT_EXTENSIONS[::-1] if path.with_suffix(ext).exists())
+
+
+class ResultsCatalog:
+    """SQLite index of result datasets."""
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread (and process), created on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS datasets ("
+                "path TEXT PRIMARY KEY, directory TEXT, category TEXT, model TEXT, prompt_type TEXT, "
+                "algorithm TEXT, start_with TEXT, derived TEXT, timestamp TEXT, rows INTEGER, sha256 TEXT, "
+                "formats TEXT, size INTEGER, mtime REAL)"
+            )
+            if 'start_with' not in {row[1] for row in conn.execute("PRAGMA table_info(datasets)")}:
+                # Catalog from before start_with was recorded: add the column and
+                # re-index every file on its next refresh
+                try:
+                    conn.execute("ALTER TABLE datasets ADD COLUMN start_with TEXT")
+                    conn.execute("UPDATE datasets SET size = -1")
+                except sqlite3.OperationalError:
+                    pass  # another process migrated it first
+            conn.execute("CREATE INDEX IF NOT EXISTS datasets_directory ON datasets (directory)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lineage ("
+                "output TEXT PRIMARY KEY, input TEXT, derivation TEXT, input_sha256 TEXT, version TEXT, "
+                "size INTEGER, mtime REAL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        """Stored form of a path: relative to the repository when inside it."""
+        path = path.resolve()
+        try:
+            return str(path.relative_to(REPO_ROOT.resolve()))
+        except ValueError:
+            return str(path)
+
+    @staticmethod
+    def _resolve(key: str) -> Path:
+        path = Path(key)
+        return path if path.is_absolute() else REPO_ROOT / path
+
+    # ----- indexing -----
+
+    def register(self, path, **metadata) -> Optional[CatalogEntry]:
+        """
+        Index (or re-index) the dataset a results file belongs to.
+
+        Keyword arguments override metadata parsed from the file name, e.g.
+        register(csv_file, model=model_name). Returns None for files that are
+        not results files, including ones in a format the catalog does not read.
+        """
+        path = Path(path)
+        primary = self._primary(path)
+        parsed = parse_result_name(primary)
+        if parsed is None or primary.suffix not in RESULT_EXTENSIONS or not primary.exists():
+            return None
+        stat = primary.stat()
+        if primary.suffix == '.csv':
+            rows, first = _csv_summary(primary)
+        elif primary.suffix == '.jsonl':
+            rows, first = _jsonl_summary(primary)
+        else:
+            rows, first = _columnar_summary(primary)
+        # The LLM files record the exact model name and prompt type in every row
+        if parsed['category'] == 'llms':
+            parsed['model'] = first.get('model_name') or parsed['model']
+            parsed['prompt_type'] = first.get('prompt_type') or parsed['prompt_type']
+        parsed.update(metadata)
+        entry = CatalogEntry(primary, parsed['category'], parsed['model'], parsed['prompt_type'],
+                             parsed['algorithm'], parsed['start_with'], parsed['derived'], parsed['timestamp'], rows,
+                             file_sha256(primary), _formats(primary))
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO datasets (path, directory, category, model, prompt_type, algorithm, start_with, "
+            "derived, timestamp, rows, sha256, formats, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._key(primary), self._key(primary.parent), entry.category, entry.model, entry.prompt_type,
+             entry.algorithm, entry.start_with, entry.derived, entry.timestamp, entry.rows, entry.sha256, entry.formats,
+             stat.st_size, stat.st_mtime))
+        conn.commit()
+        return entry
+
+    @staticmethod
+    def _primary(path: Path) -> Path:
+        """The file a dataset is indexed under: its CSV if there is one."""
+        csv_path = path.with_suffix('.csv')
+        return csv_path if path.suffix in COLUMNAR_EXTENSIONS and csv_path.exists() else path
+
+    def refresh(self, directory, recursive: bool = False) -> int:
+        """Bring the entries of a directory up to date; returns the number of files (re-)indexed."""
+        directory = Path(directory)
+        conn = self._connection()
+        dir_key = self._key(directory)
+        sql = "SELECT path, size, mtime, formats FROM datasets WHERE directory = ?"
+        params = [dir_key]
+        if recursive:
+            sql += " OR directory LIKE ?"
+            params.append(dir_key.replace('%', r'\%').replace('_', r'\_') + '/%')
+            sql += r" ESCAPE '\'"
+        known = {key: (size, mtime, formats) for key, size, mtime, formats in conn.execute(sql, params)}
+
+        if not directory.is_dir():
+            files = []
+        else:
+            files = directory.rglob('*') if recursive else directory.iterdir()
+        primaries = {self._primary(p) for p in files
+                     if p.suffix in RESULT_EXTENSIONS and p.is_file() and parse_result_name(p) is not None}
+        indexed = 0
+        for path in primaries:
+            key = self._key(path)
+            stat = path.stat()
+            if known.pop(key, None) != (stat.st_size, stat.st_mtime, _formats(path)):
+                self.register(path)
+                indexed += 1
+        # Files that disappeared
+        for key in known:
+            conn.execute("DELETE FROM datasets WHERE path = ?", (key,))
+        conn.commit()
+        return indexed
+
+    def entry(self, path) -> Optional[CatalogEntry]:
+        """Entry of one results file, re-indexed first if the file changed since it was indexed."""
+        path = self._primary(Path(path))
+        if not path.exists() or parse_result_name(path) is None:
+            return None
+        conn = self._connection()
+        key = self._key(path)
+        known = conn.execute("SELECT size, mtime, formats FROM datasets WHERE path = ?", (key,)).fetchone()
+        stat = path.stat()
+        if known != (stat.st_size, stat.st_mtime, _formats(path)):
+            return self.register(path)
+        row = conn.execute(f"SELECT {ENTRY_COLUMNS} FROM datasets WHERE path = ?", (key,)).fetchone()
+        return CatalogEntry(self._resolve(row[0]), *row[1:])
+
+    # ----- lineage -----
+
+    def record_derivation(self, output, derivation: str, input_entry: CatalogEntry, version: str) -> None:
+        """Record that `output` was computed by `derivation` (at `version`) from the input as it is now."""
+        output = Path(output)
+        stat = output.stat()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO lineage (output, input, derivation, input_sha256, version, size, mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self._key(output), self._key(input_entry.path), derivation, input_entry.sha256, version,
+             stat.st_size, stat.st_mtime))
+        conn.commit()
+
+    def derivation_of(self, output) -> Optional[dict]:
+        """Lineage record of a derived file (input, derivation, input_sha256, version, size, mtime), if any."""
+        row = self._connection().execute(
+            "SELECT input, derivation, input_sha256, version, size, mtime FROM lineage WHERE output = ?",
+            (self._key(Path(output)),)).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(('input', 'derivation', 'input_sha256', 'version', 'size', 'mtime'), row))
+        record['input'] = self._resolve(record['input'])
+        return record
+
+    # ----- queries -----
+
+    def query(self, directory=None, category: Optional[str] = None, model: Optional[str] = None,
+              prompt_type: Optional[str] = None, algorithm: Optional[str] = None,
+              derived: Optional[str] = None, refresh: bool = True,
+              start_with: Optional[str] = None) -> List[CatalogEntry]:
+        """
+        Datasets matching every given filter, ordered by timestamp then path.
+
+        `directory` limits the query to one directory (refreshed first unless
+        refresh=False). derived=None matches any file; '' matches raw results only.
+        """
+        clauses, params = [], []
+        if directory is not None:
+            if refresh:
+                self.refresh(directory)
+            clauses.append("directory = ?")
+            params.append(self._key(Path(directory)))
+        for column, value in (('category', category), ('model', model), ('prompt_type', prompt_type),
+                              ('algorithm', algorithm), ('start_with', start_with), ('derived', derived)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = f"SELECT {ENTRY_COLUMNS} FROM datasets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, path"
+        return [CatalogEntry(self._resolve(row[0]), *row[1:]) for row in self._connection().execute(sql, params)]
+
+
+def get_results_catalog() -> ResultsCatalog:
+    """Process-wide catalog at RESULTS_CATALOG_PATH."""
+    path = str(Path(os.getenv('RESULTS_CATALOG_PATH', str(DEFAULT_CATALOG_PATH))).resolve())
+    with _catalogs_lock:
+        if path not in _catalogs:
+            _catalogs[path] = ResultsCatalog(path)
+        return _catalogs[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Index and query evaluation result files.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    refresh_parser = subparsers.add_parser('refresh', help='index result directories (recursively)')
+    refresh_parser.add_argument('directories', nargs='+')
+    list_parser = subparsers.add_parser('list', help='list indexed datasets')
+    list_parser.add_argument('--directory')
+    list_parser.add_argument('--category', choices=['algorithms', 'llms', 'hybrids'])
+    list_parser.add_argument('--model')
+    list_parser.add_argument('--prompt-type')
+    list_parser.add_argument('--algorithm')
+    list_parser.add_argument('--start-with', choices=['llm', 'algorithm'])
+    list_parser.add_argument('--derived', help="candidates, violations, or '' for raw results")
+    args = parser.parse_args(argv)
+
+    catalog = get_results_catalog()
+    if args.command == 'refresh':
+        for directory in args.directories:
+            print(f"  {directory}: {catalog.refresh(directory, recursive=True)} file(s) indexed")
+        return
+
+    entries = catalog.query(args.directory, args.category, args.model, args.prompt_type,
+                            args.algorithm, args.derived, refresh=False, start_with=args.start_with)
+    for entry in entries:
+        print(f"{entry.category:<10} {entry.model or '-':<32} {entry.prompt_type or '-':<16} "
+              f"{entry.algorithm or '-':<7} {entry.start_with or '-':<9} {entry.derived or 'raw':<10} {entry.timestamp or '-':<15} "
+              f"{entry.rows:>6}  {entry.formats:<12} {entry.path}")
+    print(f"{len(entries)} dataset(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Columnar results store.
+
+Evaluation results are written as wide CSVs (algorithms, hybrids) or long
+CSVs with large prompt/CoT text columns (LLMs). This module keeps a typed
+columnar copy of each file: Parquet (zstd) or Arrow IPC (.arrow). Game/attempt
+numbers and distances are small integers, won/win flags are booleans, and
+repetitive strings (strategy, model, target, guesses, feedback) are
+dictionary-encoded. Columns not covered by the rules below keep the types
+pyarrow infers.
+
+load_results() is the loader used by the analysis scripts. Given a CSV it
+reads the columnar copy next to it (same stem) when that copy is at least as
+new as the CSV, and reads only the requested columns. Without pyarrow it falls
+back to pandas.read_csv. JSON Lines results (--format jsonl) are read as they are.
+
+LLM and hybrid runs write a columnar copy of their CSV when they finish if
+RESULT_COLUMNAR=parquet (or arrow) is set. Build copies for an existing tree:
+    python3 results_store.py ../results ../search_space_pruning
+    python3 results_store.py --format arrow ../results/llms/raw\\ data/model_*.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow')
+RESULT_EXTENSIONS = COLUMNAR_EXTENSIONS + ('.csv', '.jsonl')
+
+# (column name pattern, type name), first match wins. Round columns may carry a _1.._6 suffix.
+COLUMN_TYPES = [
+    (r'(strategy|target_word|model_name|model|prompt_type|prompting|algorithm)(_\d)?', 'category'),
+    (r'(guess|feedback)(_\d)?', 'category'),
+    (r'(game_number|game_id|attempts|attempts_to_win|attempt_number)', 'int16'),
+    (r'(hamming|levenshtein)(_\d|_distance)?', 'int8'),
+    (r'candidates_(before|after)(_\d)?', 'int32'),
+    (r'(total_reward|reduction_rate(_\d)?|candidate_reduction_rate|information_gain(_\d|_bits))', 'float64'),
+    (r'(won|win|is_valid_word|is_error|violated_(green|yellow|gray)_constraint)', 'bool'),
+    (r'violated_(green|yellow|gray)_\d', 'int8'),
+    (r'(total_violations_\d|total_constraint_violations)', 'int16'),
+    (r'(prompt|cot_trace|raw_response|timestamp)', 'string'),
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Columnar results need pyarrow (pip install pyarrow)") from e
+
+
+def column_type(name: str):
+    """Arrow type for a known results column, or None to keep the inferred type."""
+    import pyarrow as pa
+
+    types = {
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'string': pa.string(),
+        'int8': pa.int8(),
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+    }
+    for pattern, type_name in COLUMN_TYPES:
+        if re.fullmatch(pattern, name):
+            return types[type_name]
+    return None
+
+
+def typed_table(table):
+    """Cast the known columns of an Arrow table to the store's types (columns that do not fit are left as they are)."""
+    import pyarrow as pa
+
+    columns = []
+    for field, column in zip(table.schema, table.columns):
+        target = column_type(field.name)
+        if target is not None and column.type != target:
+            try:
+                if pa.types.is_dictionary(target):
+                    column = column.cast(pa.string()).dictionary_encode()
+                elif pa.types.is_integer(target) and pa.types.is_floating(column.type):
+                    column = column.cast(target, safe=True)  # rejects fractional values
+                else:
+                    column = column.cast(target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+        columns.append(column)
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+def results_schema(fieldnames: Sequence[str], inferred=None):
+    """
+    Schema for writing rows with these columns.
+
+    Known columns get the store's types; the others take their type from the
+    `inferred` schema if given, else string.
+    """
+    import pyarrow as pa
+
+    inferred_types = {f.name: f.type for f in inferred} if inferred is not None else {}
+    return pa.schema([pa.field(name, column_type(name) or inferred_types.get(name, pa.string()))
+                      for name in fieldnames])
+
+
+def columnar_format() -> Optional[str]:
+    """Columnar copy format requested for LLM/hybrid runs via RESULT_COLUMNAR (parquet, arrow or unset)."""
+    format = os.getenv('RESULT_COLUMNAR', '').lower() or None
+    if format not in (None, 'parquet', 'arrow'):
+        raise ValueError(f"Unknown RESULT_COLUMNAR format: {format}. Must be parquet or arrow")
+    return format
+
+
+def columnar_path(path, format: str = 'parquet') -> Path:
+    """Columnar copy of a results CSV (same directory and stem)."""
+    return Path(path).with_suffix('.' + format)
+
+
+def write_columnar(csv_path, format: str = 'parquet', out_path=None) -> Path:
+    """Convert a results CSV to a typed Parquet or Arrow IPC file; returns its path."""
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if format not in ('parquet', 'arrow'):
+        raise ValueError(f"Unknown columnar format: {format}. Must be parquet or arrow")
+    out_path = Path(out_path) if out_path is not None else columnar_path(csv_path, format)
+    with open(csv_path, 'r', newline='') as f:
+        header = next(csv.reader(f), [])
+    # Numeric columns are parsed as float64 so a late fractional value cannot break
+    # inference; text columns are kept verbatim (e.g. ISO timestamps stay strings)
+    parse_types = {}
+    for name in header:
+        target = column_type(name)
+        if target is None or pa.types.is_boolean(target):
+            continue
+        parse_types[name] = pa.float64() if pa.types.is_integer(target) or pa.types.is_floating(target) \
+            else pa.string()
+    table = pa_csv.read_csv(
+        str(csv_path),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types=parse_types, strings_can_be_null=True),
+    )
+    table = typed_table(table)
+    tmp_path = out_path.with_name(out_path.name + '.tmp')
+    if format == 'parquet':
+        pq.write_table(table, str(tmp_path), compression='zstd')
+    else:
+        feather.write_feather(table, str(tmp_path), compression='zstd')
+    tmp_path.replace(out_path)
+    return out_path
+
+
+def _fresh_columnar(path: Path) -> Optional[Path]:
+    """Columnar copy of a CSV that is at least as new as the CSV, if any."""
+    for extension in COLUMNAR_EXTENSIONS:
+        candidate = path.with_suffix(extension)
+        if candidate.exists() and candidate.stat().st_mtime >= path.stat().st_mtime:
+            return candidate
+    return None
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def read_table(path, columns: Optional[Sequence[str]] = None):
+    """Arrow table of a Parquet/Arrow results file, restricted to the requested columns that exist."""
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    wanted = None
+    if path.suffix == '.arrow':
+        if columns is not None:
+            with pa.memory_map(str(path)) as source:
+                names = set(pa.ipc.open_file(source).schema.names)
+            wanted = [c for c in columns if c in names]
+        return feather.read_table(str(path), columns=wanted, memory_map=True)
+    parquet_file = pq.ParquetFile(str(path), memory_map=True)
+    if columns is not None:
+        names = set(parquet_file.schema_arrow.names)
+        wanted = [c for c in columns if c in names]
+    return parquet_file.read(columns=wanted)
+
+
+def _read_jsonl(path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Rows of a JSON Lines results file; empty strings become missing values, as in read_csv."""
+    wanted = set(columns) if columns is not None else None
+    records = []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                records.append({name: None if value == '' else value for name, value in json.loads(line).items()
+                                if wanted is None or name in wanted})
+    return pd.DataFrame.from_records(records)
+
+
+def load_results(path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load a results file as a DataFrame.
+
+    `columns` lists the columns the caller needs; ones missing from the file
+    are skipped, as analysis scripts check `col in df.columns`. A CSV is read
+    from its columnar copy when one is up to date. Dictionary columns come back
+    as plain strings and integer columns with gaps as floats, so frames look
+    like pandas.read_csv output.
+    """
+    path = Path(path)
+    if path.suffix == '.csv' and _pyarrow_available():
+        path = _fresh_columnar(path) or path
+    if path.suffix in COLUMNAR_EXTENSIONS:
+        import pyarrow as pa
+
+        table = read_table(path, columns)
+        table = pa.Table.from_arrays(
+            [c.cast(c.type.value_type) if pa.types.is_dictionary(c.type) else c for c in table.columns],
+            names=table.column_names)
+        return table.to_pandas()
+    if path.suffix == '.jsonl':
+        return _read_jsonl(path, columns)
+    if columns is None:
+        return pd.read_csv(path)
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda c: c in wanted)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write typed columnar copies of results CSVs.')
+    parser.add_argument('paths', nargs='+', help='CSV files or directories (searched recursively)')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet')
+    parser.add_argument('--force', action='store_true', help='rewrite copies that are already up to date')
+    args = parser.parse_args(argv)
+
+    _require_pyarrow()
+    csv_files = []
+    for path in map(Path, args.paths):
+        csv_files.extend(sorted(path.rglob('*.csv')) if path.is_dir() else [path])
+
+    written = 0
+    for csv_file in csv_files:
+        out_path = columnar_path(csv_file, args.format)
+        if not args.force and out_path.exists() and out_path.stat().st_mtime >= csv_file.stat().st_mtime:
+            continue
+        write_columnar(csv_file, args.format, out_path)
+        written += 1
+        print(f"  {csv_file} -> {out_path.name}")
+    print(f"✓ {written} columnar file(s) written, {len(csv_files) - written} up to date")
+
+
+if __name__ == '__main__':
+    main()
@@ -73,6 +73,32 @@ def get_test_words_only(filepath=None) -> List[str]:
     return [word for _, word, _ in test_set]
 
 
+def load_full_test_set(wordlist_path=None, tiered_path=None) -> List[Tuple[int, str, int]]:
+    """
+    Every word of the word list as a test set, in word-list order.
+
+    Tiers come from tiered_wordlist.txt (0 for words not listed there).
+
+    Returns:
+        List of tuples: [(game_id, word, tier), ...]
+    """
+    script_dir = Path(__file__).parent
+    wordlist_path = Path(wordlist_path) if wordlist_path else script_dir.parent / 'wordlist' / 'wordlist.txt'
+    tiered_path = Path(tiered_path) if tiered_path else script_dir.parent / 'wordlist' / 'tiered_wordlist.txt'
+
+    word_tiers = {}
+    if tiered_path.exists():
+        from generate_test_set import load_tiered_wordlist
+        for tier, words in load_tiered_wordlist(tiered_path).items():
+            for word in words:
+                word_tiers.setdefault(word, tier)
+
+    with open(wordlist_path, 'r', encoding='utf-8') as f:
+        words = [line.strip().upper() for line in f if len(line.strip()) == 5]
+
+    return [(game_id, word, word_tiers.get(word, 0)) for game_id, word in enumerate(words, start=1)]
+
+
 def print_test_set_info(filepath=None):
     """Print summary information about the canonical test set."""
     test_set = load_canonical_test_set(filepath)